@@ -0,0 +1,81 @@
+# GovtApplications/actions.py
+"""
+Officer status changes (approve, reject, mark under review) for one or many
+applications.
+
+All IDs in a request are applied in one transaction: a single locked read of
+their current status and one ``QuerySet.update()`` for the rows that change.
+``update()`` skips ``save()``, so ``updated_at`` is set explicitly and
+``status_changed`` is sent for each district/status transition instead of
+``post_save``.
+"""
+from collections import Counter
+from django.db import transaction
+from django.utils import timezone
+from .models import SubsidyApplication
+from .signals import status_changed
+
+BULK_ACTION_MAX_IDS = 500
+
+ACTION_STATUSES = ('APPROVED', 'REJECTED', 'UNDER_REVIEW')
+DECISION_STATUSES = ('APPROVED', 'REJECTED')
+
+# Per-ID results
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'  # Already in the target status
+NOT_FOUND = 'not_found'  # Unknown ID or outside the officer's district
+
+
+class ActionError(ValueError):
+    pass
+
+
+def apply_status(district, officer_id, application_ids, status, reason='', rejection_code='', remarks=''):
+    """
+    Move the district's applications in ``application_ids`` to ``status``.
+
+    Approvals and rejections record ``decided_by``/``decided_at``; rejections
+    require ``reason``. Returns ``[{'application_id', 'result'}]`` in request
+    order. Raises ``ActionError`` for invalid input.
+    """
+    if status not in ACTION_STATUSES:
+        raise ActionError(f"Unknown status. Use one of: {', '.join(ACTION_STATUSES)}")
+    if status == 'REJECTED' and not reason:
+        raise ActionError('Rejection reason is required')
+
+    application_ids = list(dict.fromkeys(str(i).strip() for i in application_ids if str(i).strip()))
+    if not application_ids:
+        raise ActionError('Application ID is required')
+    if len(application_ids) > BULK_ACTION_MAX_IDS:
+        raise ActionError(f'At most {BULK_ACTION_MAX_IDS} applications can be updated at once')
+
+    now = timezone.now()
+    changes = {'status': status, 'updated_at': now}
+    if status in DECISION_STATUSES:
+        changes.update(decided_by_id=officer_id, decided_at=now)
+    if status == 'REJECTED':
+        changes.update(rejection_reason=reason, rejection_code=rejection_code)
+    if remarks:
+        changes['admin_remarks'] = remarks
+
+    in_district = SubsidyApplication.objects.filter(district=district, application_id__in=application_ids)
+    with transaction.atomic():
+        current = dict(in_district.select_for_update().values_list('application_id', 'status'))
+        to_update = [app_id for app_id, current_status in current.items() if current_status != status]
+        if to_update:
+            SubsidyApplication.objects.filter(application_id__in=to_update).update(**changes)
+            for previous, count in Counter(current[app_id] for app_id in to_update).items():
+                status_changed.send(
+                    sender=SubsidyApplication, district=district, previous=previous, status=status, count=count,
+                )
+
+    results = []
+    for app_id in application_ids:
+        if app_id not in current:
+            result = NOT_FOUND
+        elif current[app_id] == status:
+            result = UNCHANGED
+        else:
+            result = UPDATED
+        results.append({'application_id': app_id, 'result': result})
+    return results
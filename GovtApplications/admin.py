@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
 from .models import *
+from .signals import status_changed
 
 # Register your models here.
 
@@ -13,15 +16,26 @@ class SubsidyApplicationAdmin(admin.ModelAdmin):
     
     actions = ['approve_applications', 'reject_applications']
     
-    def approve_applications(self, request, queryset):
+    def _set_status(self, request, queryset, status):
         from django.utils import timezone
-        queryset.update(status='APPROVED', decided_by=request.user, decided_at=timezone.now())
+        with transaction.atomic():
+            moved = (
+                queryset.exclude(status=status).values_list('district', 'status')
+                .annotate(count=Count('id')).order_by()
+            )
+            for district, previous, count in moved:
+                status_changed.send(
+                    sender=SubsidyApplication, district=district, previous=previous, status=status, count=count,
+                )
+            queryset.update(status=status, decided_by=request.user, decided_at=timezone.now(), updated_at=timezone.now())
+
+    def approve_applications(self, request, queryset):
+        self._set_status(request, queryset, 'APPROVED')
         self.message_user(request, f'{queryset.count()} applications approved')
     approve_applications.short_description = 'Approve selected'
     
     def reject_applications(self, request, queryset):
-        from django.utils import timezone
-        queryset.update(status='REJECTED', decided_by=request.user, decided_at=timezone.now())
+        self._set_status(request, queryset, 'REJECTED')
         self.message_user(request, f'{queryset.count()} applications rejected')
     reject_applications.short_description = 'Reject selected'
 
@@ -31,3 +45,17 @@ class OfficerAdmin(admin.ModelAdmin):
     list_display = ('officer_name', 'officer_email', 'assigned_district', 'govt_id')
     search_fields = ('officer_name', 'officer_email', 'govt_id')
     list_filter = ('assigned_district',)
+
+    def save_model(self, request, obj, form, change):
+        # A password typed into the admin form is stored hashed
+        if 'password' in form.changed_data:
+            obj.set_password(form.cleaned_data['password'])
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(CalculationUpload)
+class CalculationUploadAdmin(admin.ModelAdmin):
+    list_display = ('upload_id', 'user', 'filename', 'size', 'status', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('upload_id', 'filename', 'checksum')
+    readonly_fields = ('upload_id', 'checksum', 'stored_size', 'created_at', 'updated_at')
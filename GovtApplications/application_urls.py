@@ -11,6 +11,10 @@ urlpatterns = [
     # Submit application API at /applications/api/submit/
     path('api/submit/', views.submit_application, name='submit'),
 
+    # Chunked calculation PDF uploads at /applications/api/uploads/
+    path('api/uploads/', views.start_calculation_upload, name='upload_start'),
+    path('api/uploads/<uuid:upload_id>/', views.calculation_upload, name='upload'),
+
     # Track applications at /applications/track/
     path('track/', views.track_applications, name='track_applications'),
 
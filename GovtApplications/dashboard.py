@@ -0,0 +1,170 @@
+# GovtApplications/dashboard.py
+"""
+Query helpers for the officer dashboard.
+
+Tab counts come from one grouped ``COUNT`` query per district; each tab's
+list is fetched as keyset-paginated pages of ``values()`` rows ordered by
+``(-created_at, -id)``, so page N costs the same as page 1.
+
+An open dashboard stays current through ``application_changes``: rows of the
+district created or changed after an ``(updated_at, id)`` cursor, read from
+the ``(district, updated_at, id)`` index. Polling with nothing new is one
+index seek that returns no rows. Under an ASGI server the dashboard receives
+changes as a server-sent event stream; under WSGI, where Django would buffer
+the whole stream in a worker thread, the browser polls the JSON feed instead.
+"""
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import SubsidyApplication
+
+DASHBOARD_PAGE_SIZE = 25
+DASHBOARD_MAX_PAGE_SIZE = 100
+
+DASHBOARD_CHANGES_LIMIT = 100
+# Seconds between change checks while an officer's stream is open
+DASHBOARD_POLL_INTERVAL = getattr(settings, 'DASHBOARD_POLL_INTERVAL', 3)
+# A stream ends after this long and the browser reconnects from its last cursor
+DASHBOARD_STREAM_SECONDS = getattr(settings, 'DASHBOARD_STREAM_SECONDS', 300)
+# Seconds between the browser's JSON checks when the site is served over WSGI (no stream)
+DASHBOARD_BROWSER_POLL_INTERVAL = getattr(settings, 'DASHBOARD_BROWSER_POLL_INTERVAL', 10)
+# Rows this recent are sent again on the next check: a transaction that stamped
+# updated_at earlier may commit after a later one, and must not fall behind the cursor
+DASHBOARD_CHANGES_SETTLE = timedelta(seconds=getattr(settings, 'DASHBOARD_CHANGES_SETTLE_SECONDS', 5))
+
+CURSOR_START = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+STATUS_TABS = {
+    'pending': ['SUBMITTED', 'UNDER_REVIEW'],
+    'approved': ['APPROVED'],
+    'rejected': ['REJECTED'],
+}
+
+LIST_FIELDS = (
+    'id', 'application_id', 'full_name', 'email', 'mobile', 'aadhaar_or_id',
+    'district', 'pincode', 'property_address', 'status', 'created_at',
+    'geo_latitude', 'geo_longitude', 'gps_accuracy_meters', 'calculation_pdf',
+    'rejection_reason', 'updated_at',
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def status_counts(district):
+    """``{tab: count}`` for a district from a single GROUP BY status query."""
+    by_status = dict(
+        SubsidyApplication.objects.filter(district=district)
+        .values('status')
+        .annotate(count=Count('id'))
+        .order_by()
+        .values_list('status', 'count')
+    )
+    return {
+        tab: sum(by_status.get(status, 0) for status in statuses)
+        for tab, statuses in STATUS_TABS.items()
+    }
+
+
+def status_tab(status):
+    for tab, statuses in STATUS_TABS.items():
+        if status in statuses:
+            return tab
+    return None
+
+
+def encode_cursor(row, field='created_at'):
+    raw = f"{row[field].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def serialize_application(row):
+    storage = SubsidyApplication._meta.get_field('calculation_pdf').storage
+    return {
+        'application_id': row['application_id'],
+        'full_name': row['full_name'],
+        'email': row['email'],
+        'mobile': row['mobile'],
+        'aadhar_or_id': row['aadhaar_or_id'],
+        'district': row['district'],
+        'pincode': row['pincode'],
+        'property_address': row['property_address'],
+        'status': row['status'],
+        'created_at': row['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
+        'geo_latitude': str(row['geo_latitude']) if row['geo_latitude'] is not None else None,
+        'geo_longitude': str(row['geo_longitude']) if row['geo_longitude'] is not None else None,
+        'gps_accuracy_meters': row['gps_accuracy_meters'],
+        'calculation_pdf_url': storage.url(row['calculation_pdf']) if row['calculation_pdf'] else None,
+        'rejection_reason': row['rejection_reason'] or None,
+        'updated_at': row['updated_at'].isoformat(),
+    }
+
+
+def application_page(district, tab, cursor=None, limit=DASHBOARD_PAGE_SIZE):
+    """
+    One page of a status tab for a district.
+
+    Returns ``(applications, next_cursor)``; ``next_cursor`` is None on the
+    last page. Raises ``InvalidCursor`` for a malformed cursor.
+    """
+    queryset = SubsidyApplication.objects.filter(district=district, status__in=STATUS_TABS[tab])
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = list(queryset.order_by('-created_at', '-id').values(*LIST_FIELDS)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [serialize_application(row) for row in rows[:limit]], next_cursor
+
+
+def changes_cursor(district):
+    """Cursor positioned after the district's most recently changed application."""
+    latest = (
+        SubsidyApplication.objects.filter(district=district)
+        .order_by('-updated_at', '-id').values('updated_at', 'id').first()
+    )
+    return encode_cursor(latest or {'updated_at': CURSOR_START, 'id': 0}, 'updated_at')
+
+
+def application_changes(district, cursor, limit=DASHBOARD_CHANGES_LIMIT):
+    """
+    Applications of a district created or changed after ``cursor``, oldest
+    change first, each with the ``tab`` it now belongs to.
+
+    Returns ``(applications, next_cursor, has_more)``. ``next_cursor`` does not
+    move past rows changed within DASHBOARD_CHANGES_SETTLE, so those are sent
+    again on the next call; clients apply changes idempotently by
+    ``application_id`` and ``updated_at``. Raises ``InvalidCursor``.
+    """
+    updated_at, pk = decode_cursor(cursor)
+    rows = list(
+        SubsidyApplication.objects.filter(district=district)
+        .filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+        .order_by('updated_at', 'id')
+        .values(*LIST_FIELDS)[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    settled_before = timezone.now() - DASHBOARD_CHANGES_SETTLE
+    settled = [row for row in rows if row['updated_at'] <= settled_before]
+    next_cursor = encode_cursor(settled[-1], 'updated_at') if settled else cursor
+
+    applications = []
+    for row in rows:
+        application = serialize_application(row)
+        application['tab'] = status_tab(row['status'])
+        applications.append(application)
+    return applications, next_cursor, has_more
@@ -0,0 +1,234 @@
+# GovtApplications/export.py
+"""
+Streaming CSV/XLSX export of a district's applications.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` in
+``(created_at, id)`` order and encoded as they are produced, so memory use
+does not depend on the number of rows. An interrupted CSV download is resumed
+by passing the last ``application_id`` received as ``after`` and appending the
+rows that follow; a partial XLSX file cannot be appended to, so it is not
+resumable.
+
+Text cells that a spreadsheet would read as a formula (leading ``=``, ``+``,
+``-``, ``@``, tab or carriage return) are prefixed with ``'`` so that
+applicant-entered values are shown, never evaluated.
+
+XLSX is written without a spreadsheet library: the workbook is a zip whose
+sheet XML is deflated row by row into a non-seekable stream (inline-string
+cells, no shared-strings table), so it streams like the CSV does.
+"""
+import csv
+import io
+import zipfile
+from datetime import datetime, time, timedelta
+from xml.sax.saxutils import escape
+from django.db.models import Q
+from django.utils import timezone
+from .dashboard import STATUS_TABS
+from .models import SubsidyApplication
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'xlsx')
+
+EXPORT_COLUMNS = [
+    ('application_id', 'Application ID'),
+    ('status', 'Status'),
+    ('created_at', 'Submitted At'),
+    ('updated_at', 'Updated At'),
+    ('full_name', 'Applicant Name'),
+    ('mobile', 'Mobile'),
+    ('email', 'Email'),
+    ('aadhaar_or_id', 'Aadhaar/ID'),
+    ('district', 'District'),
+    ('pincode', 'Pincode'),
+    ('property_address', 'Property Address'),
+    ('geo_latitude', 'Latitude'),
+    ('geo_longitude', 'Longitude'),
+    ('gps_accuracy_meters', 'GPS Accuracy (m)'),
+    ('location_capture_mode', 'Location Mode'),
+    ('calculation_pdf', 'Calculation PDF'),
+    ('decided_at', 'Decided At'),
+    ('rejection_code', 'Rejection Code'),
+    ('rejection_reason', 'Rejection Reason'),
+    ('admin_remarks', 'Remarks'),
+]
+EXPORT_FIELDS = [field for field, _ in EXPORT_COLUMNS]
+NUMERIC_FIELDS = {'geo_latitude', 'geo_longitude', 'gps_accuracy_meters'}
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError as e:
+        raise ExportError(f'{name} must be a date in YYYY-MM-DD format') from e
+
+
+def export_queryset(district, status=None, date_from=None, date_to=None, after=None):
+    """
+    Rows to export for a district, oldest first.
+
+    ``status`` is a status code (``APPROVED``) or dashboard tab (``pending``);
+    ``date_from``/``date_to`` are inclusive ``YYYY-MM-DD`` dates on the
+    submission time; ``after`` is the last application_id already received.
+    Raises ``ExportError`` on invalid filters.
+    """
+    queryset = SubsidyApplication.objects.filter(district=district)
+
+    if status:
+        statuses = STATUS_TABS.get(status.lower()) or [status.upper()]
+        valid = {code for code, _ in SubsidyApplication.STATUS_CHOICES}
+        if not set(statuses) <= valid:
+            raise ExportError(f"Unknown status. Use one of: {', '.join(list(STATUS_TABS) + sorted(valid))}")
+        queryset = queryset.filter(status__in=statuses)
+
+    if date_from:
+        start = timezone.make_aware(datetime.combine(_parse_date(date_from, 'from'), time.min))
+        queryset = queryset.filter(created_at__gte=start)
+    if date_to:
+        end = timezone.make_aware(datetime.combine(_parse_date(date_to, 'to') + timedelta(days=1), time.min))
+        queryset = queryset.filter(created_at__lt=end)
+
+    if after:
+        last = queryset.filter(application_id=after).values('created_at', 'id').first()
+        if last is None:
+            raise ExportError('after must be an application_id from this export')
+        queryset = queryset.filter(
+            Q(created_at__gt=last['created_at']) | Q(created_at=last['created_at'], id__gt=last['id'])
+        )
+
+    return queryset.order_by('created_at', 'id').values_list(*EXPORT_FIELDS)
+
+
+def _neutralise(value):
+    """Keep spreadsheet applications from evaluating a text cell as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _cells(row, storage):
+    """Export values for one row, keyed like EXPORT_FIELDS."""
+    values = dict(zip(EXPORT_FIELDS, row))
+    for field in ('created_at', 'updated_at', 'decided_at'):
+        if values[field] is not None:
+            values[field] = timezone.localtime(values[field]).strftime('%Y-%m-%d %H:%M:%S')
+    if values['calculation_pdf']:
+        values['calculation_pdf'] = storage.url(values['calculation_pdf'])
+    return [_neutralise(values[field]) for field in EXPORT_FIELDS]
+
+
+def _rows(queryset):
+    storage = SubsidyApplication._meta.get_field('calculation_pdf').storage
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield _cells(row, storage)
+
+
+def stream_csv(queryset, header=True, rows_per_chunk=500):
+    """Yield the CSV in chunks of ``rows_per_chunk`` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow([label for _, label in EXPORT_COLUMNS])
+    for count, cells in enumerate(_rows(queryset), 1):
+        writer.writerow(['' if value is None else value for value in cells])
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only stream collecting zip output until the generator drains it."""
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Applications" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_row(cells, numeric=()):
+    parts = []
+    for index, value in enumerate(cells):
+        if value is None or value == '':
+            parts.append('<c/>')
+        elif index in numeric:
+            parts.append(f'<c t="n"><v>{value}</v></c>')
+        else:
+            parts.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+    return f'<row>{"".join(parts)}</row>'.encode('utf-8')
+
+
+def stream_xlsx(queryset, header=True):
+    numeric = {index for index, field in enumerate(EXPORT_FIELDS) if field in NUMERIC_FIELDS}
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        yield sink.drain()
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            if header:
+                sheet.write(_xlsx_row([label for _, label in EXPORT_COLUMNS]))
+            for count, cells in enumerate(_rows(queryset), 1):
+                sheet.write(_xlsx_row(cells, numeric))
+                if count % EXPORT_CHUNK_SIZE == 0:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
@@ -0,0 +1,21 @@
+# GovtApplications/hashers.py
+"""
+Password hashing for Officer accounts through Django's hasher framework.
+
+Officers are not ``auth.User`` rows, so they get their own preferred hasher:
+PBKDF2-SHA256 with the work factor from ``OFFICER_PASSWORD_ITERATIONS``
+(Django's default when unset). Stored hashes keep their own iteration count,
+so changing the setting takes effect as officers log in and are rehashed.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+OFFICER_PASSWORD_ITERATIONS = getattr(settings, 'OFFICER_PASSWORD_ITERATIONS', None)
+
+
+class OfficerPasswordHasher(PBKDF2PasswordHasher):
+    # Same algorithm name, so hashes stay verifiable by Django's own PBKDF2 hasher
+    iterations = OFFICER_PASSWORD_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+officer_hasher = OfficerPasswordHasher()
@@ -0,0 +1,11 @@
+# GovtApplications/management/commands/process_calculation_uploads.py
+from django.core.management.base import BaseCommand
+from GovtApplications.uploads import process_pending_uploads
+
+
+class Command(BaseCommand):
+    help = "Re-queue unprocessed calculation PDF uploads and expire abandoned partial uploads"
+
+    def handle(self, *args, **options):
+        queued, expired = process_pending_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} upload(s), expired {expired} partial upload(s)"))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0002_officer_alter_subsidyapplication_decided_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subsidyapplication',
+            index=models.Index(fields=['district', 'status', '-created_at', '-id'], name='subsidy_district_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subsidyapplication',
+            index=models.Index(fields=['user', '-created_at'], name='subsidy_user_created_idx'),
+        ),
+    ]
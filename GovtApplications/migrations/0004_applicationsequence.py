@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0003_subsidyapplication_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=4, unique=True)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
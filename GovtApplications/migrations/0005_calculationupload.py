@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:07
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0004_applicationsequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subsidyapplication',
+            name='calculation_pdf',
+            field=models.FileField(blank=True, upload_to='govt_applications/calculations/'),
+        ),
+        migrations.CreateModel(
+            name='CalculationUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('received', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('UPLOADING', 'Uploading'), ('RECEIVED', 'Received'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='UPLOADING', max_length=20)),
+                ('checksum', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('file', models.FileField(blank=True, upload_to='govt_applications/calculations/')),
+                ('stored_size', models.BigIntegerField(blank=True, null=True)),
+                ('thumbnail', models.FileField(blank=True, upload_to='govt_applications/thumbnails/')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calculation_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='subsidyapplication',
+            name='calculation_upload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='GovtApplications.calculationupload'),
+        ),
+        migrations.AddIndex(
+            model_name='calculationupload',
+            index=models.Index(fields=['status', 'updated_at'], name='calc_upload_status_idx'),
+        ),
+    ]
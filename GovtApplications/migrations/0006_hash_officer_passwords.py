@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:00
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations
+
+
+def hash_plaintext_passwords(apps, schema_editor):
+    Officer = apps.get_model('GovtApplications', 'Officer')
+    for officer in Officer.objects.only('pk', 'password').iterator():
+        try:
+            identify_hasher(officer.password)
+        except ValueError:
+            Officer.objects.filter(pk=officer.pk).update(password=make_password(officer.password))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0005_calculationupload'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_plaintext_passwords, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0006_hash_officer_passwords'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subsidyapplication',
+            index=models.Index(fields=['district', 'updated_at', 'id'], name='subsidy_district_updated_idx'),
+        ),
+    ]
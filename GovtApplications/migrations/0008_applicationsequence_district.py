@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:40
+
+import re
+from django.db import migrations, models
+
+
+def assign_districts(apps, schema_editor):
+    """
+    Give each existing counter to the district that first used its code.
+    Other districts that shared the code get a new one (e.g. ``PUNE57``) on their
+    next application, so no ID already issued can be produced again.
+    """
+    ApplicationSequence = apps.get_model('GovtApplications', 'ApplicationSequence')
+    SubsidyApplication = apps.get_model('GovtApplications', 'SubsidyApplication')
+
+    owners = {}
+    districts = (
+        SubsidyApplication.objects.values('district').annotate(first_id=models.Min('id')).order_by('first_id')
+    )
+    for row in districts:
+        key = ' '.join(re.sub(r'[^A-Z0-9]+', ' ', (row['district'] or '').upper()).split())
+        owners.setdefault(re.sub(r'[^A-Z0-9]', '', key)[:4].ljust(4, 'X'), key)
+
+    for sequence in ApplicationSequence.objects.all():
+        # A counter whose applications were all deleted keeps its code as the district
+        sequence.district = owners.get(sequence.code, sequence.code)
+        sequence.save(update_fields=['district'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0007_subsidyapplication_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationsequence',
+            name='district',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='applicationsequence',
+            name='code',
+            field=models.CharField(max_length=8, unique=True),
+        ),
+        migrations.RunPython(assign_districts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='applicationsequence',
+            name='district',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('GovtApplications', '0008_applicationsequence_district'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicationsequence',
+            name='code',
+            field=models.CharField(max_length=8, null=True, unique=True),
+        ),
+    ]
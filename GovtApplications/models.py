@@ -1,6 +1,12 @@
-from django.db import models
+import re
+import uuid
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Concat
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
+from .hashers import officer_hasher
 
 
 # Create your models here.
@@ -51,8 +57,9 @@ class SubsidyApplication(models.Model):
     location_capture_mode = models.CharField(max_length=10, choices=CAPTURE_MODE_CHOICES, default='device')
     manual_address_entry = models.TextField(blank=True)
     
-    # Technical proposal
-    calculation_pdf = models.FileField(upload_to='govt_applications/calculations/')
+    # Technical proposal (filled in once the background upload step has stored the file)
+    calculation_pdf = models.FileField(upload_to='govt_applications/calculations/', blank=True)
+    calculation_upload = models.ForeignKey('CalculationUpload', on_delete=models.SET_NULL, null=True, blank=True, related_name='applications')
     
     # Consent
     consent_given = models.BooleanField(default=False)
@@ -66,18 +73,127 @@ class SubsidyApplication(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Officer dashboard: tab counts and pages filter on (district, status), newest first
+            models.Index(fields=['district', 'status', '-created_at', '-id'], name='subsidy_district_status_idx'),
+            # Applicant tracking: own applications, newest first
+            models.Index(fields=['user', '-created_at'], name='subsidy_user_created_idx'),
+            # Dashboard change feed: rows of a district changed after an (updated_at, id) cursor
+            models.Index(fields=['district', 'updated_at', 'id'], name='subsidy_district_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.application_id} - {self.full_name}"
     
     def save(self, *args, **kwargs):
         if not self.application_id:
-            from django.utils import timezone
-            timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
-            self.application_id = f'RWH{timestamp}'
+            # Number and insert in one transaction: the sequence row stays locked
+            # until the application is stored, and a failed insert gives its number back
+            with transaction.atomic(using=kwargs.get('using')):
+                self.application_id = ApplicationSequence.next_application_id(self.district)
+                super().save(*args, **kwargs)
+            return
         super().save(*args, **kwargs)
 
 
+class ApplicationSequence(models.Model):
+    """
+    Per-district counter behind application IDs such as ``RWH-PUNE-0000042``.
+
+    Each district (by normalised name) has its own counter and a display
+    code: the first four letters/digits of its name, or, when another
+    district already uses those, the four followed by the row's own id
+    (``PUNE``, ``PUNE57`` for "Pune City"). Every code is four characters
+    plus a unique suffix, so IDs stay unique across districts without retries.
+    """
+    district = models.CharField(max_length=100, unique=True)
+    code = models.CharField(max_length=8, unique=True, null=True)  # Set right after the row is added
+    last_value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.code} ({self.district}): {self.last_value}"
+
+    @staticmethod
+    def district_key(district):
+        return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', (district or '').upper()).split())
+
+    @staticmethod
+    def base_code(district_key):
+        return re.sub(r'[^A-Z0-9]', '', district_key)[:4].ljust(4, 'X')
+
+    @classmethod
+    def _create(cls, key):
+        """Add the counter row for a district and give it its code."""
+        # A concurrent worker may add the same district first; its row and code are then used
+        cls.objects.bulk_create([cls(district=key)], ignore_conflicts=True)
+        rows = cls.objects.filter(district=key, code__isnull=True)
+        base = cls.base_code(key)
+        try:
+            with transaction.atomic():
+                rows.update(code=base)
+        except IntegrityError:
+            # Another district holds the plain code; the row's id makes this one unique
+            rows.update(code=Concat(Value(base), Cast('pk', models.CharField())))
+
+    @classmethod
+    def next_value(cls, district):
+        """
+        Atomically take the next number for ``district`` and return
+        ``(code, number)``. Call inside the transaction that uses it: the
+        UPDATE holds the row (SQLite: database) write lock until commit, so
+        concurrent workers queue rather than collide.
+        """
+        rows = cls.objects.filter(district=cls.district_key(district))
+        if not rows.update(last_value=F('last_value') + 1):
+            # First application for this district
+            cls._create(cls.district_key(district))
+            rows.update(last_value=F('last_value') + 1)
+        return rows.values_list('code', 'last_value').get()
+
+    @classmethod
+    def next_application_id(cls, district):
+        code, number = cls.next_value(district)
+        return f'RWH-{code}-{number:07d}'
+
+
+class CalculationUpload(models.Model):
+    """
+    A calculation PDF sent in chunks ahead of the application. Once every byte
+    has arrived it is checksummed and stored once per content hash in the
+    background, then linked to the applications that reference it.
+    """
+
+    STATUS_CHOICES = [
+        ('UPLOADING', 'Uploading'),
+        ('RECEIVED', 'Received'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calculation_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='UPLOADING')
+    checksum = models.CharField(max_length=64, blank=True, db_index=True)
+    file = models.FileField(upload_to='govt_applications/calculations/', blank=True)
+    stored_size = models.BigIntegerField(null=True, blank=True)
+    thumbnail = models.FileField(upload_to='govt_applications/thumbnails/', blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Recovery sweep: received-but-unprocessed and expired partial uploads
+            models.Index(fields=['status', 'updated_at'], name='calc_upload_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.upload_id} - {self.filename} ({self.status})"
+
+
 class Officer(models.Model):
     officer_name = models.CharField(max_length=50)
     officer_email = models.EmailField(unique=True)
@@ -88,3 +204,17 @@ class Officer(models.Model):
 
     def __str__(self):
         return f"{self.officer_name} - {self.assigned_district}"
+
+    def set_password(self, raw_password):
+        self.password = make_password(raw_password, hasher=officer_hasher)
+
+    def check_password(self, raw_password):
+        """
+        Verify ``raw_password``. A hash made with an older work factor is
+        replaced on success, so cost changes roll out at login.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            Officer.objects.filter(pk=self.pk).update(password=self.password)
+
+        return check_password(raw_password, self.password, setter, preferred=officer_hasher)
@@ -0,0 +1,97 @@
+# GovtApplications/officers.py
+"""
+Officer identity for portal requests.
+
+Login stores a snapshot of the officer (id, name, email, district) in the
+session, and officer views read it from there. ``current_officer()`` checks
+the snapshot against a per-process cache keyed by officer id, so a page view
+costs no Officer query once the process has seen the officer. Saving or
+deleting an Officer drops its entry in this process (signals.py); other
+processes pick the change up within ``OFFICER_CACHE_SECONDS``.
+"""
+import threading
+import time
+from django.conf import settings
+from .models import Officer
+
+OFFICER_CACHE_SECONDS = getattr(settings, 'OFFICER_CACHE_SECONDS', 300)
+
+SNAPSHOT_FIELDS = ('id', 'officer_name', 'officer_email', 'assigned_district')
+
+# Session key for each snapshot field
+SESSION_KEYS = {
+    'id': 'officer_id',
+    'officer_name': 'officer_name',
+    'officer_email': 'officer_email',
+    'assigned_district': 'assigned_district',
+}
+
+
+def snapshot(officer):
+    return {field: getattr(officer, field) for field in SNAPSHOT_FIELDS}
+
+
+class OfficerCache:
+    """Thread-safe per-process cache of officer snapshots by id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # officer_id -> (snapshot, loaded_at)
+
+    def get(self, officer_id):
+        """The officer's snapshot, loading it on a miss; None if the officer no longer exists."""
+        with self._lock:
+            entry = self._entries.get(officer_id)
+        if entry and time.monotonic() - entry[1] < OFFICER_CACHE_SECONDS:
+            return entry[0]
+
+        data = Officer.objects.filter(pk=officer_id).values(*SNAPSHOT_FIELDS).first()
+        if data is not None:
+            self.put(data)
+        return data
+
+    def put(self, data):
+        with self._lock:
+            self._entries[data['id']] = (data, time.monotonic())
+
+    def invalidate(self, officer_id=None):
+        with self._lock:
+            if officer_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(officer_id, None)
+
+
+officer_cache = OfficerCache()
+
+
+def login_session(request, officer):
+    data = snapshot(officer)
+    officer_cache.put(data)
+    for field, key in SESSION_KEYS.items():
+        request.session[key] = data[field]
+    request.session['is_officer'] = True
+
+
+def logout_session(request):
+    for key in SESSION_KEYS.values():
+        request.session.pop(key, None)
+    request.session.pop('is_officer', None)
+
+
+def current_officer(request):
+    """
+    Snapshot of the logged-in officer, or None. Keeps the session in step
+    with the cached officer and logs out a session whose officer was deleted.
+    """
+    officer_id = request.session.get('officer_id')
+    if not request.session.get('is_officer') or officer_id is None:
+        return None
+    data = officer_cache.get(officer_id)
+    if data is None:
+        logout_session(request)
+        return None
+    for field, key in SESSION_KEYS.items():
+        if request.session.get(key) != data[field]:
+            request.session[key] = data[field]
+    return data
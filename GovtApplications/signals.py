@@ -0,0 +1,16 @@
+# GovtApplications/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Officer
+from .officers import officer_cache
+
+# Sent inside the transaction of a bulk status change (QuerySet.update() sends
+# no post_save): ``count`` applications of ``district`` moved from ``previous``
+# to ``status``.
+status_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Officer)
+def invalidate_officer_cache(sender, instance, **kwargs):
+    """Drop the in-process snapshot of an officer when the row changes."""
+    officer_cache.invalidate(instance.pk)
@@ -0,0 +1,9 @@
+# GovtApplications/tasks.py
+from jobs.queue import task
+from .uploads import PROCESS_UPLOAD_TASK, process_upload
+
+
+@task(PROCESS_UPLOAD_TASK)
+def process_calculation_upload(upload_pk):
+    """Checksum, store and attach a received calculation PDF"""
+    return {'file': process_upload(upload_pk)}
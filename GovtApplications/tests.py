@@ -1,3 +1,143 @@
+import re
+from unittest import skipUnless
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from .dashboard import STATUS_TABS
+from .models import SubsidyApplication, Officer
 
 # Create your tests here.
+
+STATUSES = ['SUBMITTED', 'UNDER_REVIEW', 'APPROVED', 'REJECTED']
+APP_TABLES = re.compile(r'"?GovtApplications_\w+"?')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Plans are asserted in SQLite EXPLAIN QUERY PLAN format')
+class SubsidyApplicationQueryPlanTests(TestCase):
+    """
+    Seed a large synthetic SubsidyApplication table, drive the officer and
+    applicant views, and EXPLAIN every query they send to GovtApplications
+    tables. Any full table scan (a dropped or unusable index) fails the test.
+    """
+    ROWS = 20000
+    DISTRICTS = 50
+    USERS = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = User.objects.bulk_create([User(username=f'applicant{i}') for i in range(cls.USERS)])
+        SubsidyApplication.objects.bulk_create([
+            SubsidyApplication(
+                application_id=f'RWHTEST{i:07d}',
+                user=cls.users[i % cls.USERS],
+                status=STATUSES[(i // cls.DISTRICTS) % len(STATUSES)],
+                full_name=f'Applicant {i}',
+                mobile='9876543210',
+                email=f'applicant{i}@example.com',
+                aadhaar_or_id='123412341234',
+                address='Address',
+                account_holder_name=f'Applicant {i}',
+                account_number='1234567890',
+                ifsc_code='SBIN0001234',
+                property_address='Property address',
+                district=f'DISTRICT{i % cls.DISTRICTS}',
+                pincode='411001',
+            )
+            for i in range(cls.ROWS)
+        ], batch_size=2000)
+        cls.officer = Officer.objects.create(
+            officer_name='Test Officer',
+            officer_email='officer@example.com',
+            officer_phone='9876543210',
+            assigned_district='DISTRICT7',
+            govt_id='GOVT0007',
+            password=make_password('secret-password'),
+        )
+        # Give the planner real statistics, as a long-lived production database has
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        session = self.client.session
+        session.update({
+            'is_officer': True,
+            'officer_id': self.officer.id,
+            'officer_name': self.officer.officer_name,
+            'officer_email': self.officer.officer_email,
+            'assigned_district': self.officer.assigned_district,
+        })
+        session.save()
+
+    def query_plans(self, request):
+        """Run ``request()`` and return ``[(sql, [plan details])]`` for its GovtApplications queries."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = request()
+        self.assertLess(response.status_code, 400, response.content[:200])
+
+        plans = []
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not APP_TABLES.search(sql) or not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        self.assertTrue(plans, 'Request issued no GovtApplications queries')
+        return plans
+
+    def assertIndexBacked(self, plans, allow_sort=True):
+        for sql, details in plans:
+            for detail in details:
+                if APP_TABLES.search(detail):
+                    self.assertTrue(
+                        detail.startswith('SEARCH'),
+                        f'Full scan in plan {details} for query: {sql}',
+                    )
+                if not allow_sort:
+                    self.assertNotIn('TEMP B-TREE', detail, f'Sort not served by index in {details} for: {sql}')
+
+    def test_dashboard_counts_use_index(self):
+        self.assertIndexBacked(self.query_plans(lambda: self.client.get('/officer/')))
+
+    def test_dashboard_pages_use_index(self):
+        for tab in STATUS_TABS:
+            with self.subTest(tab=tab):
+                first = self.query_plans(lambda: self.client.get('/officer/applications/', {'tab': tab, 'limit': 25}))
+                # Single-status tabs read rows in index order; pending merges two statuses and sorts one page's candidates
+                self.assertIndexBacked(first, allow_sort=len(STATUS_TABS[tab]) > 1)
+
+                cursor = self.client.get('/officer/applications/', {'tab': tab, 'limit': 25}).json()['next_cursor']
+                self.assertIsNotNone(cursor)
+                following = self.query_plans(
+                    lambda: self.client.get('/officer/applications/', {'tab': tab, 'limit': 25, 'cursor': cursor})
+                )
+                self.assertIndexBacked(following, allow_sort=len(STATUS_TABS[tab]) > 1)
+
+    def test_track_applications_uses_index(self):
+        self.client.force_login(self.users[3])
+        self.assertIndexBacked(self.query_plans(lambda: self.client.get('/applications/track/')), allow_sort=False)
+
+    def test_application_actions_use_index(self):
+        application_ids = list(
+            SubsidyApplication.objects.filter(district='DISTRICT7', status='SUBMITTED')
+            .values_list('application_id', flat=True)[:3]
+        )
+        actions = [
+            ('/officer/under-review/', {'application_id': application_ids[0]}),
+            ('/officer/approve/', {'application_id': application_ids[1]}),
+            ('/officer/reject/', {'application_id': application_ids[2], 'reason': 'Incomplete documents'}),
+        ]
+        for url, data in actions:
+            with self.subTest(url=url):
+                self.assertIndexBacked(self.query_plans(lambda: self.client.post(url, data)))
+
+    def test_officer_login_uses_index(self):
+        self.client.logout()
+        login = {
+            'officer_name': self.officer.officer_name,
+            'govt_id': self.officer.govt_id,
+            'password': 'secret-password',
+        }
+        self.assertIndexBacked(self.query_plans(lambda: self.client.post('/officer/login/', login)))
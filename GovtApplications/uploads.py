@@ -0,0 +1,328 @@
+# GovtApplications/uploads.py
+"""
+Offloaded handling of calculation PDFs.
+
+The browser sends the PDF in chunks to an upload session before submitting the
+application. Each chunk is streamed to a partial file outside MEDIA_ROOT at its
+``Upload-Offset``, so a dropped connection resumes from the last byte stored.
+Submitting the application only records the upload on the row; a queued job
+(``manage.py run_workers``) then checksums the file, stores it once per SHA-256 (identical files share
+one stored copy), optionally recompresses it and renders a thumbnail, and
+finally sets ``calculation_pdf`` on the applications that reference it.
+
+Compression needs ``pikepdf`` and thumbnails need ``PyMuPDF``; without them
+those steps are skipped.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.db import transaction
+from django.utils import timezone
+from jobs.queue import enqueue
+from .models import CalculationUpload, SubsidyApplication
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+CALCULATION_PDF_MAX_SIZE = getattr(settings, 'CALCULATION_PDF_MAX_SIZE', 25 * 1024 * 1024)
+CALCULATION_UPLOAD_CHUNK_SIZE = getattr(settings, 'CALCULATION_UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+CALCULATION_UPLOAD_TEMP_DIR = Path(getattr(settings, 'CALCULATION_UPLOAD_TEMP_DIR', settings.BASE_DIR / 'upload_tmp'))
+CALCULATION_UPLOAD_EXPIRY = timedelta(hours=getattr(settings, 'CALCULATION_UPLOAD_EXPIRY_HOURS', 24))
+CALCULATION_PDF_COMPRESS = getattr(settings, 'CALCULATION_PDF_COMPRESS', True)
+CALCULATION_PDF_THUMBNAILS = getattr(settings, 'CALCULATION_PDF_THUMBNAILS', True)
+
+COPY_BUFFER_SIZE = 64 * 1024
+PDF_MAGIC = b'%PDF-'
+THUMBNAIL_WIDTH = 240
+
+
+class UploadError(ValueError):
+    status = 400
+
+
+class UploadTooLarge(UploadError):
+    status = 413
+
+
+class OffsetMismatch(UploadError):
+    """A chunk did not start where the stored data ends; the client should resume from ``offset``."""
+    status = 409
+
+    def __init__(self, offset):
+        super().__init__(f'Upload-Offset does not match; resume from byte {offset}')
+        self.offset = offset
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """
+    Install first on ``request.upload_handlers`` to stop reading a multipart
+    body as soon as an inline file passes the size limit, instead of spooling
+    the whole file to disk before the view can reject it.
+    """
+
+    def __init__(self, request=None, limit=CALCULATION_PDF_MAX_SIZE):
+        super().__init__(request)
+        self.limit = limit
+        self.exceeded = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.limit:
+            self.exceeded = True
+            raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def partial_path(upload):
+    return CALCULATION_UPLOAD_TEMP_DIR / f'{upload.upload_id}.part'
+
+
+def _validate(filename, size):
+    if not filename or not filename.lower().endswith('.pdf'):
+        raise UploadError('Calculation file must be a PDF')
+    if size <= 0:
+        raise UploadError('File is empty')
+    if size > CALCULATION_PDF_MAX_SIZE:
+        raise UploadTooLarge(f'File exceeds the {CALCULATION_PDF_MAX_SIZE // (1024 * 1024)} MB limit')
+
+
+def start_upload(user, filename, size):
+    """Open an upload session for a file of ``size`` bytes. Raises ``UploadError``."""
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError('size must be the file size in bytes')
+    filename = os.path.basename(filename or '')
+    _validate(filename, size)
+
+    upload = CalculationUpload.objects.create(user=user, filename=filename, size=size)
+    CALCULATION_UPLOAD_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    partial_path(upload).touch()
+    return upload
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset`` and advance the
+    session. A retried chunk rewrites the same bytes, and a concurrent
+    duplicate loses the conditional update and gets ``OffsetMismatch``.
+    Returns the refreshed upload.
+    """
+    if upload.status != 'UPLOADING':
+        raise UploadError('Upload is already complete')
+    if offset != upload.received:
+        raise OffsetMismatch(upload.received)
+    if length <= 0:
+        raise UploadError('Chunk is empty')
+    if length > CALCULATION_UPLOAD_CHUNK_SIZE:
+        raise UploadTooLarge(f'Chunks are limited to {CALCULATION_UPLOAD_CHUNK_SIZE} bytes')
+    if offset + length > upload.size:
+        raise UploadTooLarge('Chunk runs past the declared file size')
+
+    written = 0
+    with open(partial_path(upload), 'r+b') as partial:
+        partial.seek(offset)
+        while written < length:
+            data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not data:
+                break
+            partial.write(data)
+            written += len(data)
+    if not written:
+        raise UploadError('Chunk is empty')
+
+    # A short read (client disconnected) still advances by what was stored
+    received = offset + written
+    status = 'RECEIVED' if received == upload.size else 'UPLOADING'
+    with transaction.atomic():
+        advanced = CalculationUpload.objects.filter(pk=upload.pk, received=offset, status='UPLOADING').update(
+            received=received, status=status, updated_at=timezone.now(),
+        )
+        if not advanced:
+            upload.refresh_from_db(fields=['received', 'status'])
+            raise OffsetMismatch(upload.received)
+        if status == 'RECEIVED':
+            enqueue_processing(upload.pk)
+
+    upload.received, upload.status = received, status
+    return upload
+
+
+def adopt_file(user, uploaded_file):
+    """
+    Turn an inline ``request.FILES`` PDF into a received upload without
+    processing it in the request. Spooled files are moved, not copied.
+    """
+    _validate(uploaded_file.name, uploaded_file.size)
+    upload = CalculationUpload.objects.create(
+        user=user,
+        filename=os.path.basename(uploaded_file.name),
+        size=uploaded_file.size,
+        received=uploaded_file.size,
+        status='RECEIVED',
+    )
+    CALCULATION_UPLOAD_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        shutil.move(uploaded_file.temporary_file_path(), partial_path(upload))
+    else:
+        with open(partial_path(upload), 'wb') as partial:
+            for chunk in uploaded_file.chunks(COPY_BUFFER_SIZE):
+                partial.write(chunk)
+    enqueue_processing(upload.pk)
+    return upload
+
+
+# ============================================
+# BACKGROUND PROCESSING
+# ============================================
+
+PROCESS_UPLOAD_TASK = 'applications.process_calculation_upload'
+
+
+def enqueue_processing(upload_pk):
+    """Queue the processing job; workers see it once the current transaction commits."""
+    enqueue(PROCESS_UPLOAD_TASK, {'upload_pk': upload_pk}, unique_key=str(upload_pk))
+
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        if source.read(len(PDF_MAGIC)) != PDF_MAGIC:
+            raise UploadError('File is not a PDF')
+        source.seek(0)
+        for block in iter(lambda: source.read(COPY_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _compressed_copy(path):
+    """Path of a recompressed copy if it came out smaller, else None."""
+    if pikepdf is None or not CALCULATION_PDF_COMPRESS:
+        return None
+    handle, target = tempfile.mkstemp(suffix='.pdf', dir=CALCULATION_UPLOAD_TEMP_DIR)
+    os.close(handle)
+    try:
+        with pikepdf.open(path) as pdf:
+            pdf.save(target, compress_streams=True, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        if os.path.getsize(target) < os.path.getsize(path):
+            return target
+    except Exception as e:
+        logger.warning(f"PDF compression skipped: {e}")
+    os.remove(target)
+    return None
+
+
+def _thumbnail_png(path):
+    if fitz is None or not CALCULATION_PDF_THUMBNAILS:
+        return None
+    try:
+        with fitz.open(path) as pdf:
+            page = pdf[0]
+            zoom = THUMBNAIL_WIDTH / page.rect.width
+            return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes('png')
+    except Exception as e:
+        logger.warning(f"PDF thumbnail skipped: {e}")
+        return None
+
+
+def process_upload(upload_pk):
+    """
+    Checksum, deduplicate and store a received upload, then attach it to its
+    applications. Safe to call again for an upload that is already done.
+    """
+    upload = CalculationUpload.objects.filter(pk=upload_pk, status='RECEIVED').first()
+    if upload is None:
+        return None
+
+    path = partial_path(upload)
+    file_field = CalculationUpload._meta.get_field('file')
+    storage = file_field.storage
+    try:
+        checksum = _checksum(path)
+    except (OSError, UploadError) as e:
+        CalculationUpload.objects.filter(pk=upload.pk).update(status='FAILED', error=str(e), updated_at=timezone.now())
+        path.unlink(missing_ok=True)
+        return None
+
+    # Content-addressed names: a second upload of the same file reuses the stored copy
+    name = f'{file_field.upload_to}{checksum[:2]}/{checksum}.pdf'
+    if not storage.exists(name):
+        compressed = _compressed_copy(path)
+        with open(compressed or path, 'rb') as source:
+            name = storage.save(name, File(source))
+        if compressed:
+            os.remove(compressed)
+
+    thumbnail = f'{CalculationUpload._meta.get_field("thumbnail").upload_to}{checksum[:2]}/{checksum}.png'
+    if not storage.exists(thumbnail):
+        png = _thumbnail_png(path)
+        thumbnail = storage.save(thumbnail, ContentFile(png)) if png else ''
+
+    CalculationUpload.objects.filter(pk=upload.pk).update(
+        status='READY',
+        checksum=checksum,
+        file=name,
+        stored_size=storage.size(name),
+        thumbnail=thumbnail,
+        updated_at=timezone.now(),
+    )
+    path.unlink(missing_ok=True)
+    attach_to_applications(upload.pk)
+    return name
+
+
+def attach_to_applications(upload_pk):
+    """
+    Copy a ready upload's file onto applications still waiting for it. Both
+    the processing step and submit_application call this after committing,
+    so whichever finishes last links the file.
+    """
+    name = (
+        CalculationUpload.objects.filter(pk=upload_pk, status='READY')
+        .values_list('file', flat=True).first()
+    )
+    if not name:
+        return 0
+    return SubsidyApplication.objects.filter(calculation_upload_id=upload_pk, calculation_pdf='').update(
+        calculation_pdf=name, updated_at=timezone.now(),
+    )
+
+
+def process_pending_uploads(now=None):
+    """
+    Recovery sweep: re-queue received uploads whose job gave up or was lost
+    and delete partial uploads that have not advanced within the expiry
+    window. Returns ``(queued, expired)``.
+    """
+    now = now or timezone.now()
+    queued = 0
+    for upload_pk in CalculationUpload.objects.filter(status='RECEIVED').values_list('pk', flat=True):
+        enqueue_processing(upload_pk)
+        queued += 1
+
+    stale = CalculationUpload.objects.filter(status='UPLOADING', updated_at__lt=now - CALCULATION_UPLOAD_EXPIRY)
+    expired = 0
+    for upload in stale.only('pk', 'upload_id'):
+        partial_path(upload).unlink(missing_ok=True)
+        expired += 1
+    stale.update(status='FAILED', error='Upload expired before completion', updated_at=now)
+    return queued, expired
@@ -8,6 +8,15 @@ urlpatterns = [
     # Officer dashboard at /officer/
     path('', views.application_dashboard, name='dashboard'),
 
+    # Paginated applications for a dashboard tab at /officer/applications/?tab=pending
+    path('applications/', views.dashboard_applications, name='applications'),
+
+    # Dashboard change feed (server-sent events) at /officer/changes/?cursor=...
+    path('changes/', views.dashboard_changes, name='changes'),
+
+    # Streaming CSV/XLSX export at /officer/export/?format=csv
+    path('export/', views.export_applications, name='export'),
+
     # Officer registration at /officer/register/
     path('register/', views.registerOfficer, name='register'),
     
@@ -21,5 +30,6 @@ urlpatterns = [
     path('approve/', views.approve_application, name='approve'),
     path('reject/', views.reject_application, name='reject'),
     path('under-review/', views.under_review_application, name='under_review'),
+    path('bulk-action/', views.bulk_application_action, name='bulk_action'),
 
 ]
@@ -1,4 +1,8 @@
 # GovtApplications/views.py
+import asyncio
+import json
+import time
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
@@ -7,9 +11,25 @@ from django.views.decorators.http import require_http_methods
 from django.contrib.auth import logout
 from functools import wraps
 from .models import *
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.http import require_POST, require_GET
 from django.utils import timezone
+from django.db import transaction
+from .dashboard import (
+    STATUS_TABS, DASHBOARD_PAGE_SIZE, DASHBOARD_MAX_PAGE_SIZE,
+    DASHBOARD_POLL_INTERVAL, DASHBOARD_STREAM_SECONDS, DASHBOARD_BROWSER_POLL_INTERVAL,
+    InvalidCursor, decode_cursor, status_counts, application_page, changes_cursor, application_changes,
+)
+from .export import EXPORT_FORMATS, ExportError, export_queryset, stream_csv, stream_xlsx
+from .officers import login_session, logout_session, current_officer
+from .hashers import officer_hasher
+from .actions import ActionError, apply_status, UPDATED, UNCHANGED, NOT_FOUND
+from .uploads import (
+    CALCULATION_PDF_MAX_SIZE, CALCULATION_UPLOAD_CHUNK_SIZE,
+    UploadError, UploadTooLarge, OffsetMismatch, LimitedUploadHandler,
+    start_upload, append_chunk, adopt_file, attach_to_applications,
+)
 
 # ============================================
 # CUSTOM DECORATOR FOR OFFICER AUTHENTICATION
@@ -19,11 +39,43 @@ def officer_login_required(view_func):
     """Custom decorator to check if officer is logged in via session"""
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('is_officer'):
+        if current_officer(request) is None:
             return redirect('/officer/login/')
         return view_func(request, *args, **kwargs)
     return wrapper
 
+
+def _officer_forbidden():
+    return JsonResponse({
+        'success': False,
+        'message': 'You must be logged in as an officer'
+    }, status=403)
+
+
+def officer_required(view_func):
+    """
+    JSON endpoints: 403 unless the session belongs to an officer who still
+    exists. The officer's current snapshot (id, district, ...) is set as
+    ``request.officer``; views take the district and id from it, never from
+    the session directly.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            request.officer = await sync_to_async(current_officer)(request)
+            if request.officer is None:
+                return _officer_forbidden()
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        request.officer = current_officer(request)
+        if request.officer is None:
+            return _officer_forbidden()
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
 # ============================================
 # PUBLIC APPLICATION VIEWS (For regular users)
 # ============================================
@@ -35,42 +87,130 @@ def application_form(request):
 @csrf_exempt
 @login_required  # Regular user authentication
 def submit_application(request):
-    """Public users - Submit subsidy application"""
+    """
+    Public users - Submit subsidy application.
+    The calculation PDF is either a completed upload session
+    (calculation_upload_id) or, for older clients, an inline calculation_pdf
+    file; in both cases it is processed after the response.
+    """
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'POST required'}, status=400)
     
+    # Stop reading an oversized inline PDF instead of spooling all of it
+    limit_handler = LimitedUploadHandler(request)
+    request.upload_handlers.insert(0, limit_handler)
+    
     try:
-        application = SubsidyApplication.objects.create(
-            user=request.user,
-            full_name=request.POST.get('full_name'),
-            mobile=request.POST.get('mobile'),
-            email=request.POST.get('email'),
-            aadhaar_or_id=request.POST.get('aadhaar_or_id'),
-            address=request.POST.get('address'),
-            account_holder_name=request.POST.get('account_holder_name'),
-            account_number=request.POST.get('account_number'),
-            ifsc_code=request.POST.get('ifsc_code'),
-            property_address=request.POST.get('property_address'),
-            district=request.POST.get('district').upper(),
-            pincode=request.POST.get('pincode'),
-            geo_latitude=request.POST.get('geo_latitude') or None,
-            geo_longitude=request.POST.get('geo_longitude') or None,
-            gps_accuracy_meters=request.POST.get('gps_accuracy_meters') or None,
-            location_capture_mode=request.POST.get('location_capture_mode', 'manual'),
-            manual_address_entry=request.POST.get('manual_address_entry', ''),
-            calculation_pdf=request.FILES.get('calculation_pdf'),
-            consent_given=request.POST.get('consent_given') == 'true'
-        )
+        with transaction.atomic():
+            upload = None
+            upload_id = request.POST.get('calculation_upload_id')
+            if limit_handler.exceeded:
+                raise UploadTooLarge(f'File exceeds the {CALCULATION_PDF_MAX_SIZE // (1024 * 1024)} MB limit')
+            if upload_id:
+                upload = CalculationUpload.objects.filter(
+                    upload_id=upload_id, user=request.user, status__in=['RECEIVED', 'READY']
+                ).first()
+                if upload is None:
+                    raise UploadError('Calculation PDF upload is missing or not complete')
+            elif request.FILES.get('calculation_pdf'):
+                upload = adopt_file(request.user, request.FILES['calculation_pdf'])
+            
+            application = SubsidyApplication.objects.create(
+                user=request.user,
+                full_name=request.POST.get('full_name'),
+                mobile=request.POST.get('mobile'),
+                email=request.POST.get('email'),
+                aadhaar_or_id=request.POST.get('aadhaar_or_id'),
+                address=request.POST.get('address'),
+                account_holder_name=request.POST.get('account_holder_name'),
+                account_number=request.POST.get('account_number'),
+                ifsc_code=request.POST.get('ifsc_code'),
+                property_address=request.POST.get('property_address'),
+                district=request.POST.get('district').upper(),
+                pincode=request.POST.get('pincode'),
+                geo_latitude=request.POST.get('geo_latitude') or None,
+                geo_longitude=request.POST.get('geo_longitude') or None,
+                gps_accuracy_meters=request.POST.get('gps_accuracy_meters') or None,
+                location_capture_mode=request.POST.get('location_capture_mode', 'manual'),
+                manual_address_entry=request.POST.get('manual_address_entry', ''),
+                calculation_upload=upload,
+                calculation_pdf=upload.file.name if upload and upload.status == 'READY' else '',
+                consent_given=request.POST.get('consent_given') == 'true'
+            )
+            if upload and upload.status != 'READY':
+                transaction.on_commit(lambda: attach_to_applications(upload.pk))
         
         return JsonResponse({
             'success': True,
             'application_id': application.application_id,
             'status': application.status,
-            'created_at': application.created_at.strftime('%Y-%m-%d %H:%M')
+            'created_at': application.created_at.strftime('%Y-%m-%d %H:%M'),
+            'calculation_pdf_status': upload.status if upload else None
         })
+    except UploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
+@csrf_exempt
+@login_required  # Regular user authentication
+@require_POST
+def start_calculation_upload(request):
+    """
+    Public users - Open a chunked upload session for the calculation PDF.
+    Body (JSON or form): filename, size (bytes).
+    """
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+        upload = start_upload(request.user, data.get('filename'), data.get('size'))
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON data'}, status=400)
+    except UploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    
+    return JsonResponse({
+        'success': True,
+        'upload_id': str(upload.upload_id),
+        'offset': 0,
+        'size': upload.size,
+        'chunk_size': CALCULATION_UPLOAD_CHUNK_SIZE
+    }, status=201)
+
+@csrf_exempt
+@login_required  # Regular user authentication
+@require_http_methods(["GET", "POST"])
+def calculation_upload(request, upload_id):
+    """
+    Public users - Upload session status (GET) or the next chunk (POST).
+    A chunk is the raw request body, sent with an Upload-Offset header equal
+    to the offset returned by the previous call; on 409 resume from 'offset'.
+    """
+    upload = CalculationUpload.objects.filter(upload_id=upload_id, user=request.user).first()
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'Upload not found'}, status=404)
+    
+    if request.method == 'POST':
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Upload-Offset header is required'}, status=400)
+        try:
+            upload = append_chunk(upload, offset, request, length)
+        except OffsetMismatch as e:
+            return JsonResponse({'success': False, 'error': str(e), 'offset': e.offset}, status=e.status)
+        except UploadError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    
+    return JsonResponse({
+        'success': True,
+        'upload_id': str(upload.upload_id),
+        'offset': upload.received,
+        'size': upload.size,
+        'status': upload.status,
+        'error': upload.error or None
+    })
+
 @login_required  # Regular user authentication
 def track_applications(request):
     """Public users - Track their own applications"""
@@ -125,14 +265,10 @@ def loginOfficer(request):
                 govt_id=govt_id
             )
 
-            # Check password
-            if officer.password == password:
-                # Set session data
-                request.session['officer_id'] = officer.id
-                request.session['officer_name'] = officer.officer_name
-                request.session['officer_email'] = officer.officer_email
-                request.session['assigned_district'] = officer.assigned_district
-                request.session['is_officer'] = True
+            # Check password (rehashes it if the configured cost changed)
+            if officer.check_password(password):
+                # Set session data and warm this process's officer cache
+                login_session(request, officer)
                 
                 # CRITICAL: Save session immediately
                 request.session.modified = True
@@ -149,6 +285,8 @@ def loginOfficer(request):
                 })
 
         except Officer.DoesNotExist:
+            # Spend the same hashing time as a wrong password so unknown officers can't be told apart
+            officer_hasher.encode(password, officer_hasher.salt())
             return JsonResponse({
                 'success': False,
                 'message': 'Invalid credentials!'
@@ -211,14 +349,15 @@ def registerOfficer(request):
     
     try:
         # Create officer
-        officer = Officer.objects.create(
+        officer = Officer(
             officer_name=officer_name,
             officer_email=officer_email,
             govt_id=govt_id,
             officer_phone=officer_phone,
             assigned_district=assigned_district,
-            password=password
         )
+        officer.set_password(password)
+        officer.save()
         
         return JsonResponse({
             'success': True,
@@ -234,11 +373,7 @@ def registerOfficer(request):
 def logoutOfficer(request):
     """Officer Logout - Redirect back to dashboard (modal will auto-open)"""
     if request.method == 'POST':
-        request.session.pop('officer_id', None)
-        request.session.pop('officer_name', None)
-        request.session.pop('officer_email', None)
-        request.session.pop('assigned_district', None)
-        request.session.pop('is_officer', None)
+        logout_session(request)
         
         return JsonResponse({
             'success': True,
@@ -247,11 +382,7 @@ def logoutOfficer(request):
         })
     
     # For GET request
-    request.session.pop('officer_id', None)
-    request.session.pop('officer_name', None)
-    request.session.pop('officer_email', None)
-    request.session.pop('assigned_district', None)
-    request.session.pop('is_officer', None)
+    logout_session(request)
     
     return redirect('/officer/')  # Back to dashboard
 
@@ -266,183 +397,192 @@ def logoutOfficer(request):
 
 def application_dashboard(request):
     """
-    Officers - View dashboard with ALL applications in their district
-    Separated by status: pending, approved, rejected
+    Officers - Dashboard for applications in their district.
+    Renders the per-status counts; each status tab (pending, approved,
+    rejected) loads its applications page by page from dashboard_applications.
     """
-    # Get officer from session
-    officer_email = request.session.get('officer_email')
-    officer = Officer.objects.filter(officer_email=officer_email).first()
-    
-    # Initialize empty data
-    pending_data = []
-    approved_data = []
-    rejected_data = []
-    
-    # Only populate data if officer is logged in
-    if officer:
-        officer_district = officer.assigned_district
-        
-        # Get PENDING applications (SUBMITTED + UNDER_REVIEW)
-        pending_applications = SubsidyApplication.objects.filter(
-            status__in=['SUBMITTED', 'UNDER_REVIEW'],
-            district=officer_district
-        ).order_by('-created_at')
-        
-        # Get APPROVED applications
-        approved_applications = SubsidyApplication.objects.filter(
-            status='APPROVED',
-            district=officer_district
-        ).order_by('-created_at')
-        
-        # Get REJECTED applications
-        rejected_applications = SubsidyApplication.objects.filter(
-            status='REJECTED',
-            district=officer_district
-        ).order_by('-created_at')
-        
-        # Format pending data
-        pending_data = [{
-            'application_id': app.application_id,
-            'full_name': app.full_name,
-            'email': app.email,
-            'mobile': app.mobile,
-            'aadhar_or_id': app.aadhaar_or_id,
-            'district': app.district,
-            'pincode': app.pincode,
-            'property_address': app.property_address,
-            'property_type': getattr(app, 'property_type', 'N/A'),
-            'system_type': getattr(app, 'system_type', 'N/A'),
-            'estimated_cost': str(getattr(app, 'estimated_cost', '0')),
-            'status': app.status,
-            'created_at': app.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'geo_latitude': app.geo_latitude,
-            'geo_longitude': app.geo_longitude,
-            'gps_accuracy_meters': app.gps_accuracy_meters,
-            'calculation_pdf_url': app.calculation_pdf.url if app.calculation_pdf else None
-        } for app in pending_applications]
-        
-        # Format approved data
-        approved_data = [{
-            'application_id': app.application_id,
-            'full_name': app.full_name,
-            'email': app.email,
-            'mobile': app.mobile,
-            'aadhar_or_id': app.aadhaar_or_id,
-            'district': app.district,
-            'pincode': app.pincode,
-            'property_address': app.property_address,
-            'property_type': getattr(app, 'property_type', 'N/A'),
-            'system_type': getattr(app, 'system_type', 'N/A'),
-            'estimated_cost': str(getattr(app, 'estimated_cost', '0')),
-            'status': app.status,
-            'created_at': app.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'geo_latitude': app.geo_latitude,
-            'geo_longitude': app.geo_longitude,
-            'gps_accuracy_meters': app.gps_accuracy_meters,
-            'calculation_pdf_url': app.calculation_pdf.url if app.calculation_pdf else None
-        } for app in approved_applications]
-        
-        # Format rejected data
-        rejected_data = [{
-            'application_id': app.application_id,
-            'full_name': app.full_name,
-            'email': app.email,
-            'mobile': app.mobile,
-            'aadhar_or_id': app.aadhaar_or_id,
-            'district': app.district,
-            'pincode': app.pincode,
-            'property_address': app.property_address,
-            'property_type': getattr(app, 'property_type', 'N/A'),
-            'system_type': getattr(app, 'system_type', 'N/A'),
-            'estimated_cost': str(getattr(app, 'estimated_cost', '0')),
-            'status': app.status,
-            'created_at': app.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'geo_latitude': app.geo_latitude,
-            'geo_longitude': app.geo_longitude,
-            'gps_accuracy_meters': app.gps_accuracy_meters,
-            'calculation_pdf_url': app.calculation_pdf.url if app.calculation_pdf else None,
-            'rejection_reason': app.rejection_reason if hasattr(app, 'rejection_reason') else None
-        } for app in rejected_applications]
+    # Officer snapshot from the session, checked against the per-process cache
+    officer = current_officer(request)
+    
+    counts = status_counts(officer['assigned_district']) if officer else {}
     
     context = {
         'officer': officer,
-        'officer_district': officer.assigned_district if officer else None,
-        'pending_data': pending_data,
-        'approved_data': approved_data,
-        'rejected_data': rejected_data,
-        'pending_count': len(pending_data),
-        'approved_count': len(approved_data),
-        'rejected_count': len(rejected_data),
+        'officer_district': officer['assigned_district'] if officer else None,
+        'pending_count': counts.get('pending', 0),
+        'approved_count': counts.get('approved', 0),
+        'rejected_count': counts.get('rejected', 0),
+        'page_size': DASHBOARD_PAGE_SIZE,
+        'changes_cursor': changes_cursor(officer['assigned_district']) if officer else None,
+        # Only an ASGI server can hold the change stream open without tying up a worker thread
+        'changes_stream': isinstance(request, ASGIRequest),
+        'changes_poll_ms': DASHBOARD_BROWSER_POLL_INTERVAL * 1000,
         'is_officer_logged_in': bool(officer)
     }
     
     return render(request, 'application_dashboard.html', context)
 
-# ============================================
-# OFFICER PORTAL - APPLICATION ACTIONS
-# ============================================
+@require_GET
+@officer_required
+def dashboard_applications(request):
+    """
+    Officers - One page of a dashboard tab as JSON.
+    Query params: tab (pending|approved|rejected), cursor (from next_cursor), limit.
+    """
+    tab = request.GET.get('tab', 'pending')
+    if tab not in STATUS_TABS:
+        return JsonResponse({
+            'success': False,
+            'message': f"Unknown tab. Use one of: {', '.join(STATUS_TABS)}"
+        }, status=400)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', DASHBOARD_PAGE_SIZE)), 1), DASHBOARD_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = DASHBOARD_PAGE_SIZE
+    
+    try:
+        applications, next_cursor = application_page(
+            request.officer['assigned_district'], tab, request.GET.get('cursor'), limit
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'tab': tab,
+        'applications': applications,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    })
 
-# ============================================
-# OFFICER PORTAL - APPLICATION ACTIONS
-# ============================================
+def changes_event(cursor, payload):
+    # The event id is the cursor, so a reconnecting EventSource resumes from it via Last-Event-ID
+    return f"id: {cursor}\nevent: changes\ndata: {json.dumps(payload)}\n\n"
 
-@csrf_exempt
-@require_POST
-def approve_application(request):
-    """Officers - Approve an application"""
+async def dashboard_event_stream(district, cursor):
+    """
+    Server-sent ``changes`` events for one district until DASHBOARD_STREAM_SECONDS
+    pass. Each check is one indexed query; rows re-read because they have not
+    settled yet are only sent again if they changed.
+    """
+    deadline = time.monotonic() + DASHBOARD_STREAM_SECONDS
+    sent = {}  # application_id -> updated_at already pushed
+    yield f"retry: {int(DASHBOARD_POLL_INTERVAL * 1000)}\n\n"
+    while time.monotonic() < deadline:
+        applications, next_cursor, has_more = await sync_to_async(application_changes)(district, cursor)
+        fresh = [app for app in applications if sent.get(app['application_id']) != app['updated_at']]
+        sent = {app['application_id']: app['updated_at'] for app in applications}
+
+        if fresh:
+            counts = await sync_to_async(status_counts)(district)
+            yield changes_event(next_cursor, {'applications': fresh, 'counts': counts})
+        else:
+            yield ": keep-alive\n\n"
+
+        advanced = next_cursor != cursor
+        cursor = next_cursor
+        if not (has_more and advanced):
+            await asyncio.sleep(DASHBOARD_POLL_INTERVAL)
+
+@require_GET
+@officer_required
+async def dashboard_changes(request):
+    """
+    Officers - Applications created or changed in the district after a cursor,
+    so an open dashboard can patch itself instead of reloading.
+    Query params: cursor (from the dashboard page or a previous response).
+    With ``Accept: text/event-stream`` (or stream=1) under an ASGI server
+    this is a server-sent event stream; otherwise one JSON batch.
+    """
+    district = request.officer['assigned_district']
+    # A reconnecting EventSource repeats the original URL; Last-Event-ID holds where it got to
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('cursor')
+    stream = request.GET.get('stream') == '1' or 'text/event-stream' in request.headers.get('Accept', '')
+    # Under WSGI Django buffers an async stream to the end, so answer with one batch instead
+    stream = stream and isinstance(request, ASGIRequest)
     
-    # Check if officer is logged in
-    if not request.session.get('is_officer'):
-        return JsonResponse({
-            'success': False,
-            'message': 'You must be logged in as an officer'
-        }, status=403)
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    else:
+        cursor = await sync_to_async(changes_cursor)(district)
     
-    # Get application_id from POST data (not URL parameter)
-    application_id = request.POST.get('application_id')
+    if stream:
+        response = StreamingHttpResponse(dashboard_event_stream(district, cursor), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Let nginx pass events through unbuffered
+        return response
     
-    if not application_id:
+    applications, next_cursor, has_more = await sync_to_async(application_changes)(district, cursor)
+    return JsonResponse({
+        'success': True,
+        'applications': applications,
+        'counts': await sync_to_async(status_counts)(district) if applications else None,
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    })
+
+@require_GET
+@officer_required
+def export_applications(request):
+    """
+    Officers - Stream the district's applications as CSV or XLSX.
+    Query params: format (csv|xlsx), status (status code or tab), from/to
+    (YYYY-MM-DD, inclusive), after (last application_id received, to resume
+    an interrupted CSV download; the header row is then omitted).
+    """
+    export_format = request.GET.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
         return JsonResponse({
             'success': False,
-            'message': 'Application ID is required'
+            'message': f"Unknown format. Use one of: {', '.join(EXPORT_FORMATS)}"
         }, status=400)
     
-    try:
-        application = SubsidyApplication.objects.get(application_id=application_id)
-        application.status = 'APPROVED'
-        application.save()
-        
-        return JsonResponse({
-            'success': True,
-            'message': 'Application approved successfully!'
-        })
-    except SubsidyApplication.DoesNotExist:
-        return JsonResponse({
-            'success': False,
-            'message': 'Application not found'
-        }, status=404)
-    except Exception as e:
+    district = request.officer['assigned_district']
+    after = request.GET.get('after')
+    if after and export_format == 'xlsx':
+        # Rows after a point would form a separate workbook that cannot be joined to the partial file
         return JsonResponse({
             'success': False,
-            'message': str(e)
-        }, status=500)
+            'message': 'XLSX downloads cannot be resumed; start a new export or use format=csv'
+        }, status=400)
+    try:
+        queryset = export_queryset(
+            district,
+            status=request.GET.get('status'),
+            date_from=request.GET.get('from'),
+            date_to=request.GET.get('to'),
+            after=after,
+        )
+    except ExportError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    
+    filename = f"applications-{district}-{timezone.localdate():%Y%m%d}".replace(' ', '_')
+    if export_format == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(queryset, header=not after),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        response = StreamingHttpResponse(stream_csv(queryset, header=not after), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['Cache-Control'] = 'no-store'
+    return response
 
+# ============================================
+# OFFICER PORTAL - APPLICATION ACTIONS
+# ============================================
 
-@csrf_exempt
-@require_POST
-def reject_application(request):
-    """Officers - Reject an application"""
-    
-    # Check if officer is logged in
-    if not request.session.get('is_officer'):
-        return JsonResponse({
-            'success': False,
-            'message': 'You must be logged in as an officer'
-        }, status=403)
-    
-    # Get data from POST body
+# ============================================
+# OFFICER PORTAL - APPLICATION ACTIONS
+# ============================================
+
+def _single_status_change(request, status, success_message, reason=''):
+    """Apply one officer action to the application_id in the POST body"""
     application_id = request.POST.get('application_id')
-    reason = request.POST.get('reason', '')
     
     if not application_id:
         return JsonResponse({
@@ -450,71 +590,107 @@ def reject_application(request):
             'message': 'Application ID is required'
         }, status=400)
     
-    if not reason:
+    try:
+        result = apply_status(
+            request.officer['assigned_district'],
+            request.officer['id'],
+            [application_id],
+            status,
+            reason=reason,
+        )[0]['result']
+    except ActionError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    except Exception as e:
         return JsonResponse({
             'success': False,
-            'message': 'Rejection reason is required'
-        }, status=400)
+            'message': str(e)
+        }, status=500)
     
-    try:
-        application = SubsidyApplication.objects.get(application_id=application_id)
-        application.status = 'REJECTED'
-        application.rejection_reason = reason
-        application.save()
-        
-        return JsonResponse({
-            'success': True,
-            'message': 'Application rejected!'
-        })
-    except SubsidyApplication.DoesNotExist:
+    if result == NOT_FOUND:
         return JsonResponse({
             'success': False,
             'message': 'Application not found'
         }, status=404)
-    except Exception as e:
-        return JsonResponse({
-            'success': False,
-            'message': str(e)
-        }, status=500)
+    
+    return JsonResponse({
+        'success': True,
+        'message': success_message
+    })
+
+
+@csrf_exempt
+@require_POST
+@officer_required
+def approve_application(request):
+    """Officers - Approve an application"""
+    return _single_status_change(request, 'APPROVED', 'Application approved successfully!')
 
 
 @csrf_exempt
 @require_POST
+@officer_required
+def reject_application(request):
+    """Officers - Reject an application"""
+    return _single_status_change(
+        request, 'REJECTED', 'Application rejected!', reason=request.POST.get('reason', '')
+    )
+
+
+@csrf_exempt
+@require_POST
+@officer_required
 def under_review_application(request):
     """Officers - Mark application as under review"""
-    
-    # Check if officer is logged in
-    if not request.session.get('is_officer'):
-        return JsonResponse({
-            'success': False,
-            'message': 'You must be logged in as an officer'
-        }, status=403)
-    
-    # Get application_id from POST data
-    application_id = request.POST.get('application_id')
-    
-    if not application_id:
-        return JsonResponse({
-            'success': False,
-            'message': 'Application ID is required'
-        }, status=400)
+    return _single_status_change(request, 'UNDER_REVIEW', 'Application marked as under review!')
+
+
+@csrf_exempt
+@require_POST
+@officer_required
+def bulk_application_action(request):
+    """
+    Officers - Apply one action to many applications in a single transaction.
+    Body (JSON or form): application_ids (list), status (APPROVED, REJECTED
+    or UNDER_REVIEW), reason (required for REJECTED), rejection_code, remarks.
+    Returns a result per ID: updated, unchanged or not_found.
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'success': False, 'message': 'Invalid JSON data'}, status=400)
+        if not isinstance(data, dict) or not isinstance(data.get('application_ids', []), list):
+            return JsonResponse({'success': False, 'message': 'application_ids must be a list'}, status=400)
+        application_ids = data.get('application_ids', [])
+    else:
+        data = request.POST
+        application_ids = request.POST.getlist('application_ids')
     
     try:
-        application = SubsidyApplication.objects.get(application_id=application_id)
-        application.status = 'UNDER_REVIEW'  # or whatever status you use
-        application.save()
-        
-        return JsonResponse({
-            'success': True,
-            'message': 'Application marked as under review!'
-        })
-    except SubsidyApplication.DoesNotExist:
-        return JsonResponse({
-            'success': False,
-            'message': 'Application not found'
-        }, status=404)
+        results = apply_status(
+            request.officer['assigned_district'],
+            request.officer['id'],
+            application_ids,
+            str(data.get('status', '')).upper(),
+            reason=data.get('reason', ''),
+            rejection_code=data.get('rejection_code', ''),
+            remarks=data.get('remarks', ''),
+        )
+    except ActionError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             'success': False,
             'message': str(e)
         }, status=500)
+    
+    summary = {outcome: 0 for outcome in (UPDATED, UNCHANGED, NOT_FOUND)}
+    for item in results:
+        summary[item['result']] += 1
+    
+    return JsonResponse({
+        'success': True,
+        'message': f"{summary[UPDATED]} application(s) updated",
+        'results': results,
+        'summary': summary
+    })
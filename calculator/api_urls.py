@@ -6,9 +6,13 @@ app_name = 'calculator_api'
 
 urlpatterns = [
     path('calculate/', views.calculate_rainwater_harvest, name='calculate'),
+    path('calculate/batch/', views.calculate_rainwater_harvest_batch, name='calculate_batch'),
     path('districts/', views.list_districts, name='districts'),
     path('districts/<str:district_name>/', views.get_district_info, name='district_info'),
+    path('nearest/', views.nearest_location, name='nearest'),
     path('chart/<str:district_name>/', views.rainfall_chart, name='rainfall_chart'),  # ✅ This works
     path('chart/line/<str:district_name>/', views.rainfall_line_chart, name='rainfall_line_chart'),  # ✅ ADD THIS LINE
+    path('chart-data/<str:district_name>/', views.rainfall_chart_data, name='rainfall_chart_data'),
+    path('chart-data/line/<str:district_name>/', views.rainfall_line_chart_data, name='rainfall_line_chart_data'),
     path('save/', views.save_calculation_manual, name='save_calculation'),
 ]
@@ -0,0 +1,178 @@
+# calculator/batch.py
+"""
+Batch evaluation of many roofs in one request: records are validated and
+resolved against ``climate_registry``, then evaluated column-wise by
+``HarvestEngine.evaluate``.
+"""
+import csv
+import io
+import math
+from .engine import harvest_engine, climate_registry, INSTALLATION_FIXED_COSTS, PIT_DEPTH_M
+
+BATCH_MAX_RECORDS = 50000
+BATCH_TASK = 'calculator.evaluate_batch'
+
+
+def _to_float(x, default=0.0):
+    # 'nan' and 'inf' parse as floats but are no more usable than 'abc'
+    try:
+        value = float(x)
+    except Exception:
+        return default
+    return value if math.isfinite(value) else default
+
+
+def _to_int(x, default=0):
+    try:
+        return int(float(x))
+    except Exception:
+        return default
+
+
+def parse_csv_records(uploaded_file):
+    """Read an uploaded CSV survey into a list of record dicts (header row required)."""
+    text = uploaded_file.read().decode('utf-8-sig')
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def _normalise_record(record):
+    """Validate one input record; return (inputs, None) or (None, error)."""
+    district_name = str(record.get('district_name') or '').strip()
+    length = _to_float(record.get('length', 0))
+    width = _to_float(record.get('width', 0))
+    roof_area_sqm = _to_float(record.get('roof_area_sqm', 0))
+    if roof_area_sqm <= 0 and length > 0 and width > 0:
+        roof_area_sqm = length * width
+
+    roof_type = str(record.get('roof_type') or 'RCC').strip().upper()
+    number_of_dwellers = _to_int(record.get('number_of_dwellers', 1), 1)
+    annual_rainfall_mm = _to_float(record.get('annual_rainfall_mm', 0))
+
+    if not district_name:
+        return None, 'District name is required'
+    if roof_area_sqm <= 0:
+        return None, 'Valid roof area is required'
+    if number_of_dwellers <= 0:
+        return None, 'Number of dwellers must be at least 1'
+
+    peak_rainfall = math.nan
+    if annual_rainfall_mm <= 0:
+        matches = climate_registry.districts(district_name)
+        if not matches:
+            return None, f'District "{district_name}" not found in our database.'
+        if len(matches) > 1:
+            district_names = ", ".join(f"{d.district_name} ({d.state})" for d in matches[:3])
+            return None, f'Multiple districts named "{district_name}" found: {district_names}.'
+        climate = matches[0]
+        annual_rainfall_mm = climate.annual_rainfall_mm
+        state = climate.state or 'Not specified'
+        if climate.has_monthly:
+            peak_rainfall = climate.peak_rainfall_mm
+    else:
+        state = 'Custom'
+
+    return {
+        'district_name': district_name,
+        'state': state,
+        'roof_area_sqm': roof_area_sqm,
+        'roof_type': roof_type,
+        'runoff_coefficient': harvest_engine.runoff_coefficient(roof_type),
+        'number_of_dwellers': number_of_dwellers,
+        'annual_rainfall_mm': annual_rainfall_mm,
+        'peak_rainfall_mm': peak_rainfall,
+    }, None
+
+
+def calculate_batch(records):
+    """
+    Evaluate a list of calculation records in one pass.
+
+    Returns ``(results, summary)`` where ``results`` keeps the input order and
+    each entry is either ``{'index', 'success': True, 'data'}`` or
+    ``{'index', 'success': False, 'error'}``.
+    """
+    results = [None] * len(records)
+    valid_rows = []
+    valid_index = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            results[i] = {'index': i, 'success': False, 'error': 'Record must be an object'}
+            continue
+        inputs, error = _normalise_record(record)
+        if error:
+            results[i] = {'index': i, 'success': False, 'error': error}
+        else:
+            valid_rows.append(inputs)
+            valid_index.append(i)
+
+    summary = {
+        'records': len(records),
+        'succeeded': len(valid_rows),
+        'failed': len(records) - len(valid_rows),
+        'total_water_harvested_liters': 0,
+        'total_install_cost': 0,
+    }
+    if not valid_rows:
+        return results, summary
+
+    columns = harvest_engine.evaluate(
+        [r['roof_area_sqm'] for r in valid_rows],
+        [r['runoff_coefficient'] for r in valid_rows],
+        [r['annual_rainfall_mm'] for r in valid_rows],
+        [r['number_of_dwellers'] for r in valid_rows],
+        [r['peak_rainfall_mm'] for r in valid_rows],
+    )
+    columns = {name: values.tolist() for name, values in columns.items()}
+
+    evaluated = []
+    for j, (i, inputs) in enumerate(zip(valid_index, valid_rows)):
+        # Finite but huge inputs can still overflow; such a row cannot be rendered as JSON
+        if not all(math.isfinite(values[j]) for name, values in columns.items() if name != 'payback_years'):
+            results[i] = {'index': i, 'success': False, 'error': 'Roof area or rainfall is too large to calculate'}
+            continue
+        evaluated.append(j)
+        payback = columns['payback_years'][j]
+        tank = columns['tank_volume_liters'][j]
+        results[i] = {
+            'index': i,
+            'success': True,
+            'data': {
+                'district_name': inputs['district_name'],
+                'state': inputs['state'],
+                'annual_rainfall_mm': round(inputs['annual_rainfall_mm'], 2),
+                'roof_area_sqm': round(inputs['roof_area_sqm'], 2),
+                'roof_type': inputs['roof_type'],
+                'runoff_coefficient': round(inputs['runoff_coefficient'], 2),
+                'number_of_dwellers': inputs['number_of_dwellers'],
+                'water_harvested_liters': round(columns['water_harvested_liters'][j], 0),
+                'water_harvested_gallons': round(columns['water_harvested_gallons'][j], 0),
+                'daily_requirement_liters': int(columns['daily_requirement_liters'][j]),
+                'annual_requirement_liters': int(columns['annual_requirement_liters'][j]),
+                'efficiency_percent': round(columns['efficiency_percent'][j], 1),
+                'tank_volume_liters': round(tank, 0),
+                'tank_volume_m3': round(tank / 1000.0, 1),
+                'first_flush_liters': round(columns['first_flush_liters'][j], 0),
+                'available_recharge_liters': round(columns['available_recharge_liters'][j], 0),
+                'required_pit_volume_liters': round(columns['required_pit_volume_liters'][j], 0),
+                'pit_diameter_m': round(columns['pit_diameter_m'][j], 1),
+                'pit_depth_m': PIT_DEPTH_M,
+                'pit_area_m2': round(columns['pit_area_m2'][j], 1),
+                'costs': {
+                    'pit_construction_cost': round(columns['pit_construction_cost'][j], 0),
+                    'tank_construction_cost': round(columns['tank_construction_cost'][j], 0),
+                    'installation_fixed_costs': round(INSTALLATION_FIXED_COSTS, 0),
+                    'total_install_cost': round(columns['total_install_cost'][j], 0),
+                    'annual_water_savings': round(columns['annual_water_savings'][j], 0),
+                    'annual_maintenance_cost': round(columns['annual_maintenance_cost'][j], 0),
+                    'net_annual_savings': round(columns['net_annual_savings'][j], 0),
+                    'payback_years': None if math.isnan(payback) else round(payback, 1),
+                    'roi_percentage': round(columns['roi_percentage'][j], 1),
+                },
+            },
+        }
+
+    summary['succeeded'] = len(evaluated)
+    summary['failed'] = len(records) - len(evaluated)
+    summary['total_water_harvested_liters'] = round(sum(columns['water_harvested_liters'][j] for j in evaluated), 0)
+    summary['total_install_cost'] = round(sum(columns['total_install_cost'][j] for j in evaluated), 0)
+    return results, summary
@@ -0,0 +1,105 @@
+# calculator/district_index.py
+"""
+In-process autocomplete index over RainfallData districts.
+
+Built from ``climate_registry`` (so it shares its signal-based invalidation)
+and rebuilt whenever the registry reloads. Queries of three or more
+characters are narrowed through a trigram index; shorter ones scan the
+~700 entries directly.
+"""
+import threading
+from .engine import climate_registry
+
+NGRAM = 3
+DEFAULT_LIMIT = 20
+
+# Rank buckets, best first
+RANK_EXACT = 0
+RANK_DISTRICT_PREFIX = 1
+RANK_DISTRICT_WORD_PREFIX = 2
+RANK_STATE_PREFIX = 3
+RANK_DISTRICT_SUBSTRING = 4
+RANK_STATE_SUBSTRING = 5
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class DistrictIndex:
+    """Ranked prefix/substring search over district and state names."""
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = []
+        self._grams = {}
+
+    def _build(self):
+        entries = sorted(
+            self._registry.all_districts(),
+            key=lambda c: (c.district_name.lower(), (c.state or '').lower()),
+        )
+        keyed = [(c.district_name.lower(), (c.state or '').lower(), c) for c in entries]
+        grams = {}
+        for position, (name, state, _) in enumerate(keyed):
+            for gram in _ngrams(name) | _ngrams(state):
+                grams.setdefault(gram, set()).add(position)
+        self._entries = keyed
+        self._grams = grams
+
+    def _ensure_built(self):
+        version = self._registry.version
+        if version == self._version:
+            return
+        with self._lock:
+            if version != self._version:
+                self._build()
+                self._version = version
+
+    @staticmethod
+    def _rank(query, name, state):
+        if name == query:
+            return RANK_EXACT
+        if name.startswith(query):
+            return RANK_DISTRICT_PREFIX
+        if any(word.startswith(query) for word in name.split()[1:]):
+            return RANK_DISTRICT_WORD_PREFIX
+        if state.startswith(query):
+            return RANK_STATE_PREFIX
+        if query in name:
+            return RANK_DISTRICT_SUBSTRING
+        if query in state:
+            return RANK_STATE_SUBSTRING
+        return None
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Return up to ``limit`` DistrictClimate matches, best-ranked first."""
+        self._ensure_built()
+        query = (query or '').strip().lower()
+        if not query:
+            return [climate for _, _, climate in self._entries[:limit]]
+
+        if len(query) >= NGRAM:
+            candidates = None
+            for gram in _ngrams(query):
+                positions = self._grams.get(gram)
+                if not positions:
+                    return []
+                candidates = positions if candidates is None else candidates & positions
+            positions = sorted(candidates)
+        else:
+            positions = range(len(self._entries))
+
+        ranked = []
+        for position in positions:
+            name, state, climate = self._entries[position]
+            rank = self._rank(query, name, state)
+            if rank is not None:
+                ranked.append((rank, position, climate))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [climate for _, _, climate in ranked[:limit]]
+
+
+district_index = DistrictIndex(climate_registry)
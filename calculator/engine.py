@@ -0,0 +1,322 @@
+# calculator/engine.py
+"""
+Pure harvest/cost calculation engine.
+
+``HarvestEngine`` holds the formulas and constants used by the calculator API,
+the batch endpoint, the chart views and the chatbot calculator. District
+rainfall is supplied as a ``DistrictClimate`` taken from ``climate_registry``,
+an in-process snapshot of ``RainfallData`` and ``GraphPlot`` that is built
+with two queries and invalidated by model signals (see ``calculator.signals``).
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+
+# ================================
+# CALCULATION CONSTANTS
+# ================================
+
+RUNOFF_COEFFICIENTS = {
+    'RCC': 0.85,
+    'TERRACE': 0.85,
+    'METAL SHEET': 0.85,
+    'TILE ROOF': 0.75,
+    'TILE': 0.75,
+    'ASBESTOS': 0.6,
+    'ROUGH SURFACE': 0.6,
+    'GREEN ROOF': 0.4,
+    'SOIL': 0.4,
+}
+DEFAULT_RUNOFF_COEFFICIENT = 0.8
+
+PER_CAPITA_LPD = 135
+LITERS_TO_GALLONS = 0.264172
+FILTRATION_EFFICIENCY = 0.95  # First flush and filtration losses
+
+UNIT_COST_PER_M3_STRUCTURE = 2500.0  # Pit construction cost
+TANK_COST_PER_L = 8.0
+INSTALLATION_FIXED_COSTS = 15000.0
+
+UTILIZATION_FACTOR = 0.6  # 60% of harvest is actually used
+MUNICIPAL_SUBSTITUTION_RATE = 0.30
+MUNICIPAL_RATE_PER_KL = 25
+TANKER_AVOIDANCE_EVENTS = 3
+TANKER_COST_PER_EVENT = 2000
+MAINTENANCE_RATE = 0.01
+
+PIT_DEPTH_M = 2.0
+
+MONTH_FIELDS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+MONTH_LABELS = [m.upper() for m in MONTH_FIELDS]
+
+# Typical household consumption per person per month (liters)
+MONTHLY_CONSUMPTION_PER_PERSON = {
+    "JAN": 1767, "FEB": 1596, "MAR": 1897, "APR": 2070,
+    "MAY": 2139, "JUN": 2070, "JUL": 1860, "AUG": 1860,
+    "SEP": 1800, "OCT": 1897, "NOV": 1836, "DEC": 1767
+}
+
+# Safety net for multi-process deployments where another worker saved the row
+CLIMATE_REFRESH_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class DistrictClimate:
+    """Annual and monthly rainfall for one district."""
+    district_name: str
+    state: Optional[str]
+    annual_rainfall_mm: Optional[float]
+    monthly_rainfall_mm: Optional[Tuple[float, ...]] = None
+    updated_at: Optional[datetime] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @property
+    def has_location(self):
+        return self.latitude is not None and self.longitude is not None
+
+    @property
+    def has_monthly(self):
+        return self.monthly_rainfall_mm is not None
+
+    @property
+    def peak_rainfall_mm(self):
+        return max(self.monthly_rainfall_mm) if self.has_monthly else None
+
+    def monthly_values(self):
+        """Return rainfall values as (month, value), like GraphPlot.get_monthly_values()."""
+        if not self.has_monthly:
+            return []
+        return list(zip(MONTH_LABELS, self.monthly_rainfall_mm))
+
+
+class ClimateRegistry:
+    """Thread-safe, lazily loaded lookup of DistrictClimate by district name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._districts = None
+        self._profiles = None
+        self._loaded_at = 0.0
+        self._version = 0
+
+    def _load(self):
+        from .models import RainfallData, GraphPlot
+
+        graphs = {}
+        for gp in GraphPlot.objects.values('district_name', 'state', 'updated_at', *MONTH_FIELDS):
+            graphs.setdefault(gp['district_name'].strip().lower(), []).append(gp)
+
+        def monthly(gp):
+            return tuple(float(gp[m]) for m in MONTH_FIELDS)
+
+        def pick_graph(key, state):
+            candidates = graphs.get(key, [])
+            for gp in candidates:
+                if (gp['state'] or '').lower() == (state or '').lower():
+                    return gp
+            return candidates[0] if candidates else None
+
+        districts = {}
+        rainfall_rows = RainfallData.objects.values(
+            'district_name', 'state', 'annual_rainfall_mm', 'updated_at', 'latitude', 'longitude'
+        )
+        for row in rainfall_rows:
+            key = row['district_name'].strip().lower()
+            gp = pick_graph(key, row['state'])
+            updated_at = row['updated_at']
+            if gp and (updated_at is None or gp['updated_at'] > updated_at):
+                updated_at = gp['updated_at']
+            districts.setdefault(key, []).append(DistrictClimate(
+                district_name=row['district_name'],
+                state=row['state'],
+                annual_rainfall_mm=float(row['annual_rainfall_mm']),
+                monthly_rainfall_mm=monthly(gp) if gp else None,
+                updated_at=updated_at,
+                latitude=float(row['latitude']) if row['latitude'] is not None else None,
+                longitude=float(row['longitude']) if row['longitude'] is not None else None,
+            ))
+
+        profiles = {}
+        for key, candidates in graphs.items():
+            gp = candidates[0]
+            rainfall = next(
+                (c for c in districts.get(key, []) if (c.state or '').lower() == (gp['state'] or '').lower()),
+                None,
+            )
+            profiles[key] = DistrictClimate(
+                district_name=gp['district_name'],
+                state=gp['state'],
+                annual_rainfall_mm=rainfall.annual_rainfall_mm if rainfall else None,
+                monthly_rainfall_mm=monthly(gp),
+                updated_at=gp['updated_at'],
+                latitude=rainfall.latitude if rainfall else None,
+                longitude=rainfall.longitude if rainfall else None,
+            )
+
+        self._districts = districts
+        self._profiles = profiles
+        self._loaded_at = time.monotonic()
+        self._version += 1
+
+    def _ensure_loaded(self):
+        """Return a consistent (districts, profiles) snapshot, loading it if needed."""
+        districts, profiles = self._districts, self._profiles
+        if districts is not None and time.monotonic() - self._loaded_at < CLIMATE_REFRESH_SECONDS:
+            return districts, profiles
+        with self._lock:
+            if self._districts is None or time.monotonic() - self._loaded_at >= CLIMATE_REFRESH_SECONDS:
+                self._load()
+            return self._districts, self._profiles
+
+    def warm(self):
+        self._ensure_loaded()
+
+    def invalidate(self):
+        with self._lock:
+            self._districts = None
+            self._profiles = None
+
+    def districts(self, district_name):
+        """All RainfallData-backed climates matching the name (case-insensitive)."""
+        districts, _ = self._ensure_loaded()
+        return list(districts.get((district_name or '').strip().lower(), []))
+
+    def profile(self, district_name):
+        """Monthly (GraphPlot) climate for the name, or None if no monthly data."""
+        _, profiles = self._ensure_loaded()
+        return profiles.get((district_name or '').strip().lower())
+
+    def all_districts(self):
+        districts, _ = self._ensure_loaded()
+        return [climate for matches in districts.values() for climate in matches]
+
+    @property
+    def version(self):
+        """Increments on every reload; lets derived indexes know when to rebuild."""
+        self._ensure_loaded()
+        return self._version
+
+
+climate_registry = ClimateRegistry()
+
+
+class HarvestEngine:
+    """Stateless rainwater harvest, sizing and cost calculations."""
+
+    def runoff_coefficient(self, roof_type):
+        return RUNOFF_COEFFICIENTS.get((roof_type or '').strip().upper(), DEFAULT_RUNOFF_COEFFICIENT)
+
+    def annual_harvest_liters(self, roof_area_sqm, annual_rainfall_mm, runoff_coefficient):
+        return roof_area_sqm * annual_rainfall_mm * runoff_coefficient
+
+    def monthly_harvest(self, climate, roof_area_sqm, roof_type):
+        """Liters harvested per month as (month, liters)."""
+        runoff_coefficient = self.runoff_coefficient(roof_type)
+        return [
+            (month, rainfall_mm * roof_area_sqm * runoff_coefficient)
+            for month, rainfall_mm in climate.monthly_values()
+        ]
+
+    def monthly_consumption(self, number_of_people):
+        """Household consumption per month as (month, liters)."""
+        return [
+            (month, MONTHLY_CONSUMPTION_PER_PERSON[month] * number_of_people)
+            for month in MONTH_LABELS
+        ]
+
+    def evaluate(self, area, runoff, rainfall, dwellers, peak):
+        """
+        Run the harvest/tank/pit/cost pipeline over equal-length arrays.
+
+        ``peak`` holds the wettest month's rainfall, or NaN where no monthly
+        profile is available (custom rainfall or no GraphPlot row).
+        """
+        area = np.asarray(area, dtype=float)
+        runoff = np.asarray(runoff, dtype=float)
+        rainfall = np.asarray(rainfall, dtype=float)
+        dwellers = np.asarray(dwellers, dtype=float)
+        peak = np.asarray(peak, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            harvested = area * rainfall * runoff
+            daily_requirement = dwellers * PER_CAPITA_LPD
+            annual_requirement = daily_requirement * 365
+            efficiency = np.where(annual_requirement > 0, harvested / annual_requirement * 100, 0.0)
+
+            # Practical tank sizing from the peak month (2K-50K liters), else 15% of annual harvest
+            storage_factor = np.select(
+                [dwellers >= 6, dwellers >= 4, dwellers >= 2],
+                [0.25, 0.20, 0.15],
+                default=0.10,
+            )
+            peak_tank = np.clip(peak * area * runoff * FILTRATION_EFFICIENCY * storage_factor, 2000, 50000)
+            tank = np.where(np.isnan(peak), harvested * 0.15, peak_tank)
+
+            first_flush = area * 2
+            pit_volume_m3 = np.select([area >= 200, area >= 100], [25.0, 15.0], default=10.0)
+            pit_diameter = np.select([area >= 200, area >= 100], [4.0, 3.5], default=3.0)
+            pit_area = math.pi * (pit_diameter / 2) ** 2
+            available_recharge = np.maximum(0, harvested - first_flush - tank)
+
+            pit_cost = pit_volume_m3 * UNIT_COST_PER_M3_STRUCTURE
+            tank_cost = tank * TANK_COST_PER_L
+            total_cost = pit_cost + tank_cost + INSTALLATION_FIXED_COSTS
+
+            usage = np.minimum(harvested * UTILIZATION_FACTOR, annual_requirement)
+            municipal_savings = (usage * MUNICIPAL_SUBSTITUTION_RATE / 1000) * MUNICIPAL_RATE_PER_KL
+            water_savings = municipal_savings + TANKER_AVOIDANCE_EVENTS * TANKER_COST_PER_EVENT
+            maintenance = total_cost * MAINTENANCE_RATE
+            net_savings = water_savings - maintenance
+
+            payback = np.where(net_savings > 0, total_cost / net_savings, np.nan)
+            roi = np.where(total_cost > 0, (net_savings * 30 - total_cost) / total_cost * 100, 0.0)
+
+        return {
+            'water_harvested_liters': harvested,
+            'water_harvested_gallons': harvested * LITERS_TO_GALLONS,
+            'daily_requirement_liters': daily_requirement,
+            'annual_requirement_liters': annual_requirement,
+            'efficiency_percent': efficiency,
+            'tank_volume_liters': tank,
+            'first_flush_liters': first_flush,
+            'available_recharge_liters': available_recharge,
+            'required_pit_volume_liters': pit_volume_m3 * 1000,
+            'pit_diameter_m': pit_diameter,
+            'pit_area_m2': pit_area,
+            'pit_construction_cost': pit_cost,
+            'tank_construction_cost': tank_cost,
+            'total_install_cost': total_cost,
+            'annual_water_savings': water_savings,
+            'annual_maintenance_cost': maintenance,
+            'net_annual_savings': net_savings,
+            'payback_years': payback,
+            'roi_percentage': roi,
+        }
+
+    def calculate(self, roof_area_sqm, roof_type, number_of_dwellers, annual_rainfall_mm, climate=None):
+        """
+        Evaluate one roof. ``climate`` supplies the monthly profile used for
+        tank sizing; without it the tank falls back to 15% of annual harvest.
+        """
+        peak = climate.peak_rainfall_mm if climate and climate.has_monthly else math.nan
+        columns = self.evaluate(
+            [roof_area_sqm], [self.runoff_coefficient(roof_type)],
+            [annual_rainfall_mm], [number_of_dwellers], [peak],
+        )
+        result = {name: float(values[0]) for name, values in columns.items()}
+        if math.isnan(result['payback_years']):
+            result['payback_years'] = None
+        result['runoff_coefficient'] = self.runoff_coefficient(roof_type)
+        result['tank_volume_m3'] = result['tank_volume_liters'] / 1000.0
+        result['pit_depth_m'] = PIT_DEPTH_M
+        result['installation_fixed_costs'] = INSTALLATION_FIXED_COSTS
+        return result
+
+
+harvest_engine = HarvestEngine()
@@ -0,0 +1,131 @@
+# calculator/geo.py
+"""
+In-process nearest-neighbour lookups by latitude/longitude.
+
+``KDTree`` is a static 3-d tree over points converted to unit vectors on the
+sphere: straight-line (chord) distance between unit vectors orders points
+exactly like great-circle distance, so there is no special case at the poles
+or the antimeridian. A k-nearest query visits O(log n + k) nodes.
+
+``district_locator`` indexes the RainfallData districts that have
+coordinates. It is rebuilt from ``climate_registry`` whenever the registry
+reloads, so it shares its signal-based invalidation.
+"""
+import heapq
+import math
+import threading
+from .engine import climate_registry
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class InvalidLocation(ValueError):
+    pass
+
+
+def parse_location(lat, lon):
+    """``(lat, lon)`` as floats from query-string values. Raises ``InvalidLocation``."""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        raise InvalidLocation('lat and lon must be numbers')
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise InvalidLocation('lat must be within [-90, 90] and lon within [-180, 180]')
+    return lat, lon
+
+
+def _unit_vector(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+class KDTree:
+    """Immutable k-d tree over ``(lat, lon, item)`` points."""
+
+    def __init__(self, points):
+        self._items = [item for _, _, item in points]
+        self._vectors = [_unit_vector(lat, lon) for lat, lon, _ in points]
+        self._root = self._build(list(range(len(self._vectors))), 0)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self._vectors[i][axis])
+        middle = len(indices) // 2
+        return (
+            indices[middle],
+            axis,
+            self._build(indices[:middle], depth + 1),
+            self._build(indices[middle + 1:], depth + 1),
+        )
+
+    def nearest(self, lat, lon, k=1):
+        """Up to ``k`` ``(item, distance_km)`` pairs, nearest first."""
+        if k <= 0 or self._root is None:
+            return []
+        target = _unit_vector(lat, lon)
+        vectors = self._vectors
+        best = []  # Max-heap of (-squared chord, index) holding the k nearest so far
+
+        def visit(node):
+            index, axis, left, right = node
+            point = vectors[index]
+            distance = (
+                (target[0] - point[0]) ** 2 + (target[1] - point[1]) ** 2 + (target[2] - point[2]) ** 2
+            )
+            if len(best) < k:
+                heapq.heappush(best, (-distance, index))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, index))
+
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            if near is not None:
+                visit(near)
+            # The far side can only hold closer points if the splitting plane is nearer than the k-th best
+            if far is not None and (len(best) < k or offset * offset < -best[0][0]):
+                visit(far)
+
+        visit(self._root)
+        return [
+            (self._items[index], _chord_to_km(math.sqrt(-distance)))
+            for distance, index in sorted(best, reverse=True)
+        ]
+
+
+class DistrictLocator:
+    """Nearest RainfallData district to a point."""
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._version = None
+        self._tree = KDTree([])
+
+    def _ensure_built(self):
+        version = self._registry.version
+        if version == self._version:
+            return self._tree
+        with self._lock:
+            if version != self._version:
+                self._tree = KDTree([
+                    (climate.latitude, climate.longitude, climate)
+                    for climate in self._registry.all_districts() if climate.has_location
+                ])
+                self._version = version
+            return self._tree
+
+    def nearest(self, lat, lon, k=1):
+        """Up to ``k`` ``(DistrictClimate, distance_km)`` pairs, nearest first."""
+        return self._ensure_built().nearest(lat, lon, k)
+
+
+district_locator = DistrictLocator(climate_registry)
@@ -0,0 +1,49 @@
+# calculator/management/commands/load_district_locations.py
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from calculator.engine import climate_registry
+from calculator.geo import InvalidLocation, parse_location
+from calculator.models import RainfallData
+
+
+def _key(name):
+    return ' '.join((name or '').split()).upper()
+
+
+class Command(BaseCommand):
+    help = (
+        "Set RainfallData latitude/longitude from a CSV of district centroids "
+        "(columns: district_name, state, latitude, longitude)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="CSV file with district_name, state, latitude, longitude columns")
+
+    def handle(self, *args, **options):
+        rows = {(_key(row.state), _key(row.district_name)): row for row in RainfallData.objects.all()}
+        updated, unmatched = [], []
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as handle:
+                for line, record in enumerate(csv.DictReader(handle), 2):
+                    try:
+                        lat, lon = parse_location(record.get('latitude'), record.get('longitude'))
+                    except InvalidLocation as e:
+                        raise CommandError(f"Line {line}: {e}")
+                    row = rows.get((_key(record.get('state')), _key(record.get('district_name'))))
+                    if row is None:
+                        unmatched.append(f"{record.get('district_name')} ({record.get('state')})")
+                        continue
+                    row.latitude, row.longitude = round(lat, 8), round(lon, 8)
+                    updated.append(row)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        RainfallData.objects.bulk_update(updated, ['latitude', 'longitude'], batch_size=500)
+        # bulk_update sends no signals; other processes pick this up on their next registry refresh
+        climate_registry.invalidate()
+
+        for name in unmatched:
+            self.stderr.write(f"No RainfallData row for {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Located {len(updated)} district(s); {len(rows) - len(updated)} still without coordinates"
+        ))
@@ -0,0 +1,12 @@
+# calculator/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import RainfallData, GraphPlot
+from .engine import climate_registry
+
+
+@receiver([post_save, post_delete], sender=RainfallData)
+@receiver([post_save, post_delete], sender=GraphPlot)
+def invalidate_district_caches(sender, **kwargs):
+    """Drop in-process district snapshots when rainfall data changes."""
+    climate_registry.invalidate()
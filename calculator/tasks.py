@@ -0,0 +1,10 @@
+# calculator/tasks.py
+from jobs.queue import task
+from .batch import BATCH_TASK, calculate_batch
+
+
+@task(BATCH_TASK)
+def evaluate_batch(records):
+    """Evaluate a batch posted with background=1"""
+    results, summary = calculate_batch(records)
+    return {'summary': summary, 'results': results}
@@ -1,18 +1,28 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.http import HttpResponse
+from django.urls import reverse
+from jobs.queue import enqueue
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
 from .models import RainfallData, CalculationLog, GraphPlot
+from .batch import calculate_batch, parse_csv_records, BATCH_MAX_RECORDS, BATCH_TASK
+from .engine import harvest_engine, climate_registry
+from .district_index import district_index
+from .geo import InvalidLocation, district_locator, parse_location
+from vendorRegistration.locations import vendor_locator
+from .chart_cache import chart_key, chart_last_modified, get_or_render, CHART_MAX_AGE
 import logging
+import math
 import io
 import matplotlib
 matplotlib.use('Agg')  # Set backend before importing pyplot
 import matplotlib.pyplot as plt
-import math
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -50,7 +60,6 @@ def calculate_rainwater_harvest(request):
         length = to_float(data.get("length", 0))
         width = to_float(data.get("width", 0))
         roof_area_sqm = to_float(data.get("roof_area_sqm", 0))
-        per_capita_lpd = 135
         
         if roof_area_sqm <= 0 and length > 0 and width > 0:
             roof_area_sqm = length * width
@@ -78,17 +87,18 @@ def calculate_rainwater_harvest(request):
                 'error': 'Number of dwellers must be at least 1'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Handle district lookup and duplicates
+        # Handle district lookup and duplicates (served from the in-process district snapshot)
+        climate = None
         if annual_rainfall_mm <= 0:
-            districts = RainfallData.objects.filter(district_name__iexact=district_name)
+            districts = climate_registry.districts(district_name)
         
-            if not districts.exists():
+            if not districts:
                 return Response({
                     'success': False,
                     'error': f'District "{district_name}" not found in our database. Please search and select from available districts.'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            elif districts.count() > 1:
+            elif len(districts) > 1:
                 district_list = [f"{d.district_name} ({d.state})" for d in districts[:3]]
                 district_names = ", ".join(district_list)
                 return Response({
@@ -97,134 +107,41 @@ def calculate_rainwater_harvest(request):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             else:
-                district = districts.first()
-                annual_rainfall_mm = float(district.annual_rainfall_mm)
-                state = district.state or 'Not specified'
+                climate = districts[0]
+                annual_rainfall_mm = climate.annual_rainfall_mm
+                state = climate.state or 'Not specified'
         else:
-            district = None
             state = 'Custom'
         
-        # Runoff coefficients mapping
-        runoff_coefficients = {
-            'RCC': 0.85,
-            'TERRACE': 0.85, 
-            'METAL SHEET': 0.85,
-            'TILE ROOF': 0.75,
-            'TILE': 0.75,
-            'ASBESTOS': 0.6,
-            'ROUGH SURFACE': 0.6,
-            'GREEN ROOF': 0.4,
-            'SOIL': 0.4,
-        }
-        
-        runoff_coefficient = runoff_coefficients.get(roof_type, 0.8)
-        
-        # Core calculations
-        water_harvested_liters = roof_area_sqm * annual_rainfall_mm * runoff_coefficient
-        water_harvested_gallons = water_harvested_liters * 0.264172
-        
-        daily_requirement_liters = number_of_dwellers * per_capita_lpd
-        annual_requirement_liters = daily_requirement_liters * 365
-        
-        efficiency_percent = (water_harvested_liters / annual_requirement_liters) * 100 if annual_requirement_liters > 0 else 0
-        
-        # CORRECTED COST PARAMETERS
-        unit_cost_per_m3_structure = 2500.0  # Realistic pit construction cost
-        tank_cost_per_l = 8.0  # CORRECTED: Market-realistic tank cost
-        installation_fixed_costs = 15000.0  # Slightly higher for quality
-        cost_per_kl = 100.0  # CORRECTED: Realistic tanker replacement cost
-        
-        # PRACTICAL SIZING APPROACH - FIXED: Use GraphPlot instead of RainfallData
-        if district:
-            try:
-                gp = GraphPlot.objects.get(district_name__iexact=district_name)
-                months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-                month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                
-                rainfall_values = [float(getattr(gp, month, 0)) for month in months]
-                max_index = rainfall_values.index(max(rainfall_values))
-                
-                peak_month = month_names[max_index]
-                peak_rainfall = rainfall_values[max_index]
-                    
-                # Extract the coefficient value first
-                runoff_coefficient = runoff_coefficients.get(roof_type, 0.8)  # Get float value
-                filtration_efficiency = 0.95  # Account for first flush and filtration losses
-                max_monthly_harvest = float(peak_rainfall) * roof_area_sqm * runoff_coefficient * filtration_efficiency
-                
-                # Storage factor based on household size (practical sizing)
-                if number_of_dwellers >= 6:
-                    storage_factor = 0.25  # 25% for large families
-                elif number_of_dwellers >= 4:
-                    storage_factor = 0.20  # 20% for medium families  
-                elif number_of_dwellers >= 2:
-                    storage_factor = 0.15  # 15% for small families
-                else:
-                    storage_factor = 0.10  # 10% for single person
-                
-                # Calculate practical tank size
-                practical_tank_liters = max_monthly_harvest * storage_factor
-                
-                # Apply practical limits (2K-50K liter range)
-                practical_tank_liters = max(2000, min(practical_tank_liters, 50000))
-            except GraphPlot.DoesNotExist:
-                # Fallback if no GraphPlot data
-                practical_tank_liters = water_harvested_liters * 0.15
-        else:
-            # Fallback for custom rainfall input
-            practical_tank_liters = water_harvested_liters * 0.15
-
-        tank_volume_liters = practical_tank_liters
-        tank_volume_m3 = tank_volume_liters / 1000.0
-        
-        # First flush calculation
-        first_flush_liters = roof_area_sqm * 2
-        
-        # Practical recharge pit sizing
-        if roof_area_sqm >= 200:
-            practical_pit_volume_m3 = 25  # Large pit
-            pit_diameter_m = 4.0
-        elif roof_area_sqm >= 100: 
-            practical_pit_volume_m3 = 15  # Medium pit
-            pit_diameter_m = 3.5
-        else:
-            practical_pit_volume_m3 = 10  # Small pit
-            pit_diameter_m = 3.0
-
-        pit_depth_m = 2.0
-        pit_area_m2 = math.pi * (pit_diameter_m / 2) ** 2
-        
-        # Available recharge calculation
-        available_recharge_liters = max(0, water_harvested_liters - first_flush_liters - tank_volume_liters)
-        required_pit_volume_liters = practical_pit_volume_m3 * 1000
-        
-        # CORRECTED COST CALCULATIONS
-        pit_construction_cost = practical_pit_volume_m3 * unit_cost_per_m3_structure
-        tank_construction_cost = tank_volume_liters * tank_cost_per_l
-        total_install_cost = pit_construction_cost + tank_construction_cost + installation_fixed_costs
-        
-        # CORRECTED BENEFITS CALCULATION
-        utilization_factor = 0.6  # 60% of harvest is actually used
-        annual_usage_liters = min(water_harvested_liters * utilization_factor, annual_requirement_liters)
-        
-        # Multi-source benefits
-        municipal_substitution_rate = 0.30  # 30% substitutes municipal water
-        municipal_rate_per_kL = 25  # Municipal water rate
-        tanker_avoidance_events = 3  # Shortage events avoided per year
-        tanker_cost_per_event = 2000  # Cost per tanker delivery
-        
-        # Calculate realistic annual savings
-        municipal_savings = (annual_usage_liters * municipal_substitution_rate / 1000) * municipal_rate_per_kL
-        tanker_savings = tanker_avoidance_events * tanker_cost_per_event
-        annual_water_savings = municipal_savings + tanker_savings
-        
-        # CORRECTED MAINTENANCE & PAYBACK
-        annual_maintenance_cost = total_install_cost * 0.01  # 1% instead of 2%
-        net_annual_savings = annual_water_savings - annual_maintenance_cost
+        result = harvest_engine.calculate(
+            roof_area_sqm, roof_type, number_of_dwellers, annual_rainfall_mm, climate=climate
+        )
         
-        # Payback calculation
-        payback_years = total_install_cost / net_annual_savings if net_annual_savings > 0 else None
-        roi_percentage = (net_annual_savings * 30 - total_install_cost) / total_install_cost * 100 if total_install_cost > 0 else 0
+        runoff_coefficient = result['runoff_coefficient']
+        water_harvested_liters = result['water_harvested_liters']
+        water_harvested_gallons = result['water_harvested_gallons']
+        daily_requirement_liters = int(result['daily_requirement_liters'])
+        annual_requirement_liters = int(result['annual_requirement_liters'])
+        efficiency_percent = result['efficiency_percent']
+        
+        tank_volume_liters = result['tank_volume_liters']
+        tank_volume_m3 = result['tank_volume_m3']
+        first_flush_liters = result['first_flush_liters']
+        available_recharge_liters = result['available_recharge_liters']
+        required_pit_volume_liters = result['required_pit_volume_liters']
+        pit_diameter_m = result['pit_diameter_m']
+        pit_depth_m = result['pit_depth_m']
+        pit_area_m2 = result['pit_area_m2']
+        
+        pit_construction_cost = result['pit_construction_cost']
+        tank_construction_cost = result['tank_construction_cost']
+        installation_fixed_costs = result['installation_fixed_costs']
+        total_install_cost = result['total_install_cost']
+        annual_water_savings = result['annual_water_savings']
+        annual_maintenance_cost = result['annual_maintenance_cost']
+        net_annual_savings = result['net_annual_savings']
+        payback_years = result['payback_years']
+        roi_percentage = result['roi_percentage']
         
         # Enhanced recommendations
         enhanced_recommendations = [
@@ -304,6 +221,66 @@ def calculate_rainwater_harvest(request):
             'error': 'Internal server error. Please try again later.'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@parser_classes([JSONParser, MultiPartParser, FormParser])
+def calculate_rainwater_harvest_batch(request):
+    """
+    Batch calculation API: JSON array (or {"records": [...]}) or CSV upload in `file`.
+    With ?background=1 (or "background": true) the batch is evaluated by a job
+    worker and 202 returns the job whose result holds the summary and results.
+    """
+    try:
+        if 'file' in request.FILES:
+            records = parse_csv_records(request.FILES['file'])
+        elif isinstance(request.data, list):
+            records = request.data
+        else:
+            records = request.data.get('records')
+
+        if not isinstance(records, list) or not records:
+            return Response({
+                'success': False,
+                'error': 'Provide a non-empty JSON array of records or a CSV file'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(records) > BATCH_MAX_RECORDS:
+            return Response({
+                'success': False,
+                'error': f'A batch may contain at most {BATCH_MAX_RECORDS} records'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        background = request.query_params.get('background') in ('1', 'true') or (
+            isinstance(request.data, dict) and request.data.get('background') in (True, '1', 'true')
+        )
+        if background:
+            job = enqueue(BATCH_TASK, {'records': records})
+            return Response({
+                'success': True,
+                'job_id': str(job.job_id),
+                'status_url': reverse('jobs:status', args=[job.job_id])
+            }, status=status.HTTP_202_ACCEPTED)
+
+        results, summary = calculate_batch(records)
+
+        return Response({
+            'success': True,
+            'summary': summary,
+            'results': results
+        }, status=status.HTTP_200_OK)
+
+    except UnicodeDecodeError:
+        return Response({
+            'success': False,
+            'error': 'CSV file must be UTF-8 encoded'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as exc:
+        logger.error(f"Error in calculate_rainwater_harvest_batch: {str(exc)}", exc_info=True)
+        return Response({
+            'success': False,
+            'error': 'Internal server error. Please try again later.'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_districts(request):
@@ -311,19 +288,12 @@ def list_districts(request):
     try:
         search = request.query_params.get('search', '').strip()
         
-        queryset = RainfallData.objects.all()
-        
-        if search:
-            queryset = queryset.filter(
-                Q(district_name__icontains=search) | 
-                Q(state__icontains=search)
-            ).distinct()
-        
+        # Served from the in-process index; exact and prefix matches rank first
         data = [{
             'district_name': d.district_name,
             'state': d.state or 'Not specified',
-            'annual_rainfall_mm': round(float(d.annual_rainfall_mm), 0)
-        } for d in queryset[:20]]
+            'annual_rainfall_mm': round(d.annual_rainfall_mm, 0)
+        } for d in district_index.search(search, limit=20)]
         
         return Response({
             'success': True,
@@ -343,14 +313,17 @@ def list_districts(request):
 def get_district_info(request, district_name):
     """Get specific district information."""
     try:
-        district = get_object_or_404(RainfallData, district_name__iexact=district_name)
+        districts = climate_registry.districts(district_name)
+        if not districts:
+            raise RainfallData.DoesNotExist
+        district = districts[0]
         
         return Response({
             'success': True,
             'data': {
                 'district_name': district.district_name,
                 'state': district.state or 'Not specified',
-                'annual_rainfall_mm': round(float(district.annual_rainfall_mm), 0)
+                'annual_rainfall_mm': round(district.annual_rainfall_mm, 0)
             }
         }, status=status.HTTP_200_OK)
     except Exception as e:
@@ -359,6 +332,54 @@ def get_district_info(request, district_name):
             'error': f'District "{district_name}" not found'
         }, status=status.HTTP_404_NOT_FOUND)
 
+NEAREST_VENDORS_DEFAULT = 5
+NEAREST_VENDORS_MAX = 20
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def nearest_location(request):
+    """Rainfall profile of the nearest district and the nearest vendors to ?lat=&lon=."""
+    try:
+        lat, lon = parse_location(request.query_params.get('lat'), request.query_params.get('lon'))
+        k = int(request.query_params.get('k', NEAREST_VENDORS_DEFAULT))
+    except (InvalidLocation, ValueError) as e:
+        message = str(e) if isinstance(e, InvalidLocation) else 'k must be a whole number'
+        return Response({'success': False, 'error': message}, status=status.HTTP_400_BAD_REQUEST)
+    k = max(1, min(k, NEAREST_VENDORS_MAX))
+
+    try:
+        nearest = district_locator.nearest(lat, lon, 1)
+        if not nearest:
+            # No district has coordinates yet: the rainfall fixture ships none (see load_district_locations)
+            district = None
+        else:
+            (climate, distance), = nearest
+            district = {
+                'district_name': climate.district_name,
+                'state': climate.state or 'Not specified',
+                'annual_rainfall_mm': round(climate.annual_rainfall_mm or 0, 0),
+                'monthly_rainfall_mm': dict(climate.monthly_values()) if climate.has_monthly else None,
+                'distance_km': round(distance, 1),
+            }
+
+        vendors = [
+            {**vendor, 'distance_km': round(distance, 1)}
+            for vendor, distance in vendor_locator.nearest(lat, lon, k)
+        ]
+
+        return Response({
+            'success': True,
+            'location': {'lat': lat, 'lon': lon},
+            'district': district,
+            'vendors': vendors,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Nearest lookup error: {str(e)}")
+        return Response({
+            'success': False,
+            'error': 'Failed to look up nearby districts. Please try again.'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['POST'])
 def save_calculation_manual(request):
     """Manually save calculation for authenticated users."""
@@ -374,6 +395,7 @@ def save_calculation_manual(request):
         calculation = CalculationLog.objects.create(
             user=request.user,
             district_name=data.get('district_name'),
+            state=data.get('state') or '',
             roof_area_sqm=data.get('roof_area_sqm'),
             roof_type=data.get('roof_type'),
             runoff_coefficient=data.get('runoff_coefficient'),
@@ -396,138 +418,160 @@ def save_calculation_manual(request):
             'error': 'Failed to save calculation. Please try again.'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def rainfall_chart(request, district_name):
-    """Generate monthly rainfall chart for a district."""
+def _figure_png(fig, **savefig_kwargs):
+    """Rasterise a matplotlib figure to PNG bytes and release it."""
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format="png", dpi=150, bbox_inches='tight', facecolor='white', **savefig_kwargs)
+    plt.close(fig)
+    return buffer.getvalue()
+
+def _render_rainfall_chart(profile, district_name):
+    monthly_rainfall = dict(profile.monthly_values())
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    months = list(monthly_rainfall.keys())
+    values = list(monthly_rainfall.values())
+    
+    bars = ax.bar(months, values, color='skyblue', edgecolor='navy', linewidth=1.2)
+    
+    ax.set_title(f"Monthly Rainfall - {district_name.title()}", 
+                 fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel("Month", fontsize=12)
+    ax.set_ylabel("Rainfall (mm)", fontsize=12)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    
+    # Add value labels on bars
+    for bar, value in zip(bars, values):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + max(values)*0.01,
+                f'{value:.0f}mm', ha='center', va='bottom', fontsize=9)
+    
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    return _figure_png(fig, edgecolor='none')
+
+def _render_placeholder_chart(district_name):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.text(0.5, 0.5, f'Monthly rainfall data\nnot available for\n{district_name}', 
+            ha='center', va='center', fontsize=14, 
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    plt.tight_layout()
+    return _figure_png(fig, edgecolor='none')
+
+def _render_line_chart(profile, district_name, roof_area_sqm, roof_type, number_of_people):
+    monthly_harvest = harvest_engine.monthly_harvest(profile, roof_area_sqm, roof_type)
+    monthly_consumption = harvest_engine.monthly_consumption(number_of_people)
+    
+    months = [month for month, _ in monthly_harvest]
+    harvested_vals = [liters for _, liters in monthly_harvest]
+    consumption_vals = [liters for _, liters in monthly_consumption]
+    
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    ax.plot(months, harvested_vals, marker='o', color='blue', linewidth=2, markersize=6,
+            label=f"Harvested ({roof_area_sqm}m² {roof_type})")
+    ax.plot(months, consumption_vals, marker='s', color='red', linestyle='--', linewidth=2, markersize=6,
+            label=f"Consumption ({number_of_people} person{'s' if number_of_people > 1 else ''})")
+    
+    ax.set_title(f"Monthly Water Harvest vs Consumption - {district_name.title()}", 
+                 fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel("Month", fontsize=12)
+    ax.set_ylabel("Liters", fontsize=12)
+    ax.grid(alpha=0.3, linestyle='--')
+    ax.legend(fontsize=10)
+    
+    # Add labels
+    for x, y in zip(months, harvested_vals):
+        ax.text(x, y + max(harvested_vals) * 0.01, f"{y:,.0f}", ha='center', fontsize=8)
+    for x, y in zip(months, consumption_vals):
+        ax.text(x, y - max(consumption_vals) * 0.01, f"{y:,.0f}", ha='center', fontsize=8, color="red")
+    
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    return _figure_png(fig)
+
+def _line_chart_params(request):
+    """
+    Parse (area, roof_type, people) for the harvest vs consumption chart.
+    Raises ValueError for anything but finite, non-negative numbers, which
+    also keeps the chart cache keyed on sensible values only.
+    """
+    roof_area_sqm = float(request.GET.get("area", 100))
+    roof_type = (request.GET.get("roof_type", "RCC")).upper()
+    number_of_people = int(request.GET.get("people", 1))
+    if not math.isfinite(roof_area_sqm) or roof_area_sqm < 0 or number_of_people < 0:
+        raise ValueError("area and people must be finite, non-negative numbers")
+    return roof_area_sqm, roof_type, number_of_people
+
+def _rainfall_chart_etag(request, district_name):
+    return chart_key('bar', district_name)
+
+def _line_etag(request, district_name, kind):
+    if climate_registry.profile(district_name) is None:
+        return None
     try:
-        gp = GraphPlot.objects.get(district_name__iexact=district_name)
-        monthly_rainfall = dict(gp.get_monthly_values())
+        roof_area_sqm, roof_type, number_of_people = _line_chart_params(request)
+    except (TypeError, ValueError):
+        return None
+    return chart_key(kind, district_name, area=roof_area_sqm, roof_type=roof_type, people=number_of_people)
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        months = list(monthly_rainfall.keys())
-        values = list(monthly_rainfall.values())
-        
-        bars = ax.bar(months, values, color='skyblue', edgecolor='navy', linewidth=1.2)
-        
-        ax.set_title(f"Monthly Rainfall - {district_name.title()}", 
-                     fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Month", fontsize=12)
-        ax.set_ylabel("Rainfall (mm)", fontsize=12)
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + max(values)*0.01,
-                    f'{value:.0f}mm', ha='center', va='bottom', fontsize=9)
-        
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+def _line_chart_etag(request, district_name):
+    return _line_etag(request, district_name, 'line')
 
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="png", dpi=150, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        plt.close(fig)
-        buffer.seek(0)
+def _rainfall_data_etag(request, district_name):
+    if climate_registry.profile(district_name) is None:
+        return None
+    return chart_key('bar-data', district_name)
 
-        return HttpResponse(buffer.getvalue(), content_type="image/png")
+def _line_data_etag(request, district_name):
+    return _line_etag(request, district_name, 'line-data')
 
-    except GraphPlot.DoesNotExist:
-        # Return placeholder image
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, f'Monthly rainfall data\nnot available for\n{district_name}', 
-                ha='center', va='center', fontsize=14, 
-                bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.axis('off')
-        
-        buffer = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buffer, format="png", dpi=150, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        plt.close(fig)
-        buffer.seek(0)
-        
-        return HttpResponse(buffer.getvalue(), content_type="image/png")
+def _chart_last_modified(request, district_name):
+    return chart_last_modified(district_name)
+
+def _png_response(png):
+    response = HttpResponse(png, content_type="image/png")
+    patch_cache_control(response, public=True, max_age=CHART_MAX_AGE)
+    return response
+
+@condition(etag_func=_rainfall_chart_etag, last_modified_func=_chart_last_modified)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def rainfall_chart(request, district_name):
+    """Generate monthly rainfall chart for a district (cached per GraphPlot revision)."""
+    try:
+        profile = climate_registry.profile(district_name)
+        key = chart_key('bar', district_name)
+        if profile is None:
+            # Placeholder image, cached like any other chart
+            png = get_or_render(key, lambda: _render_placeholder_chart(district_name))
+        else:
+            png = get_or_render(key, lambda: _render_rainfall_chart(profile, profile.district_name))
+        return _png_response(png)
     except Exception as e:
         logger.error(f"Chart generation error: {str(e)}")
         return HttpResponse("Error generating chart", status=500)
 
+@condition(etag_func=_line_chart_etag, last_modified_func=_chart_last_modified)
 def rainfall_line_chart(request, district_name):
     """Generate monthly water harvested vs. water consumption comparison chart."""
     try:
-        logger.info(f"Attempting to load chart for district: {district_name}")
-        gp = GraphPlot.objects.get(district_name__iexact=district_name)
-        logger.info(f"Found GraphPlot data for: {gp.district_name}")
-        
-        monthly_rainfall = dict(gp.get_monthly_values())
-        
-        # Debug: Print the keys to see the format
-        logger.info(f"Monthly rainfall keys: {list(monthly_rainfall.keys())}")
+        profile = climate_registry.profile(district_name)
+        if profile is None:
+            raise GraphPlot.DoesNotExist
         
-        # Parameters from request
-        roof_area_sqm = float(request.GET.get("area", 100))
-        roof_type = (request.GET.get("roof_type", "RCC")).upper()
-        number_of_people = int(request.GET.get("people", 1))
-        
-        # Runoff coefficients
-        runoff_coefficients = {
-            'RCC': 0.85, 'TERRACE': 0.85, 'METAL SHEET': 0.85,
-            'TILE ROOF': 0.75, 'TILE': 0.75, 'ASBESTOS': 0.6,
-            'ROUGH SURFACE': 0.6, 'GREEN ROOF': 0.4, 'SOIL': 0.4,
-        }
-        runoff_coefficient = runoff_coefficients.get(roof_type, 0.8)
-        
-        # Calculate harvested water
-        monthly_harvest = {
-            month: float(rainfall_mm) * roof_area_sqm * runoff_coefficient
-            for month, rainfall_mm in monthly_rainfall.items()
-        }
-        
-        # Consumption data - FIXED: Use UPPERCASE to match GraphPlot format
-        consumption_data = {
-            "JAN": 1767, "FEB": 1596, "MAR": 1897, "APR": 2070,
-            "MAY": 2139, "JUN": 2070, "JUL": 1860, "AUG": 1860,
-            "SEP": 1800, "OCT": 1897, "NOV": 1836, "DEC": 1767
-        }
-        
-        # Scale by number of people
-        months = list(monthly_harvest.keys())
-        harvested_vals = list(monthly_harvest.values())
-        consumption_vals = [consumption_data[m] * number_of_people for m in months]
-        
-        # Plotting
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        ax.plot(months, harvested_vals, marker='o', color='blue', linewidth=2, markersize=6,
-                label=f"Harvested ({roof_area_sqm}m² {roof_type})")
-        ax.plot(months, consumption_vals, marker='s', color='red', linestyle='--', linewidth=2, markersize=6,
-                label=f"Consumption ({number_of_people} person{'s' if number_of_people > 1 else ''})")
-        
-        ax.set_title(f"Monthly Water Harvest vs Consumption - {district_name.title()}", 
-                     fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Month", fontsize=12)
-        ax.set_ylabel("Liters", fontsize=12)
-        ax.grid(alpha=0.3, linestyle='--')
-        ax.legend(fontsize=10)
-        
-        # Add labels
-        for x, y in zip(months, harvested_vals):
-            ax.text(x, y + max(harvested_vals) * 0.01, f"{y:,.0f}", ha='center', fontsize=8)
-        for x, y in zip(months, consumption_vals):
-            ax.text(x, y - max(consumption_vals) * 0.01, f"{y:,.0f}", ha='center', fontsize=8, color="red")
-        
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="png", dpi=150, bbox_inches='tight', facecolor='white')
-        plt.close(fig)
-        buffer.seek(0)
-        
-        return HttpResponse(buffer.getvalue(), content_type="image/png")
+        try:
+            roof_area_sqm, roof_type, number_of_people = _line_chart_params(request)
+        except (TypeError, ValueError):
+            return HttpResponse("area must be a non-negative number and people a non-negative whole number", status=400)
+        key = chart_key('line', district_name, area=roof_area_sqm, roof_type=roof_type, people=number_of_people)
+        png = get_or_render(key, lambda: _render_line_chart(
+            profile, profile.district_name, roof_area_sqm, roof_type, number_of_people
+        ))
+        return _png_response(png)
         
     except GraphPlot.DoesNotExist:
         logger.error(f"No GraphPlot data found for district: {district_name}")
@@ -536,6 +580,71 @@ def rainfall_line_chart(request, district_name):
         logger.error(f"Chart generation error for {district_name}: {str(e)}", exc_info=True)
         return HttpResponse(f"Error generating chart: {str(e)}", status=500)
 
+@condition(etag_func=_rainfall_data_etag, last_modified_func=_chart_last_modified)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def rainfall_chart_data(request, district_name):
+    """Monthly rainfall series for drawing the rainfall chart in the browser."""
+    profile = climate_registry.profile(district_name)
+    if profile is None:
+        return Response({
+            'success': False,
+            'error': f'No monthly rainfall data for "{district_name}"'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    monthly_rainfall = profile.monthly_values()
+    response = Response({
+        'success': True,
+        'data': {
+            'district_name': profile.district_name,
+            'state': profile.state,
+            'months': [month for month, _ in monthly_rainfall],
+            'rainfall_mm': [round(mm, 1) for _, mm in monthly_rainfall],
+        }
+    }, status=status.HTTP_200_OK)
+    patch_cache_control(response, public=True, max_age=CHART_MAX_AGE)
+    return response
+
+@condition(etag_func=_line_data_etag, last_modified_func=_chart_last_modified)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def rainfall_line_chart_data(request, district_name):
+    """Monthly harvest vs consumption series behind rainfall_line_chart, as JSON."""
+    profile = climate_registry.profile(district_name)
+    if profile is None:
+        return Response({
+            'success': False,
+            'error': f'No monthly rainfall data for "{district_name}"'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        roof_area_sqm, roof_type, number_of_people = _line_chart_params(request)
+    except (TypeError, ValueError):
+        return Response({
+            'success': False,
+            'error': 'area must be a non-negative number and people a non-negative whole number'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    monthly_harvest = harvest_engine.monthly_harvest(profile, roof_area_sqm, roof_type)
+    monthly_consumption = harvest_engine.monthly_consumption(number_of_people)
+    
+    response = Response({
+        'success': True,
+        'data': {
+            'district_name': profile.district_name,
+            'state': profile.state,
+            'roof_area_sqm': roof_area_sqm,
+            'roof_type': roof_type,
+            'runoff_coefficient': harvest_engine.runoff_coefficient(roof_type),
+            'number_of_people': number_of_people,
+            'months': [month for month, _ in monthly_harvest],
+            'harvested_liters': [round(liters, 0) for _, liters in monthly_harvest],
+            'consumption_liters': [liters for _, liters in monthly_consumption],
+        }
+    }, status=status.HTTP_200_OK)
+    patch_cache_control(response, public=True, max_age=CHART_MAX_AGE)
+    return response
+
 def calculator_view(request):
     """Render calculator page with optional pre-filled district data."""
     district_name = request.GET.get("district")
@@ -543,8 +652,9 @@ def calculator_view(request):
     selected_district_data = None
 
     if district_name:
-        try:
-            district = RainfallData.objects.get(district_name__iexact=district_name)
+        districts = climate_registry.districts(district_name)
+        if districts:
+            district = districts[0]
             selected_district_data = {
                 'name': district.district_name,
                 'state': district.state,
@@ -552,24 +662,12 @@ def calculator_view(request):
             }
 
             # Get monthly rainfall data if available
-            graph = GraphPlot.objects.filter(district_name__iexact=district.district_name).first()
-            if graph:
+            profile = climate_registry.profile(district.district_name)
+            if profile:
                 monthly_rainfall = [
-                    {"month": "Jan", "rainfall_mm": graph.jan},
-                    {"month": "Feb", "rainfall_mm": graph.feb},
-                    {"month": "Mar", "rainfall_mm": graph.mar},
-                    {"month": "Apr", "rainfall_mm": graph.apr},
-                    {"month": "May", "rainfall_mm": graph.may},
-                    {"month": "Jun", "rainfall_mm": graph.jun},
-                    {"month": "Jul", "rainfall_mm": graph.jul},
-                    {"month": "Aug", "rainfall_mm": graph.aug},
-                    {"month": "Sep", "rainfall_mm": graph.sep},
-                    {"month": "Oct", "rainfall_mm": graph.oct},
-                    {"month": "Nov", "rainfall_mm": graph.nov},
-                    {"month": "Dec", "rainfall_mm": graph.dec},
+                    {"month": month.title(), "rainfall_mm": rainfall_mm}
+                    for month, rainfall_mm in profile.monthly_values()
                 ]
-        except RainfallData.DoesNotExist:
-            pass
 
     return render(request, "calculator.html", {
         "monthly_rainfall": monthly_rainfall,
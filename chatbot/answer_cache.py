@@ -0,0 +1,82 @@
+# chatbot/answer_cache.py
+"""
+Semantic response cache in front of the Gemini call.
+
+A cached ``bot_response`` is reused when a new question's embedding is close
+enough (cosine similarity) to a cached question *and* retrieval returned the
+same source ids, so the answer was grounded in the same context. Entries
+expire after a TTL and the cache is bounded with LRU eviction.
+"""
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from django.conf import settings
+
+ANSWER_CACHE_THRESHOLD = getattr(settings, 'CHATBOT_ANSWER_CACHE_THRESHOLD', 0.92)
+ANSWER_CACHE_TTL = getattr(settings, 'CHATBOT_ANSWER_CACHE_TTL', 60 * 60)
+ANSWER_CACHE_SIZE = getattr(settings, 'CHATBOT_ANSWER_CACHE_SIZE', 512)
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype="float32").ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticAnswerCache:
+    """Thread-safe, TTL- and size-bounded nearest-question answer cache."""
+
+    def __init__(self, threshold=ANSWER_CACHE_THRESHOLD, ttl=ANSWER_CACHE_TTL, maxsize=ANSWER_CACHE_SIZE):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # id -> (unit vector, source ids, response, expires_at)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, embedding, source_ids):
+        """Return the cached response for the closest matching question, or None."""
+        query = _unit(embedding)
+        sources = tuple(source_ids)
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+
+        with self._lock:
+            for entry_id, (vector, entry_sources, _, expires_at) in list(self._entries.items()):
+                if expires_at <= now:
+                    del self._entries[entry_id]
+                    continue
+                if entry_sources != sources:
+                    continue
+                score = float(np.dot(query, vector))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id][2]
+
+    def store(self, embedding, source_ids, response):
+        with self._lock:
+            self._entries[self._next_id] = (
+                _unit(embedding), tuple(source_ids), response, time.monotonic() + self.ttl
+            )
+            self._next_id += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+answer_cache = SemanticAnswerCache()
@@ -0,0 +1,154 @@
+# chatbot/llm.py
+"""
+Async Gemini client for the chat views.
+
+Requests go through one pooled ``httpx.AsyncClient`` with keep-alive, so the
+TLS connection to the Gemini API is reused instead of being set up per chat
+message. The client lives on a dedicated background event loop, so every
+caller shares it, whatever loop it runs on: the ASGI server's loop, the
+per-request loops of the WSGI dev server, or ``async_to_sync`` in the job
+workers. An httpx client can only be used from the loop it first ran on.
+"""
+import asyncio
+import json
+import os
+import threading
+import httpx
+from django.conf import settings
+
+GEMINI_API_KEY = getattr(settings, 'GEMINI_API_KEY', 'your-api-key-here')
+GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_API_BASE = getattr(settings, 'GEMINI_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+
+LLM_TIMEOUT = getattr(settings, 'CHATBOT_LLM_TIMEOUT', 30)
+LLM_MAX_CONNECTIONS = getattr(settings, 'CHATBOT_LLM_MAX_CONNECTIONS', 20)
+
+_STREAM_END = object()
+
+
+class LLMError(Exception):
+    """Raised when the Gemini API cannot be reached or returns an unusable reply."""
+
+
+class ClientLoop:
+    """
+    Background thread running the event loop that owns the pooled client.
+    Coroutines are handed to it with ``run`` and ``stream`` and their results
+    passed back to the caller's loop; cancelling the caller cancels the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._pid = None
+
+    def _ensure_started(self):
+        with self._lock:
+            # A forked worker process inherits the objects but not the thread
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='gemini-client', daemon=True).start()
+                self._client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(LLM_TIMEOUT, connect=5.0),
+                    limits=httpx.Limits(
+                        max_connections=LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                    ),
+                    # Key in a header rather than the query string so it never shows up in request logs
+                    headers={"Content-Type": "application/json", "x-goog-api-key": GEMINI_API_KEY or ""},
+                )
+                self._pid = os.getpid()
+            return self._loop, self._client
+
+    async def run(self, func, *args):
+        """Await ``func(client, *args)`` on the client's loop."""
+        loop, client = self._ensure_started()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(func(client, *args), loop))
+
+    async def stream(self, func, *args):
+        """Iterate the async generator ``func(client, *args)`` running on the client's loop."""
+        loop, client = self._ensure_started()
+        caller = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def deliver(item, error=None):
+            try:
+                caller.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                pass  # The caller's loop has already closed
+
+        async def pump():
+            try:
+                async for item in func(client, *args):
+                    deliver(item)
+            except BaseException as e:
+                deliver(None, e)
+                raise
+            deliver(_STREAM_END)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                item, error = await queue.get()
+                if error is not None:
+                    raise error
+                if item is _STREAM_END:
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+
+client_loop = ClientLoop()
+
+
+def is_configured() -> bool:
+    return bool(GEMINI_API_KEY) and GEMINI_API_KEY != 'your-api-key-here'
+
+
+def _payload(prompt: str) -> dict:
+    return {"contents": [{"parts": [{"text": prompt}]}]}
+
+
+def _candidate_text(data: dict) -> str:
+    parts = data["candidates"][0]["content"].get("parts", [])
+    return "".join(part.get("text", "") for part in parts)
+
+
+async def _generate(client, prompt):
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent"
+    try:
+        response = await client.post(url, json=_payload(prompt))
+        response.raise_for_status()
+        return _candidate_text(response.json())
+    except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+        raise LLMError(str(e)) from e
+
+
+async def _stream_generate(client, prompt):
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:streamGenerateContent"
+    try:
+        async with client.stream(
+            "POST", url, params={"alt": "sse"}, json=_payload(prompt)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                text = _candidate_text(json.loads(line[5:]))
+                if text:
+                    yield text
+    except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+        raise LLMError(str(e)) from e
+
+
+async def generate(prompt: str) -> str:
+    """Return the complete Gemini answer for ``prompt``."""
+    return await client_loop.run(_generate, prompt)
+
+
+async def stream_generate(prompt: str):
+    """Yield Gemini answer text chunks as the model produces them (server-sent events upstream)."""
+    async for text in client_loop.stream(_stream_generate, prompt):
+        yield text
@@ -0,0 +1,23 @@
+# chatbot/management/commands/warm_chatbot.py
+from django.core.management.base import BaseCommand
+from chatbot.retrieval import retrieval_service
+
+
+class Command(BaseCommand):
+    help = "Load the chatbot FAISS index and embedding model ahead of the first chat request"
+
+    def handle(self, *args, **options):
+        timings = retrieval_service.load()
+
+        for step, seconds in timings.items():
+            self.stdout.write(f"{step:>12}: {seconds * 1000:.0f} ms")
+
+        if retrieval_service.available:
+            self.stdout.write(self.style.SUCCESS(
+                f"Chatbot retrieval ready ({len(retrieval_service.documents)} documents)"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                "Chatbot retrieval unavailable; basic responses will be used"
+                + (f" ({retrieval_service.load_error})" if retrieval_service.load_error else "")
+            ))
@@ -0,0 +1,245 @@
+# chatbot/retrieval.py
+"""
+Lazily initialised FAISS retrieval for the chatbot.
+
+Nothing heavy (faiss, sentence-transformers, torch) is imported until the
+first chat request or ``manage.py warm_chatbot`` calls ``load()``, so
+migrations, management commands and non-chat workers start without it.
+"""
+import os
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+from django.conf import settings
+
+FAISS_INDEX_FILE = os.path.join(settings.BASE_DIR, "faiss_index.bin")
+DOCS_META_FILE = os.path.join(settings.BASE_DIR, "docs.json")
+EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
+
+EMBEDDING_CACHE_SIZE = getattr(settings, 'CHATBOT_EMBEDDING_CACHE_SIZE', 1024)
+ENCODER_MAX_BATCH = getattr(settings, 'CHATBOT_ENCODER_MAX_BATCH', 32)
+ENCODER_MAX_WAIT_MS = getattr(settings, 'CHATBOT_ENCODER_MAX_WAIT_MS', 5)
+
+
+def normalise_query(text):
+    """Cache key for a query: lower-cased with whitespace collapsed (the embedder is uncased)."""
+    return " ".join((text or "").lower().split())
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class BatchingEncoder:
+    """
+    Coalesces concurrent encode requests into one model forward pass.
+
+    Callers block on a Future while a single worker thread gathers whatever
+    arrives within ``max_wait_ms`` (up to ``max_batch`` texts) and encodes it
+    in one call, which is far cheaper per query on CPU than batch size 1.
+    """
+
+    def __init__(self, model, max_batch=ENCODER_MAX_BATCH, max_wait_ms=ENCODER_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, text):
+        future = Future()
+        self._queue.put((text, future))
+        self._ensure_worker()
+        return future
+
+    def encode(self, text):
+        return self.submit(text).result()
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chatbot-encoder", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = np.asarray(self.model.encode(texts), dtype="float32")
+                by_text = dict(zip(texts, vectors))
+                for text, future in batch:
+                    future.set_result(by_text[text])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+class RetrievalService:
+    """Thread-safe, load-once holder of the FAISS index, documents and embedder."""
+
+    def __init__(self, index_file=FAISS_INDEX_FILE, docs_file=DOCS_META_FILE, model_name=EMBED_MODEL_NAME):
+        self.index_file = index_file
+        self.docs_file = docs_file
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.index = None
+        self.embed_model = None
+        self.documents = []
+        self.ids = []
+        self.metas = []
+        self.encoder = None
+        self.embedding_cache = LRUCache(EMBEDDING_CACHE_SIZE)
+        self.load_timings = {}
+        self.load_error = None
+
+    @property
+    def available(self):
+        self.load()
+        return self.index is not None and self.embed_model is not None
+
+    def load(self):
+        """Load index, metadata and model once; returns per-step timings in seconds."""
+        if self._loaded:
+            return self.load_timings
+        with self._lock:
+            if self._loaded:
+                return self.load_timings
+            self._load()
+            self._loaded = True
+        return self.load_timings
+
+    def _load(self):
+        timings = {}
+        started = time.perf_counter()
+        try:
+            print("🤖 Loading FAISS index...")
+
+            if not os.path.exists(self.index_file) or not os.path.exists(self.docs_file):
+                print("⚠️ FAISS files not found. Chatbot will use basic responses.")
+                print(f"Expected files:")
+                print(f"  - {self.index_file}")
+                print(f"  - {self.docs_file}")
+                return
+
+            step = time.perf_counter()
+            import faiss
+            from sentence_transformers import SentenceTransformer
+            timings['imports'] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            index = faiss.read_index(self.index_file)
+            timings['faiss_index'] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            with open(self.docs_file, "r", encoding="utf-8") as f:
+                meta_data = json.load(f)
+            timings['documents'] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            embed_model = SentenceTransformer(self.model_name)
+            timings['embed_model'] = time.perf_counter() - step
+
+            self.index = index
+            self.documents = meta_data["documents"]
+            self.ids = meta_data["ids"]
+            self.metas = meta_data["metas"]
+            self.embed_model = embed_model
+            self.encoder = BatchingEncoder(embed_model)
+            print(f"✅ Chatbot initialized with FAISS successfully! ({time.perf_counter() - started:.1f}s)")
+
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"⚠️ Chatbot initialization warning: {e}")
+            print("💡 Chatbot will work with basic responses only")
+        finally:
+            timings['total'] = time.perf_counter() - started
+            self.load_timings = timings
+
+    def embed(self, query: str):
+        """Embedding for a query, served from the LRU cache or the batching encoder."""
+        key = normalise_query(query)
+        vector = self.embedding_cache.get(key)
+        if vector is None:
+            vector = self.encoder.encode(key)
+            self.embedding_cache.set(key, vector)
+        return vector
+
+    def retrieve(self, query: str, k: int = 4):
+        """Retrieve relevant documents using FAISS (if available)"""
+        if not self.available:
+            return []
+
+        try:
+            query_emb = self.embed(query)
+
+            distances, indices = self.index.search(query_emb.reshape(1, -1), k)
+            results = []
+
+            for idx in indices[0]:
+                if idx == -1:
+                    continue
+                results.append({
+                    "id": self.ids[idx],
+                    "text": self.documents[idx],
+                    "meta": self.metas[idx]
+                })
+
+            return results
+        except Exception as e:
+            print(f"Document retrieval error: {e}")
+            return []
+
+
+retrieval_service = RetrievalService()
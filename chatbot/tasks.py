@@ -0,0 +1,22 @@
+# chatbot/tasks.py
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from jobs.queue import task, PRIORITY_HIGH
+from .views import ANSWER_TASK, generate_reply, save_chat_message
+
+
+@task(ANSWER_TASK, priority=PRIORITY_HIGH)
+def answer_chat(session_id, message, user_id=None, roof_area=None, annual_rainfall=None, runoff=0.8):
+    """Answer a chat message posted with "background": true and save the exchange"""
+    bot_response, response_type, sources, cached, _ = async_to_sync(generate_reply)(
+        message, roof_area, annual_rainfall, runoff
+    )
+    user = User.objects.filter(pk=user_id).first() if user_id else None
+    save_chat_message(user, session_id, message, bot_response, response_type, sources)
+    return {
+        'response': bot_response,
+        'response_type': response_type,
+        'sources': sources,
+        'cached': cached,
+        'session_id': session_id,
+    }
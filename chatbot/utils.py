@@ -1,8 +1,10 @@
 # chatbot/utils.py
+from calculator.engine import harvest_engine
+
+
 def harvest_water_cubic_meters(roof_area_m2: float, annual_rainfall_mm: float, runoff_coeff: float) -> float:
     """Calculate annual rainwater harvesting potential in cubic meters."""
-    rainfall_m = annual_rainfall_mm / 1000.0
-    return roof_area_m2 * rainfall_m * runoff_coeff
+    return harvest_engine.annual_harvest_liters(roof_area_m2, annual_rainfall_mm, runoff_coeff) / 1000.0
 
 def recommend_tank_size(roof_area_m2: float, annual_rainfall_mm: float, runoff_coeff: float, storage_months: int = 2) -> float:
     """Recommend tank size for given storage duration in months."""
@@ -1,57 +1,27 @@
 # chatbot/views.py
-import os
 import json
-import numpy as np
-import requests
 import uuid
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from django.conf import settings
+from .retrieval import retrieval_service
+from .answer_cache import answer_cache
+from . import llm
+from jobs.queue import enqueue
+
+ANSWER_TASK = 'chatbot.answer'
 
 # ================================
 # CHATBOT CONFIGURATION
 # ================================
 
-GEMINI_API_KEY = getattr(settings, 'GEMINI_API_KEY', 'your-api-key-here')
-FAISS_INDEX_FILE = os.path.join(settings.BASE_DIR, "faiss_index.bin")
-DOCS_META_FILE = os.path.join(settings.BASE_DIR, "docs.json")
-EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
-GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_NO_KEY_MESSAGE = "I need a valid Gemini API key to provide intelligent responses. Please configure GEMINI_API_KEY in your environment variables."
+GEMINI_UNAVAILABLE_MESSAGE = "I'm having trouble connecting to my AI knowledge base right now. Please try asking a different question or try again in a moment."
+CHAT_ERROR_MESSAGE = "I apologize, but I'm experiencing technical difficulties. Please try rephrasing your question or try again in a moment."
 
-# ✅ Initialize with error handling
-index = None
-embed_model = None
-documents = []
-ids = []
-metas = []
-
-try:
-    print("🤖 Loading FAISS index...")
-    
-    # Check if files exist
-    if not os.path.exists(FAISS_INDEX_FILE) or not os.path.exists(DOCS_META_FILE):
-        print("⚠️ FAISS files not found. Chatbot will use basic responses.")
-        print(f"Expected files:")
-        print(f"  - {FAISS_INDEX_FILE}")
-        print(f"  - {DOCS_META_FILE}")
-    else:
-        import faiss
-        from sentence_transformers import SentenceTransformer
-        
-        index = faiss.read_index(FAISS_INDEX_FILE)
-        
-        with open(DOCS_META_FILE, "r", encoding="utf-8") as f:
-            meta_data = json.load(f)
-            documents = meta_data["documents"]
-            ids = meta_data["ids"]  
-            metas = meta_data["metas"]
-        
-        embed_model = SentenceTransformer(EMBED_MODEL_NAME)
-        print("✅ Chatbot initialized with FAISS successfully!")
-        
-except Exception as e:
-    print(f"⚠️ Chatbot initialization warning: {e}")
-    print("💡 Chatbot will work with basic responses only")
+# FAISS index and embedding model load lazily (first chat request or `manage.py warm_chatbot`)
 
 # ================================
 # UTILITY FUNCTIONS
@@ -59,51 +29,57 @@ except Exception as e:
 
 def retrieve_documents(query: str, k: int = 4):
     """Retrieve relevant documents using FAISS (if available)"""
-    if not embed_model or not index:
-        return []
-        
-    try:
-        query_emb = embed_model.encode([query])
-        query_emb = np.array(query_emb, dtype="float32")
-        
-        distances, indices = index.search(query_emb, k)
-        results = []
-        
-        for idx in indices[0]:
-            if idx == -1:
-                continue
-            results.append({
-                "id": ids[idx],
-                "text": documents[idx],
-                "meta": metas[idx]
-            })
-        
-        return results
-    except Exception as e:
-        print(f"Document retrieval error: {e}")
-        return []
+    return retrieval_service.retrieve(query, k)
 
-def call_gemini_api(prompt: str) -> str:
+async def call_gemini_api(prompt: str) -> str:
     """Call Google Gemini API"""
-    if not GEMINI_API_KEY or GEMINI_API_KEY == 'your-api-key-here':
-        return "I need a valid Gemini API key to provide intelligent responses. Please configure GEMINI_API_KEY in your environment variables."
-    
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}]
-    }
-    
+    if not llm.is_configured():
+        return GEMINI_NO_KEY_MESSAGE
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data["candidates"][0]["content"]["parts"][0]["text"]
-    except Exception as e:
+        return await llm.generate(prompt)
+    except llm.LLMError as e:
         print(f"Gemini API error: {e}")
-        return "I'm having trouble connecting to my AI knowledge base right now. Please try asking a different question or try again in a moment."
+        return GEMINI_UNAVAILABLE_MESSAGE
+
+async def stream_gemini_api(prompt: str, query_embedding, sources):
+    """Stream Google Gemini API text chunks, caching the full answer once it completes"""
+    if not llm.is_configured():
+        yield GEMINI_NO_KEY_MESSAGE
+        return
+    parts = []
+    try:
+        async for text in llm.stream_generate(prompt):
+            parts.append(text)
+            yield text
+    except llm.LLMError as e:
+        print(f"Gemini API error: {e}")
+        if not parts:
+            yield GEMINI_UNAVAILABLE_MESSAGE
+        return
+    if parts:
+        answer_cache.store(query_embedding, sources, "".join(parts))
+
+def build_rag_prompt(user_message: str, docs) -> str:
+    """Build the Gemini prompt from the user question and retrieved documents"""
+    context = "\n\n".join([f"[{d['id']}] {d['text']}" for d in docs])
+    return (
+        "You are JalJeevan.AI Assistant named Isha , an expert in rainwater harvesting and water conservation.\n\n"
+        "Provide helpful, accurate, and actionable advice about:\n"
+        "- Rainwater harvesting system design and sizing\n"
+        "- Installation, maintenance, and troubleshooting\n"
+        "- Cost-benefit analysis and ROI calculations\n"
+        "- Government policies, subsidies, and incentives\n"
+        "- Environmental benefits and sustainability\n\n"
+        "Keep responses concise but comprehensive (max 200 words).\n"
+        "--- RULES ---\n"
+        "1. If the user asks about 'this website', 'your features', 'about the site', or 'JalJeevan.ai', you MUST prioritize context from sources that start with 'page_' (e.g., 'page_home', 'page_about').\n"
+        "2. If no 'page_' sources are available, it is OK to say you don't have information about the website.\n"
+        "3. For all other technical questions about RWH, you can use any relevant context.\n"
+        "--- END RULES ---\n\n"
+        f"Context from knowledge base:\n{context}\n\n"
+        f"User Question: {user_message}\n\n"
+        "Response:"
+    )
 
 # Import models and utils
 try:
@@ -132,13 +108,159 @@ except ImportError:
             raise ValueError(f"Value {value} is outside plausible range")
         return True
 
+# ================================
+# CHAT HELPERS
+# ================================
+
+def calculation_response(roof_area, annual_rainfall, runoff):
+    """Answer a chat message that carries roof area and rainfall parameters"""
+    try:
+        plausible_check(roof_area)
+        plausible_check(annual_rainfall)
+        
+        water_volume = harvest_water_cubic_meters(roof_area, annual_rainfall, runoff)
+        tank_size = recommend_tank_size(roof_area, annual_rainfall, runoff, storage_months=2)
+        
+        bot_response = (
+            f"💧 **Calculation Results**\n\n"
+            f"**Your Inputs:**\n"
+            f"• Roof Area: {roof_area} m²\n"
+            f"• Annual Rainfall: {annual_rainfall} mm\n"
+            f"• Runoff Coefficient: {runoff}\n\n"
+            f"**Harvesting Potential:**\n"
+            f"• Annual Water: **{water_volume:.1f} m³** ({water_volume * 1000:.0f} liters)\n"
+            f"• Recommended Tank: **{tank_size:.1f} m³** ({tank_size * 1000:.0f} liters)\n\n"
+            f"💡 This tank size provides 2 months of storage capacity."
+        )
+        return bot_response, 'calculation'
+        
+    except ValueError as e:
+        return f"⚠️ Calculation Error: {str(e)}. Please check your inputs.", 'error'
+
+def save_chat_message(user, session_id, user_message, bot_response, response_type, sources):
+    """Save one exchange to the database if the models exist"""
+    if not (ChatSession and ChatMessage):
+        return
+    try:
+        session, created = ChatSession.objects.get_or_create(
+            session_id=session_id,
+            defaults={'user': user if user is not None and user.is_authenticated else None}
+        )
+        
+        ChatMessage.objects.create(
+            session=session,
+            user_message=user_message,
+            bot_response=bot_response,
+            response_type=response_type,
+            sources=sources
+        )
+    except Exception as e:
+        print(f"Database save error: {e}")
+
+async def generate_reply(user_message, roof_area=None, annual_rainfall=None, runoff=0.8, stream=False):
+    """
+    Produce the bot reply for one message. Returns ``(bot_response,
+    response_type, sources, cached, chunks)``; when ``stream`` is set and
+    Gemini is called, ``chunks`` is an async iterator of text and
+    ``bot_response`` is None.
+    """
+    cached = False
+    chunks = None
+    
+    # Handle calculations if parameters provided
+    if roof_area and annual_rainfall:
+        bot_response, response_type = calculation_response(roof_area, annual_rainfall, runoff)
+        sources = []
+
+    else:
+        # AI-powered response
+        try:
+            # Try to retrieve documents (CPU-bound, so off the event loop)
+            docs = await sync_to_async(retrieve_documents, thread_sensitive=False)(user_message, k=4)
+
+            if docs:
+                # Use AI with retrieved context, reusing a cached answer to a near-identical question
+                sources = [d["id"] for d in docs]
+                query_embedding = await sync_to_async(retrieval_service.embed, thread_sensitive=False)(user_message)
+                bot_response = answer_cache.lookup(query_embedding, sources)
+                cached = bot_response is not None
+
+                if not cached:
+                    prompt = build_rag_prompt(user_message, docs)
+                    if stream:
+                        chunks = stream_gemini_api(prompt, query_embedding, sources)
+                    else:
+                        bot_response = await call_gemini_api(prompt)
+                        if bot_response not in (GEMINI_NO_KEY_MESSAGE, GEMINI_UNAVAILABLE_MESSAGE):
+                            answer_cache.store(query_embedding, sources, bot_response)
+            else:
+                # Basic response without AI
+                bot_response = get_basic_response(user_message)
+                sources = []
+
+            response_type = 'ai'
+
+        except Exception as e:
+            print(f"AI response error: {e}")
+            bot_response = CHAT_ERROR_MESSAGE
+            response_type = 'error'
+            sources = []
+    
+    return bot_response, response_type, sources, cached, chunks
+
+def sse_event(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+async def single_chunk(text: str):
+    yield text
+
+async def chat_event_stream(request, session_id, user_message, chunks, response_type, sources, cached):
+    """
+    Server-sent events for one chat reply: ``meta`` first, a ``token`` event per
+    text chunk as it arrives, then ``done`` with the full response. The exchange
+    is saved once the stream completes.
+    """
+    yield sse_event('meta', {
+        'session_id': session_id,
+        'response_type': response_type,
+        'sources': sources,
+        'cached': cached,
+    })
+    parts = []
+    try:
+        async for text in chunks:
+            parts.append(text)
+            yield sse_event('token', {'text': text})
+    except Exception as e:
+        print(f"Chat stream error: {e}")
+        if not parts:
+            parts.append(CHAT_ERROR_MESSAGE)
+            yield sse_event('token', {'text': CHAT_ERROR_MESSAGE})
+    bot_response = "".join(parts)
+    yield sse_event('done', {'success': True, 'response': bot_response})
+    await sync_to_async(save_chat_message)(request.user, session_id, user_message, bot_response, response_type, sources)
+
+def event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Let nginx pass tokens through unbuffered
+    return response
+
 # ================================
 # DJANGO VIEWS
 # ================================
 
 @csrf_exempt
-def chat_api(request):
-    """Main chat API endpoint for modal"""
+async def chat_api(request):
+    """
+    Main chat API endpoint for modal.
+
+    Returns JSON by default. With ``"stream": true`` in the body (or an
+    ``Accept: text/event-stream`` header) the reply is streamed as
+    server-sent events while Gemini generates it, when served under ASGI;
+    under WSGI the stream would be buffered, so JSON is returned. With ``"background": true``
+    the reply is produced by a job worker and 202 returns the job to poll.
+    """
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'Method not allowed'})
     
@@ -146,6 +268,9 @@ def chat_api(request):
         data = json.loads(request.body)
         user_message = data.get('message', '').strip()
         session_id = data.get('session_id', str(uuid.uuid4()))
+        stream = bool(data.get('stream')) or 'text/event-stream' in request.headers.get('Accept', '')
+        # Under WSGI Django buffers an async stream to the end, so answer with JSON instead
+        stream = stream and isinstance(request, ASGIRequest)
         
         # Extract optional calculation parameters
         roof_area = data.get('roof_area')
@@ -155,101 +280,42 @@ def chat_api(request):
         if not user_message:
             return JsonResponse({'success': False, 'error': 'Message is required'})
         
-        # Handle calculations if parameters provided
-        if roof_area and annual_rainfall:
-            try:
-                plausible_check(roof_area)
-                plausible_check(annual_rainfall)
-                
-                water_volume = harvest_water_cubic_meters(roof_area, annual_rainfall, runoff)
-                tank_size = recommend_tank_size(roof_area, annual_rainfall, runoff, storage_months=2)
-                
-                bot_response = (
-                    f"💧 **Calculation Results**\n\n"
-                    f"**Your Inputs:**\n"
-                    f"• Roof Area: {roof_area} m²\n"
-                    f"• Annual Rainfall: {annual_rainfall} mm\n"
-                    f"• Runoff Coefficient: {runoff}\n\n"
-                    f"**Harvesting Potential:**\n"
-                    f"• Annual Water: **{water_volume:.1f} m³** ({water_volume * 1000:.0f} liters)\n"
-                    f"• Recommended Tank: **{tank_size:.1f} m³** ({tank_size * 1000:.0f} liters)\n\n"
-                    f"💡 This tank size provides 2 months of storage capacity."
-                )
-                
-                response_type = 'calculation'
-                sources = []
-                
-            except ValueError as e:
-                bot_response = f"⚠️ Calculation Error: {str(e)}. Please check your inputs."
-                response_type = 'error'
-                sources = []
+        if data.get('background'):
+            # Answer in a worker; poll /api/jobs/<job_id>/ for the reply
+            job = await sync_to_async(enqueue)(ANSWER_TASK, {
+                'session_id': session_id,
+                'message': user_message,
+                'user_id': (await request.auser()).pk,
+                'roof_area': roof_area,
+                'annual_rainfall': annual_rainfall,
+                'runoff': runoff,
+            })
+            return JsonResponse({
+                'success': True,
+                'job_id': str(job.job_id),
+                'status_url': reverse('jobs:status', args=[job.job_id]),
+                'session_id': session_id
+            }, status=202)
         
-        else:
-            # AI-powered response
-            try:
-                # Try to retrieve documents
-                docs = retrieve_documents(user_message, k=4)
-                
-                if docs:
-                    # Use AI with retrieved context
-                    context = "\n\n".join([f"[{d['id']}] {d['text']}" for d in docs])
-                    system_prompt = (
-                        "You are JalJeevan.AI Assistant named Isha , an expert in rainwater harvesting and water conservation.\n\n"
-                        "Provide helpful, accurate, and actionable advice about:\n"
-                        "- Rainwater harvesting system design and sizing\n"
-                        "- Installation, maintenance, and troubleshooting\n"
-                        "- Cost-benefit analysis and ROI calculations\n"
-                        "- Government policies, subsidies, and incentives\n"
-                        "- Environmental benefits and sustainability\n\n"
-                        "Keep responses concise but comprehensive (max 200 words).\n"
-                        "--- RULES ---\n"
-                        "1. If the user asks about 'this website', 'your features', 'about the site', or 'JalJeevan.ai', you MUST prioritize context from sources that start with 'page_' (e.g., 'page_home', 'page_about').\n"
-                        "2. If no 'page_' sources are available, it is OK to say you don't have information about the website.\n"
-                        "3. For all other technical questions about RWH, you can use any relevant context.\n"
-                        "--- END RULES ---\n\n"
-                        f"Context from knowledge base:\n{context}\n\n"
-                        f"User Question: {user_message}\n\n"
-                        "Response:"
-                    )
-                    
-                    bot_response = call_gemini_api(system_prompt)
-                    sources = [d["id"] for d in docs]
-                else:
-                    # Basic response without AI
-                    bot_response = get_basic_response(user_message)
-                    sources = []
-                
-                response_type = 'ai'
-                
-            except Exception as e:
-                print(f"AI response error: {e}")
-                bot_response = "I apologize, but I'm experiencing technical difficulties. Please try rephrasing your question or try again in a moment."
-                response_type = 'error'
-                sources = []
+        bot_response, response_type, sources, cached, chunks = await generate_reply(
+            user_message, roof_area, annual_rainfall, runoff, stream=stream
+        )
+        
+        if stream:
+            if chunks is None:
+                chunks = single_chunk(bot_response)
+            return event_stream_response(
+                chat_event_stream(request, session_id, user_message, chunks, response_type, sources, cached)
+            )
         
-        # Save to database if models exist
-        if ChatSession and ChatMessage:
-            try:
-                session, created = ChatSession.objects.get_or_create(
-                    session_id=session_id,
-                    defaults={'user': request.user if request.user.is_authenticated else None}
-                )
-                
-                ChatMessage.objects.create(
-                    session=session,
-                    user_message=user_message,
-                    bot_response=bot_response,
-                    response_type=response_type,
-                    sources=sources
-                )
-            except Exception as e:
-                print(f"Database save error: {e}")
+        await sync_to_async(save_chat_message)(request.user, session_id, user_message, bot_response, response_type, sources)
         
         return JsonResponse({
             'success': True,
             'response': bot_response,
             'response_type': response_type,
             'sources': sources,
+            'cached': cached,
             'session_id': session_id
         })
         
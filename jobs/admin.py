@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'priority', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('job_id', 'name', 'unique_key')
+    readonly_fields = ('job_id', 'created_at', 'started_at', 'finished_at', 'locked_by', 'locked_at')
@@ -0,0 +1,74 @@
+# jobs/management/commands/run_workers.py
+import multiprocessing
+import signal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from jobs.queue import JOB_WORKER_PROCESSES, JOB_POLL_INTERVAL, Worker, default_worker_id, registered_tasks
+
+
+def _worker_main(index, poll_interval, burst):
+    import django
+    from django.apps import apps
+    if not apps.ready:  # "spawn" start method (Windows, macOS): set Django up in the child
+        django.setup()
+    worker = Worker(default_worker_id(index), poll_interval=poll_interval, burst=burst)
+    # Ctrl+C reaches the whole process group; the parent turns it into SIGTERM for each worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, worker.stop)
+    worker.run()
+
+
+class Command(BaseCommand):
+    help = "Run background job workers against the database queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--processes', type=int, default=JOB_WORKER_PROCESSES,
+                            help=f"Number of worker processes (default: {JOB_WORKER_PROCESSES})")
+        parser.add_argument('--poll-interval', type=float, default=JOB_POLL_INTERVAL,
+                            help="Seconds to wait when the queue is empty")
+        parser.add_argument('--burst', action='store_true',
+                            help="Exit once no jobs are due instead of waiting for more")
+
+    def start_worker(self, index, options):
+        process = multiprocessing.Process(
+            target=_worker_main, args=(index, options['poll_interval'], options['burst']), daemon=True,
+        )
+        process.start()
+        return process
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes < 1:
+            raise CommandError("--processes must be at least 1")
+
+        self.stdout.write(f"Registered tasks: {', '.join(registered_tasks()) or 'none'}")
+        # Children must open their own database connections
+        connections.close_all()
+        workers = {index: self.start_worker(index, options) for index in range(processes)}
+
+        stopping = []
+
+        def shutdown(signum, frame):
+            stopping.append(signum)  # Acted on in the loop below; handlers must not block
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+        self.stdout.write(self.style.SUCCESS(f"Started {processes} worker process(es)"))
+
+        signalled = False
+        while any(worker.is_alive() for worker in workers.values()):
+            if stopping and not signalled:
+                self.stdout.write("Stopping workers after their current job...")
+                for worker in workers.values():
+                    if worker.is_alive():
+                        worker.terminate()  # SIGTERM: the worker finishes its job, then exits
+                signalled = True
+
+            for index, worker in list(workers.items()):
+                worker.join(timeout=0.5)
+                if not worker.is_alive() and worker.exitcode not in (0, None) and not stopping:
+                    # Replace a crashed worker; its job is requeued once its heartbeat is JOB_LOCK_TIMEOUT old
+                    self.stderr.write(f"Worker {index} exited with {worker.exitcode}; restarting")
+                    workers[index] = self.start_worker(index, options)
+
+        self.stdout.write(self.style.SUCCESS("Workers stopped"))
@@ -0,0 +1,55 @@
+import uuid
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+# Create your models here.
+
+class Job(models.Model):
+    """A unit of background work, claimed and run by `manage.py run_workers`."""
+
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+    ]
+    ACTIVE_STATUSES = ('QUEUED', 'RUNNING')
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    priority = models.SmallIntegerField(default=0)  # Higher runs first
+    unique_key = models.CharField(max_length=200, null=True, blank=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)  # Not claimed before this (retry backoff, delays)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Claim query: queued jobs that are due, highest priority first
+            models.Index(fields=['status', '-priority', 'run_at'], name='job_claim_idx'),
+        ]
+        constraints = [
+            # At most one queued/running job per (task, unique_key)
+            models.UniqueConstraint(
+                fields=['name', 'unique_key'],
+                condition=Q(status__in=['QUEUED', 'RUNNING']),
+                name='job_unique_active',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}] {self.job_id}"
@@ -0,0 +1,274 @@
+# jobs/queue.py
+"""
+Database-backed job queue.
+
+Apps register functions with ``@task('app.name')`` in their ``tasks.py`` and
+call ``enqueue('app.name', {...})``. The job row is written in the caller's
+transaction, so it only becomes visible to workers once that commits.
+
+Workers (``manage.py run_workers``) claim due jobs highest priority first with
+a conditional ``UPDATE ... WHERE status = 'QUEUED'``, so two workers never run
+the same job on any backend. A failing job is retried with exponential
+backoff until ``max_attempts``. While a job runs, a heartbeat thread renews its
+``locked_at`` every ``JOB_HEARTBEAT_INTERVAL``, so a job is only requeued when
+no heartbeat has arrived for ``JOB_LOCK_TIMEOUT`` (its worker died), never
+because it is merely slow.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKER_PROCESSES = getattr(settings, 'JOB_WORKER_PROCESSES', 2)
+JOB_POLL_INTERVAL = getattr(settings, 'JOB_POLL_INTERVAL', 1.0)
+JOB_MAX_ATTEMPTS = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+JOB_RETRY_BASE_DELAY = getattr(settings, 'JOB_RETRY_BASE_DELAY', 10)
+JOB_RETRY_MAX_DELAY = getattr(settings, 'JOB_RETRY_MAX_DELAY', 60 * 60)
+JOB_HEARTBEAT_INTERVAL = getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 30)
+# Without a heartbeat for this long a running job's worker is presumed dead
+JOB_LOCK_TIMEOUT = getattr(settings, 'JOB_LOCK_TIMEOUT', 5 * 60)
+JOB_RESULT_TTL = getattr(settings, 'JOB_RESULT_TTL', 7 * 24 * 60 * 60)
+# Run jobs in-process right after commit instead of waiting for a worker (development/tests)
+JOB_QUEUE_EAGER = getattr(settings, 'JOB_QUEUE_EAGER', False)
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+CLAIM_CANDIDATES = 10
+MAINTENANCE_INTERVAL = 60
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+_registry = {}  # name -> (function, priority, max_attempts)
+
+
+def task(name, priority=PRIORITY_NORMAL, max_attempts=JOB_MAX_ATTEMPTS):
+    """
+    Register a function as a job. It is called with the job payload as
+    keyword arguments and its return value (JSON-serialisable) is stored as
+    the job result.
+    """
+    def decorator(func):
+        _registry[name] = (func, priority, max_attempts)
+        func.task_name = name
+        return func
+    return decorator
+
+
+def registered_tasks():
+    return sorted(_registry)
+
+
+def enqueue(name, payload=None, priority=None, delay=0, unique_key=None, max_attempts=None):
+    """
+    Queue a job for task ``name`` and return the ``Job``. With ``unique_key``
+    an identical job that is still queued or running is returned instead of
+    adding another.
+    """
+    name = getattr(name, 'task_name', name)
+    if name not in _registry:
+        raise UnknownTask(f"No task registered as '{name}'")
+    _, default_priority, default_attempts = _registry[name]
+
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'priority': default_priority if priority is None else priority,
+        'max_attempts': max_attempts or default_attempts,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'unique_key': unique_key,
+    }
+    if unique_key is not None:
+        existing = Job.objects.filter(name=name, unique_key=unique_key, status__in=Job.ACTIVE_STATUSES).first()
+        if existing:
+            return existing
+    try:
+        with transaction.atomic():
+            job = Job.objects.create(**fields)
+    except IntegrityError:
+        # Lost a race with an identical enqueue
+        return Job.objects.get(name=name, unique_key=unique_key, status__in=Job.ACTIVE_STATUSES)
+
+    if JOB_QUEUE_EAGER:
+        transaction.on_commit(lambda: run_now(job.pk))
+    return job
+
+
+def default_worker_id(index=0):
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
+
+
+def claim(worker_id):
+    """Lock and return the next due job, or None if there is nothing to run."""
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status='QUEUED', run_at__lte=now)
+        .order_by('-priority', 'run_at', 'id')
+        .values_list('pk', flat=True)[:CLAIM_CANDIDATES]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status='QUEUED').update(
+            status='RUNNING', locked_by=worker_id, locked_at=now, started_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def retry_delay(attempts):
+    """Seconds before retry number ``attempts``: exponential, capped, with jitter."""
+    delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class Heartbeat:
+    """Context manager renewing a running job's lock from a background thread."""
+
+    def __init__(self, job_pk, worker_id, interval=JOB_HEARTBEAT_INTERVAL):
+        self.job_pk = job_pk
+        self.worker_id = worker_id
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f'job-heartbeat-{job_pk}', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    Job.objects.filter(pk=self.job_pk, status='RUNNING', locked_by=self.worker_id).update(
+                        locked_at=timezone.now(),
+                    )
+                except OperationalError as e:
+                    # A missed beat is harmless as long as the next ones land within JOB_LOCK_TIMEOUT
+                    logger.warning(f"Heartbeat for job {self.job_pk} failed: {e}")
+        finally:
+            connections.close_all()  # This thread's connections only
+
+
+def run_job(job, worker_id):
+    """Run a claimed job and record its outcome. Returns the final status."""
+    owned = Job.objects.filter(pk=job.pk, status='RUNNING', locked_by=worker_id)
+    now = timezone.now
+
+    entry = _registry.get(job.name)
+    if entry is None:
+        owned.update(status='FAILED', error=f"No task registered as '{job.name}'", finished_at=now())
+        return 'FAILED'
+
+    try:
+        with Heartbeat(job.pk, worker_id):
+            result = entry[0](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning(f"Job {job.name} {job.job_id} failed (attempt {job.attempts}/{job.max_attempts})")
+        if job.attempts < job.max_attempts:
+            owned.update(
+                status='QUEUED', error=error, locked_by='', locked_at=None,
+                run_at=now() + timedelta(seconds=retry_delay(job.attempts)),
+            )
+            return 'QUEUED'
+        owned.update(status='FAILED', error=error, finished_at=now())
+        return 'FAILED'
+
+    owned.update(status='SUCCEEDED', result=result, error='', finished_at=now())
+    return 'SUCCEEDED'
+
+
+def run_now(job_pk):
+    """Claim and run one specific job in this process (JOB_QUEUE_EAGER)."""
+    worker_id = default_worker_id()
+    now = timezone.now()
+    if Job.objects.filter(pk=job_pk, status='QUEUED').update(
+        status='RUNNING', locked_by=worker_id, locked_at=now, started_at=now, attempts=F('attempts') + 1,
+    ):
+        return run_job(Job.objects.get(pk=job_pk), worker_id)
+    return None
+
+
+def requeue_stale(now=None):
+    """Requeue (or fail, when out of attempts) running jobs whose heartbeat stopped."""
+    now = now or timezone.now()
+    stale = Job.objects.filter(status='RUNNING', locked_at__lt=now - timedelta(seconds=JOB_LOCK_TIMEOUT))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='FAILED', error='Worker stopped while running the job', finished_at=now,
+    )
+    requeued = stale.update(status='QUEUED', locked_by='', locked_at=None, run_at=now)
+    return requeued, failed
+
+
+def purge_finished(now=None):
+    """Delete succeeded and failed jobs older than JOB_RESULT_TTL."""
+    now = now or timezone.now()
+    deleted, _ = Job.objects.filter(
+        status__in=['SUCCEEDED', 'FAILED'], finished_at__lt=now - timedelta(seconds=JOB_RESULT_TTL),
+    ).delete()
+    return deleted
+
+
+class Worker:
+    """Claim-and-run loop for one worker process; ``stop()`` ends it after the current job."""
+
+    def __init__(self, worker_id, poll_interval=JOB_POLL_INTERVAL, burst=False):
+        self.worker_id = worker_id
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.stopping = False
+        self.processed = 0
+
+    def stop(self, *args):
+        # Safe to use as a signal handler: only sets a flag
+        self.stopping = True
+
+    def run(self):
+        next_maintenance = 0
+        while not self.stopping:
+            try:
+                if time.monotonic() >= next_maintenance:
+                    requeue_stale()
+                    purge_finished()
+                    next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+                job = claim(self.worker_id)
+            except OperationalError as e:
+                # e.g. SQLite "database is locked" while another process writes
+                logger.warning(f"Worker {self.worker_id} could not claim a job: {e}")
+                job = None
+            finally:
+                close_old_connections()
+
+            if job is None:
+                if self.burst:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+
+            try:
+                run_job(job, self.worker_id)
+            except Exception:
+                logger.exception(f"Worker {self.worker_id} could not record job {job.job_id}")
+            finally:
+                close_old_connections()
+            self.processed += 1
+        return self.processed
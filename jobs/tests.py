@@ -0,0 +1,179 @@
+import time
+from datetime import timedelta
+from unittest import mock
+from django.db.models import F
+from django.db.models.query import QuerySet
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from . import queue
+from .models import Job
+
+# Create your tests here.
+
+FLAKY_TASK = 'jobs.tests.flaky'
+calls = []
+
+
+@queue.task(FLAKY_TASK, max_attempts=2)
+def flaky(n):
+    """Records each call; fails for negative ``n``."""
+    calls.append(n)
+    if n < 0:
+        raise RuntimeError('boom')
+    return {'n': n}
+
+
+class JobQueueTests(TestCase):
+    """
+    Drive ``enqueue``, ``claim`` and ``run_job`` directly, the way
+    ``manage.py run_workers`` does, without starting worker processes.
+    """
+
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_takes_highest_priority_first(self):
+        low = queue.enqueue(FLAKY_TASK, {'n': 1}, priority=queue.PRIORITY_LOW)
+        normal = queue.enqueue(FLAKY_TASK, {'n': 2})
+        high = queue.enqueue(flaky, {'n': 3}, priority=queue.PRIORITY_HIGH)
+
+        claimed = [queue.claim('worker').pk for _ in range(3)]
+        self.assertEqual(claimed, [high.pk, normal.pk, low.pk])
+        self.assertIsNone(queue.claim('worker'))
+
+    def test_claim_marks_job_running(self):
+        queued = queue.enqueue(FLAKY_TASK, {'n': 1})
+        job = queue.claim('worker-1')
+        self.assertEqual(job.pk, queued.pk)
+        self.assertEqual((job.status, job.locked_by, job.attempts), ('RUNNING', 'worker-1', 1))
+        self.assertIsNotNone(job.locked_at)
+        # Already claimed: a second worker gets nothing
+        self.assertIsNone(queue.claim('worker-2'))
+
+    def test_claim_skips_job_taken_by_another_worker(self):
+        first = queue.enqueue(FLAKY_TASK, {'n': 1}, priority=queue.PRIORITY_HIGH)
+        second = queue.enqueue(FLAKY_TASK, {'n': 2})
+        values_list = QuerySet.values_list
+
+        def race(queryset, *fields, **kwargs):
+            # Another worker claims the first candidate between the SELECT and our UPDATE
+            candidates = list(values_list(queryset, *fields, **kwargs))
+            Job.objects.filter(pk=first.pk).update(status='RUNNING', locked_by='other-worker')
+            return candidates
+
+        with mock.patch.object(QuerySet, 'values_list', race):
+            job = queue.claim('worker')
+
+        self.assertEqual(job.pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual((first.locked_by, first.attempts), ('other-worker', 0))
+
+    def test_claim_waits_for_run_at(self):
+        queue.enqueue(FLAKY_TASK, {'n': 1}, delay=60)
+        self.assertIsNone(queue.claim('worker'))
+
+    def test_run_job_records_result(self):
+        queue.enqueue(FLAKY_TASK, {'n': 7})
+        job = queue.claim('worker')
+        self.assertEqual(queue.run_job(job, 'worker'), 'SUCCEEDED')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.locked_by), ('SUCCEEDED', {'n': 7}, 'worker'))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(calls, [7])
+
+    def test_failed_job_is_retried_with_backoff_then_fails(self):
+        queue.enqueue(FLAKY_TASK, {'n': -1})
+        job = queue.claim('worker')
+        before = timezone.now()
+        self.assertEqual(queue.run_job(job, 'worker'), 'QUEUED')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.locked_at), ('QUEUED', '', None))
+        self.assertIn('RuntimeError: boom', job.error)
+        # First retry waits between half and all of JOB_RETRY_BASE_DELAY
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=queue.JOB_RETRY_BASE_DELAY * 0.5))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=queue.JOB_RETRY_BASE_DELAY))
+        self.assertIsNone(queue.claim('worker'))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        job = queue.claim('worker')
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(queue.run_job(job, 'worker'), 'FAILED')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertEqual(calls, [-1, -1])
+
+    def test_retry_delay_doubles_up_to_cap(self):
+        with mock.patch.object(queue.random, 'uniform', return_value=1.0):
+            delays = [queue.retry_delay(attempts) for attempts in range(1, 4)]
+            self.assertEqual(delays, [queue.JOB_RETRY_BASE_DELAY * 2 ** n for n in range(3)])
+            self.assertEqual(queue.retry_delay(100), queue.JOB_RETRY_MAX_DELAY)
+        for attempts in range(1, 6):
+            delay = queue.retry_delay(attempts)
+            full = min(queue.JOB_RETRY_MAX_DELAY, queue.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+            self.assertTrue(full * 0.5 <= delay <= full, delay)
+
+    def test_unique_key_coalesces_active_jobs(self):
+        first = queue.enqueue(FLAKY_TASK, {'n': 1}, unique_key='district:PUNE')
+        self.assertEqual(queue.enqueue(FLAKY_TASK, {'n': 1}, unique_key='district:PUNE').pk, first.pk)
+        self.assertNotEqual(queue.enqueue(FLAKY_TASK, {'n': 1}, unique_key='district:NAGPUR').pk, first.pk)
+
+        # Still coalesced while running
+        job = queue.claim('worker')
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(queue.enqueue(FLAKY_TASK, {'n': 1}, unique_key='district:PUNE').pk, first.pk)
+
+        # Once finished, the key is free again
+        queue.run_job(job, 'worker')
+        self.assertNotEqual(queue.enqueue(FLAKY_TASK, {'n': 1}, unique_key='district:PUNE').pk, first.pk)
+        self.assertEqual(Job.objects.filter(unique_key='district:PUNE').count(), 2)
+
+    def test_requeue_stale_only_touches_jobs_without_heartbeat(self):
+        queue.enqueue(FLAKY_TASK, {'n': 1})
+        queue.enqueue(FLAKY_TASK, {'n': 2})
+        queue.enqueue(FLAKY_TASK, {'n': 3})
+        alive, dead, exhausted = (queue.claim(f'worker-{i}') for i in range(3))
+        now = timezone.now()
+        stale = now - timedelta(seconds=queue.JOB_LOCK_TIMEOUT + 1)
+        Job.objects.filter(pk__in=[dead.pk, exhausted.pk]).update(locked_at=stale)
+        Job.objects.filter(pk=exhausted.pk).update(attempts=F('max_attempts'))
+
+        self.assertEqual(queue.requeue_stale(now), (1, 1))
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            [statuses[alive.pk], statuses[dead.pk], statuses[exhausted.pk]],
+            ['RUNNING', 'QUEUED', 'FAILED'],
+        )
+        self.assertEqual(queue.claim('worker-3').pk, dead.pk)
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(queue.UnknownTask):
+            queue.enqueue('jobs.tests.missing')
+
+
+class JobHeartbeatTests(TransactionTestCase):
+    """The heartbeat thread writes through its own connection, so rows must be committed."""
+
+    def test_heartbeat_keeps_slow_job_from_being_requeued(self):
+        queue.enqueue(FLAKY_TASK, {'n': 1})
+        job = queue.claim('worker')
+        claimed_at = job.locked_at
+
+        with queue.Heartbeat(job.pk, 'worker', interval=0.05):
+            time.sleep(0.3)
+        job.refresh_from_db()
+        self.assertGreater(job.locked_at, claimed_at)
+
+        # Running for longer than JOB_LOCK_TIMEOUT since the claim, but renewed within it
+        later = claimed_at + timedelta(seconds=queue.JOB_LOCK_TIMEOUT) + (job.locked_at - claimed_at) / 2
+        self.assertEqual(queue.requeue_stale(later), (0, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'RUNNING')
+
+    def test_heartbeat_ignores_job_owned_by_another_worker(self):
+        queue.enqueue(FLAKY_TASK, {'n': 1})
+        job = queue.claim('worker')
+
+        with queue.Heartbeat(job.pk, 'other-worker', interval=0.05):
+            time.sleep(0.2)
+        self.assertEqual(Job.objects.get(pk=job.pk).locked_at, job.locked_at)
@@ -0,0 +1,30 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from .models import Job
+
+
+def job_payload(job):
+    """Public view of a job: no payload, and only the last line of a traceback."""
+    return {
+        'job_id': str(job.job_id),
+        'name': job.name,
+        'status': job.status,
+        'priority': job.priority,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'result': job.result if job.status == 'SUCCEEDED' else None,
+        'error': job.error.strip().splitlines()[-1] if job.error.strip() else None,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'next_attempt_at': job.run_at.isoformat() if job.status == 'QUEUED' else None,
+    }
+
+
+@require_GET
+def job_status(request, job_id):
+    """Status (and result, once finished) of a background job; the job_id itself is the credential"""
+    job = Job.objects.filter(job_id=job_id).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+    return JsonResponse({'success': True, **job_payload(job)})
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import DistrictLeaderboard
 
 # Register your models here.
+
+
+@admin.register(DistrictLeaderboard)
+class DistrictLeaderboardAdmin(admin.ModelAdmin):
+    list_display = ('district', 'state', 'calculations', 'potential_harvest_liters', 'approved_subsidies', 'updated_at')
+    search_fields = ('district', 'state')
+    readonly_fields = ('updated_at',)
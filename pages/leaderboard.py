@@ -0,0 +1,208 @@
+# pages/leaderboard.py
+"""
+District leaderboard: potential harvest from saved calculations and approved
+subsidies, per district and per state.
+
+Districts are keyed by ``(state, district)``: several district names exist
+in more than one state. A calculation carries its state; an approved
+application only names its district, so it is placed in a state only when
+that name belongs to a single state in the rainfall data.
+
+Totals live in the ``DistrictLeaderboard`` summary table and are kept current
+incrementally: saving or deleting a CalculationLog, creating or deleting an
+approved application and every officer/admin status change apply a delta to
+one district's row with ``F()`` expressions, in the same transaction as the
+change. Edits that bypass those paths (a calculation edited in the admin, raw
+SQL) queue a full ``rebuild()``, which ``manage.py refresh_leaderboard`` also
+runs as a periodic safety net.
+
+The JSON payload is built from the small summary table and held per process
+for ``LEADERBOARD_CACHE_SECONDS``, so serving it costs no query.
+"""
+import hashlib
+import json
+import threading
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from calculator.engine import climate_registry
+from calculator.models import CalculationLog
+from GovtApplications.models import SubsidyApplication
+from jobs.queue import enqueue
+from .models import DistrictLeaderboard
+
+LEADERBOARD_CACHE_SECONDS = getattr(settings, 'LEADERBOARD_CACHE_SECONDS', 60)
+LEADERBOARD_SIZE = getattr(settings, 'LEADERBOARD_SIZE', 50)
+# Edits within this window are folded into one rebuild
+LEADERBOARD_REBUILD_DELAY = getattr(settings, 'LEADERBOARD_REBUILD_DELAY', 60)
+
+REBUILD_TASK = 'pages.rebuild_leaderboard'
+
+
+def district_key(name):
+    return ' '.join((name or '').split()).upper()
+
+
+def _state_for(district):
+    """The district's state if the name is unambiguous, else ''."""
+    states = {district_key(climate.state) for climate in climate_registry.districts(district)}
+    return states.pop() if len(states) == 1 else ''
+
+
+def location_key(district, state=''):
+    """``(state, district)`` row key; a missing state comes from the district name when unambiguous."""
+    return district_key(state) or _state_for(district), district_key(district)
+
+
+# ============================================
+# INCREMENTAL UPDATES
+# ============================================
+
+def add_to_district(district, state='', calculations=0, harvest=0.0, approved=0):
+    """Apply deltas to one district's totals, creating its row on first use."""
+    state, key = location_key(district, state)
+    if not key or not (calculations or harvest or approved):
+        return
+    changes = {
+        'calculations': F('calculations') + calculations,
+        'potential_harvest_liters': F('potential_harvest_liters') + harvest,
+        'approved_subsidies': F('approved_subsidies') + approved,
+        'updated_at': timezone.now(),
+    }
+    rows = DistrictLeaderboard.objects.filter(state=state, district=key)
+    if not rows.update(**changes):
+        # First change for this district; a concurrent writer may create the row too
+        DistrictLeaderboard.objects.bulk_create(
+            [DistrictLeaderboard(district=key, state=state)], ignore_conflicts=True,
+        )
+        rows.update(**changes)
+    transaction.on_commit(leaderboard_cache.invalidate)
+
+
+def schedule_rebuild():
+    enqueue(REBUILD_TASK, delay=LEADERBOARD_REBUILD_DELAY, unique_key='all')
+
+
+def rebuild():
+    """
+    Recompute every district from the source tables (two grouped queries) and
+    rewrite the summary table to match. Returns the number of districts.
+    """
+    totals = {}
+
+    def entry(district, state=''):
+        key = location_key(district, state)
+        if not key[1]:
+            return None
+        return totals.setdefault(key, {'calculations': 0, 'potential_harvest_liters': 0.0, 'approved_subsidies': 0})
+
+    calculations = (
+        CalculationLog.objects.values('district_name', 'state')
+        .annotate(count=Count('id'), harvest=Sum('water_harvested_liters')).order_by()
+    )
+    for row in calculations:
+        item = entry(row['district_name'], row['state'])
+        if item is not None:
+            item['calculations'] += row['count']
+            item['potential_harvest_liters'] += row['harvest'] or 0.0
+
+    approved = (
+        SubsidyApplication.objects.filter(status='APPROVED').values('district')
+        .annotate(count=Count('id')).order_by()
+    )
+    for row in approved:
+        item = entry(row['district'])
+        if item is not None:
+            item['approved_subsidies'] += row['count']
+
+    now = timezone.now()
+    with transaction.atomic():
+        keep = set(totals)
+        stale = [
+            row['id'] for row in DistrictLeaderboard.objects.values('id', 'state', 'district')
+            if (row['state'], row['district']) not in keep
+        ]
+        DistrictLeaderboard.objects.filter(id__in=stale).delete()
+        DistrictLeaderboard.objects.bulk_create(
+            [
+                DistrictLeaderboard(state=state, district=district, updated_at=now, **values)
+                for (state, district), values in totals.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['state', 'district'],
+            update_fields=['calculations', 'potential_harvest_liters', 'approved_subsidies', 'updated_at'],
+            batch_size=500,
+        )
+        transaction.on_commit(leaderboard_cache.invalidate)
+    return len(totals)
+
+
+# ============================================
+# CACHED PAYLOAD
+# ============================================
+
+def _ranked(rows):
+    rows = sorted(rows, key=lambda row: (-row['potential_harvest_liters'], -row['approved_subsidies'], row['name']))
+    return [{'rank': rank, **row} for rank, row in enumerate(rows[:LEADERBOARD_SIZE], 1)]
+
+
+def build_payload():
+    districts = []
+    states = {}
+    for row in DistrictLeaderboard.objects.values(
+        'district', 'state', 'calculations', 'potential_harvest_liters', 'approved_subsidies', 'updated_at',
+    ):
+        harvest = max(row['potential_harvest_liters'], 0.0)
+        districts.append({
+            'name': row['district'],
+            'state': row['state'],
+            'calculations': row['calculations'],
+            'potential_harvest_liters': round(harvest),
+            'approved_subsidies': row['approved_subsidies'],
+        })
+        state = states.setdefault(row['state'] or 'Unknown', {
+            'name': row['state'] or 'Unknown', 'districts': 0, 'calculations': 0,
+            'potential_harvest_liters': 0, 'approved_subsidies': 0,
+        })
+        state['districts'] += 1
+        state['calculations'] += row['calculations']
+        state['potential_harvest_liters'] += round(harvest)
+        state['approved_subsidies'] += row['approved_subsidies']
+
+    payload = {
+        'districts': _ranked(districts),
+        'states': _ranked(states.values()),
+        'totals': {
+            'districts': len(districts),
+            'calculations': sum(row['calculations'] for row in districts),
+            'potential_harvest_liters': sum(row['potential_harvest_liters'] for row in districts),
+            'approved_subsidies': sum(row['approved_subsidies'] for row in districts),
+        },
+    }
+    version = hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return {'version': version, 'generated_at': timezone.now().isoformat(), **payload}
+
+
+class LeaderboardCache:
+    """Per-process copy of the leaderboard payload, rebuilt after LEADERBOARD_CACHE_SECONDS."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._payload = None
+        self._loaded_at = 0.0
+
+    def get(self):
+        with self._lock:
+            if self._payload is None or time.monotonic() - self._loaded_at >= LEADERBOARD_CACHE_SECONDS:
+                self._payload = build_payload()
+                self._loaded_at = time.monotonic()
+            return self._payload
+
+    def invalidate(self):
+        with self._lock:
+            self._payload = None
+
+
+leaderboard_cache = LeaderboardCache()
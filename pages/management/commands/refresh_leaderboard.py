@@ -0,0 +1,11 @@
+# pages/management/commands/refresh_leaderboard.py
+from django.core.management.base import BaseCommand
+from pages.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the district leaderboard summary from calculations and approved applications"
+
+    def handle(self, *args, **options):
+        districts = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Leaderboard rebuilt for {districts} district(s)"))
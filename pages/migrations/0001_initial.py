@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistrictLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=100, unique=True)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('calculations', models.IntegerField(default=0)),
+                ('potential_harvest_liters', models.FloatField(default=0)),
+                ('approved_subsidies', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-potential_harvest_liters'],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:30
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def populate(apps, schema_editor):
+    """Seed the summary from existing rows; later changes are applied incrementally."""
+    CalculationLog = apps.get_model('calculator', 'CalculationLog')
+    SubsidyApplication = apps.get_model('GovtApplications', 'SubsidyApplication')
+    RainfallData = apps.get_model('calculator', 'RainfallData')
+    DistrictLeaderboard = apps.get_model('pages', 'DistrictLeaderboard')
+
+    def key(name):
+        return ' '.join((name or '').split()).upper()
+
+    states = {key(row['district_name']): row['state'] or '' for row in RainfallData.objects.values('district_name', 'state')}
+    totals = {}
+    for row in CalculationLog.objects.values('district_name').annotate(count=Count('id'), harvest=Sum('water_harvested_liters')).order_by():
+        if key(row['district_name']):
+            item = totals.setdefault(key(row['district_name']), DistrictLeaderboard(district=key(row['district_name'])))
+            item.calculations += row['count']
+            item.potential_harvest_liters += row['harvest'] or 0.0
+    for row in SubsidyApplication.objects.filter(status='APPROVED').values('district').annotate(count=Count('id')).order_by():
+        if key(row['district']):
+            item = totals.setdefault(key(row['district']), DistrictLeaderboard(district=key(row['district'])))
+            item.approved_subsidies += row['count']
+    for district, item in totals.items():
+        item.state = states.get(district, '')
+    DistrictLeaderboard.objects.bulk_create(totals.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+        ('calculator', '0006_graphplot_label'),
+        ('GovtApplications', '0007_subsidyapplication_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
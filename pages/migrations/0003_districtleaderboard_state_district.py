@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:40
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def repopulate(apps, schema_editor):
+    """Re-key existing totals by (state, district); rows keyed by name alone merged same-named districts."""
+    CalculationLog = apps.get_model('calculator', 'CalculationLog')
+    SubsidyApplication = apps.get_model('GovtApplications', 'SubsidyApplication')
+    RainfallData = apps.get_model('calculator', 'RainfallData')
+    DistrictLeaderboard = apps.get_model('pages', 'DistrictLeaderboard')
+
+    def key(name):
+        return ' '.join((name or '').split()).upper()
+
+    states = {}
+    for row in RainfallData.objects.values('district_name', 'state'):
+        states.setdefault(key(row['district_name']), set()).add(key(row['state']))
+
+    def location(district, state=''):
+        known = states.get(key(district), set())
+        return key(state) or (next(iter(known)) if len(known) == 1 else ''), key(district)
+
+    totals = {}
+
+    def entry(district, state=''):
+        state, district = location(district, state)
+        return totals.setdefault((state, district), DistrictLeaderboard(state=state, district=district))
+
+    for row in CalculationLog.objects.values('district_name', 'state').annotate(count=Count('id'), harvest=Sum('water_harvested_liters')).order_by():
+        if key(row['district_name']):
+            item = entry(row['district_name'], row['state'])
+            item.calculations += row['count']
+            item.potential_harvest_liters += row['harvest'] or 0.0
+    for row in SubsidyApplication.objects.filter(status='APPROVED').values('district').annotate(count=Count('id')).order_by():
+        if key(row['district']):
+            entry(row['district']).approved_subsidies += row['count']
+    DistrictLeaderboard.objects.all().delete()
+    DistrictLeaderboard.objects.bulk_create(totals.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_populate_districtleaderboard'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='districtleaderboard',
+            name='district',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.RunPython(repopulate, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='districtleaderboard',
+            constraint=models.UniqueConstraint(fields=('state', 'district'), name='leaderboard_unique_state_district'),
+        ),
+    ]
@@ -1,3 +1,26 @@
 from django.db import models
 
 # Create your models here.
+
+
+class DistrictLeaderboard(models.Model):
+    """
+    Materialised per-district totals behind the leaderboard, kept current by
+    pages.leaderboard from CalculationLog and SubsidyApplication changes.
+    """
+    district = models.CharField(max_length=100)  # Normalised (upper-case) district name
+    state = models.CharField(max_length=100, blank=True)  # Normalised state; '' when it cannot be told
+    calculations = models.IntegerField(default=0)
+    potential_harvest_liters = models.FloatField(default=0)
+    approved_subsidies = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-potential_harvest_liters']
+        constraints = [
+            # The same district name exists in more than one state
+            models.UniqueConstraint(fields=['state', 'district'], name='leaderboard_unique_state_district'),
+        ]
+
+    def __str__(self):
+        return f"{self.district}: {self.potential_harvest_liters:.0f}L, {self.approved_subsidies} approved"
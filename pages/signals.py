@@ -0,0 +1,49 @@
+# pages/signals.py
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from calculator.models import CalculationLog
+from GovtApplications.models import SubsidyApplication
+from GovtApplications.signals import status_changed
+from .leaderboard import add_to_district, schedule_rebuild
+
+
+def _harvest(calculation):
+    return float(calculation.water_harvested_liters or 0)
+
+
+@receiver(post_save, sender=CalculationLog)
+def calculation_saved(sender, instance, created, **kwargs):
+    """Count a new calculation; an edited one may have changed district or harvest, so rebuild."""
+    if created:
+        add_to_district(instance.district_name, instance.state, calculations=1, harvest=_harvest(instance))
+    else:
+        schedule_rebuild()
+
+
+@receiver(post_delete, sender=CalculationLog)
+def calculation_deleted(sender, instance, **kwargs):
+    add_to_district(instance.district_name, instance.state, calculations=-1, harvest=-_harvest(instance))
+
+
+@receiver(post_save, sender=SubsidyApplication)
+def application_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        if instance.status == 'APPROVED':
+            add_to_district(instance.district, approved=1)
+    elif update_fields is None or 'status' in update_fields or 'district' in update_fields:
+        # Edited through save() (e.g. the admin form); the previous status is unknown here
+        schedule_rebuild()
+
+
+@receiver(pre_delete, sender=SubsidyApplication)
+def application_deleted(sender, instance, **kwargs):
+    # Read the stored status: the instance may predate a bulk status change
+    stored = SubsidyApplication.objects.filter(pk=instance.pk).values('district', 'status').first()
+    if stored and stored['status'] == 'APPROVED':
+        add_to_district(stored['district'], approved=-1)
+
+
+@receiver(status_changed, sender=SubsidyApplication)
+def application_status_changed(sender, district, previous, status, count, **kwargs):
+    delta = (count if status == 'APPROVED' else 0) - (count if previous == 'APPROVED' else 0)
+    add_to_district(district, approved=delta)
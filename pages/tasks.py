@@ -0,0 +1,9 @@
+# pages/tasks.py
+from jobs.queue import task, PRIORITY_LOW
+from .leaderboard import REBUILD_TASK, rebuild
+
+
+@task(REBUILD_TASK, priority=PRIORITY_LOW)
+def rebuild_leaderboard():
+    """Recompute the district leaderboard summary table"""
+    return {'districts': rebuild()}
@@ -10,6 +10,7 @@ urlpatterns = [
     path('', views.home_view, name='home'),
     path('about/', views.about_view, name='about'),
     path('leaderboard/', views.leaderboard_view, name='leaderboard'),
+    path('leaderboard/data/', views.leaderboard_data, name='leaderboard_data'),
     path('contact/', views.contact_view, name='contact'),
     path('calculator/', include('calculator.urls')),
     path('vendor_section/', views.vendor_view, name='vendor_section'),
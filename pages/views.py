@@ -1,4 +1,11 @@
+from django.conf import settings
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+from .leaderboard import leaderboard_cache
+
+LEADERBOARD_MAX_AGE = getattr(settings, 'LEADERBOARD_MAX_AGE', 60)
 
 # Create your views here.
 
@@ -16,9 +23,20 @@ def contact_view(request):
     return render(request, 'contact.html')
 
 def leaderboard_view(request):
-    """Contact page"""
+    """Leaderboard page (data from leaderboard_data)"""
     return render(request, 'leaderboard.html')
 
+def _leaderboard_etag(request):
+    return leaderboard_cache.get()['version']
+
+@require_GET
+@condition(etag_func=_leaderboard_etag)
+def leaderboard_data(request):
+    """District and state rankings from the cached leaderboard summary"""
+    response = JsonResponse({'success': True, **leaderboard_cache.get()})
+    patch_cache_control(response, public=True, max_age=LEADERBOARD_MAX_AGE)
+    return response
+
 def vendor_view(request):
     """Vendor page"""
     return render(request, 'vendor.html')
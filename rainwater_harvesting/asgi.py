@@ -5,6 +5,13 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+The site runs under WSGI by default (``runserver``, wsgi.py). To stream chat
+replies and officer dashboard changes, install an ASGI server separately
+(``pip install uvicorn``) and serve with
+``uvicorn rainwater_harvesting.asgi:application``; async views then wait on
+Gemini without holding a worker thread, and synchronous views keep running in
+Django's thread pool. Under WSGI those endpoints answer with plain JSON.
 """
 
 import os
@@ -12,6 +12,7 @@ urlpatterns = [
     path('vendor/', include('vendorRegistration.urls')),  # Vendor registration
     path('officer/', include('GovtApplications.urls')),  # Officer dashboard & management
     path('applications/', include('GovtApplications.application_urls')),  # Public application forms
+    path('api/jobs/', include('jobs.urls')),  # Background job status
     path('api/', include('translations.urls')),  # Translation API
     path('calculator/', include('calculator.urls')),  # Calculator pages
     path('api/v1/', include('calculator.api_urls')),  # Calculator API endpoints
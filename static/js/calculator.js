@@ -4,6 +4,8 @@ class RainwaterCalculatorDemo {
         this.apiURL = '/api/v1';
         this.currentCalculationData = null;
         this.isSaved = false;
+        this.useClientCharts = true;
+        this.charts = {};
         this.init();
     }
 
@@ -475,34 +477,159 @@ class RainwaterCalculatorDemo {
         }
     }
 
-    // ✅ IMPROVED CHART LOADING WITH TIMEOUT AND RETRY
+    // ✅ CHART LOADING: JSON series drawn in the browser, PNG endpoints as fallback
     preloadCharts(districtName, roofArea, roofType, dwellers) {
-        console.log('🔄 Preloading charts...');
-        
-        // Preload both chart URLs to warm up the server
-        const rainfallUrl = `${this.baseURL}${this.apiURL}/chart/${encodeURIComponent(districtName)}/?t=${Date.now()}`;
-        const harvestUrl = `${this.baseURL}${this.apiURL}/chart/line/${encodeURIComponent(districtName)}/?area=${roofArea}&roof_type=${encodeURIComponent(roofType)}&people=${dwellers}&t=${Date.now()}`;
-        
-        // Create invisible img elements to preload
-        const preloadRainfall = new Image();
-        const preloadHarvest = new Image();
-        
-        preloadRainfall.onload = () => console.log('✅ Rainfall chart preloaded');
-        preloadRainfall.onerror = () => console.warn('⚠️ Rainfall chart preload failed');
-        preloadRainfall.src = rainfallUrl;
-        
-        preloadHarvest.onload = () => console.log('✅ Harvest chart preloaded');
-        preloadHarvest.onerror = () => console.warn('⚠️ Harvest chart preload failed');
-        preloadHarvest.src = harvestUrl;
-        
-        // Load actual charts after a short delay
-        setTimeout(() => {
-            this.loadRainfallChart(districtName);
-            this.loadHarvestConsumptionChart(districtName, roofArea, roofType, dwellers);
-        }, 1000);
+        console.log('🔄 Loading charts...');
+        this.loadRainfallChart(districtName);
+        this.loadHarvestConsumptionChart(districtName, roofArea, roofType, dwellers);
+    }
+
+    canDrawClientCharts() {
+        return this.useClientCharts && typeof window.Chart !== 'undefined';
+    }
+
+    async fetchChartData(path) {
+        const response = await fetch(`${this.baseURL}${this.apiURL}/chart-data/${path}`);
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || 'Chart data not available');
+        }
+        return result.data;
+    }
+
+    drawChart(canvas, config) {
+        if (this.charts[canvas.id]) {
+            this.charts[canvas.id].destroy();
+        }
+        this.charts[canvas.id] = new Chart(canvas, config);
+        canvas.style.display = 'block';
+    }
+
+    destroyCharts() {
+        Object.values(this.charts).forEach(chart => chart.destroy());
+        this.charts = {};
+        ['rainfallCanvas', 'harvestConsumptionCanvas'].forEach(id => {
+            const canvas = document.getElementById(id);
+            if (canvas) canvas.style.display = 'none';
+        });
     }
 
-    loadRainfallChart(districtName) {
+    async loadRainfallChart(districtName) {
+        const canvas = document.getElementById('rainfallCanvas');
+        if (!canvas || !this.canDrawClientCharts()) {
+            this.loadRainfallChartImage(districtName);
+            return;
+        }
+
+        const chartImg = document.getElementById('rainfallChart');
+        const chartLoading = document.getElementById('chartLoading');
+        const chartError = document.getElementById('chartError');
+
+        if (chartLoading) chartLoading.style.display = 'block';
+        if (chartError) chartError.style.display = 'none';
+        if (chartImg) chartImg.style.display = 'none';
+        canvas.style.display = 'none';
+
+        try {
+            const data = await this.fetchChartData(`${encodeURIComponent(districtName)}/`);
+            this.drawChart(canvas, {
+                type: 'bar',
+                data: {
+                    labels: data.months,
+                    datasets: [{
+                        label: 'Rainfall (mm)',
+                        data: data.rainfall_mm,
+                        backgroundColor: 'skyblue',
+                        borderColor: 'navy',
+                        borderWidth: 1.2
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    plugins: {
+                        title: { display: true, text: `Monthly Rainfall - ${data.district_name}` }
+                    },
+                    scales: {
+                        x: { title: { display: true, text: 'Month' } },
+                        y: { title: { display: true, text: 'Rainfall (mm)' }, beginAtZero: true }
+                    }
+                }
+            });
+            if (chartLoading) chartLoading.style.display = 'none';
+            console.log('✅ Rainfall chart drawn from JSON');
+        } catch (error) {
+            console.warn('⚠️ Rainfall chart data unavailable, falling back to image:', error);
+            canvas.style.display = 'none';
+            this.loadRainfallChartImage(districtName);
+        }
+    }
+
+    async loadHarvestConsumptionChart(districtName, roofArea, roofType, dwellers) {
+        const canvas = document.getElementById('harvestConsumptionCanvas');
+        if (!canvas || !this.canDrawClientCharts()) {
+            this.loadHarvestConsumptionChartImage(districtName, roofArea, roofType, dwellers);
+            return;
+        }
+
+        const chartImg = document.getElementById('harvestConsumptionChart');
+        const chartLoading = document.getElementById('harvestConsumptionChartLoading');
+        const chartError = document.getElementById('harvestConsumptionChartError');
+
+        if (chartLoading) chartLoading.style.display = 'block';
+        if (chartError) chartError.style.display = 'none';
+        if (chartImg) chartImg.style.display = 'none';
+        canvas.style.display = 'none';
+
+        try {
+            const data = await this.fetchChartData(
+                `line/${encodeURIComponent(districtName)}/?area=${roofArea}&roof_type=${encodeURIComponent(roofType)}&people=${dwellers}`
+            );
+            this.drawChart(canvas, {
+                type: 'line',
+                data: {
+                    labels: data.months,
+                    datasets: [
+                        {
+                            label: `Harvested (${data.roof_area_sqm}m² ${data.roof_type})`,
+                            data: data.harvested_liters,
+                            borderColor: 'blue',
+                            backgroundColor: 'blue',
+                            pointStyle: 'circle',
+                            borderWidth: 2
+                        },
+                        {
+                            label: `Consumption (${data.number_of_people} person${data.number_of_people > 1 ? 's' : ''})`,
+                            data: data.consumption_liters,
+                            borderColor: 'red',
+                            backgroundColor: 'red',
+                            pointStyle: 'rect',
+                            borderDash: [6, 4],
+                            borderWidth: 2
+                        }
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    plugins: {
+                        title: { display: true, text: `Monthly Water Harvest vs Consumption - ${data.district_name}` }
+                    },
+                    scales: {
+                        x: { title: { display: true, text: 'Month' } },
+                        y: { title: { display: true, text: 'Liters' }, beginAtZero: true }
+                    }
+                }
+            });
+            if (chartLoading) chartLoading.style.display = 'none';
+            console.log('✅ Harvest chart drawn from JSON');
+        } catch (error) {
+            console.warn('⚠️ Harvest chart data unavailable, falling back to image:', error);
+            canvas.style.display = 'none';
+            this.loadHarvestConsumptionChartImage(districtName, roofArea, roofType, dwellers);
+        }
+    }
+
+    // Server-rendered PNG fallback
+    loadRainfallChartImage(districtName) {
         const chartImg = document.getElementById('rainfallChart');
         const chartLoading = document.getElementById('chartLoading');
         const chartError = document.getElementById('chartError');
@@ -514,8 +641,8 @@ class RainwaterCalculatorDemo {
         if (chartError) chartError.style.display = 'none';
         chartImg.style.display = 'none';
         
-        // Set chart source URL with cache busting
-        const chartUrl = `${this.baseURL}${this.apiURL}/chart/${encodeURIComponent(districtName)}/?t=${Date.now()}`;
+        // Set chart source URL (server revalidates with ETag)
+        const chartUrl = `${this.baseURL}${this.apiURL}/chart/${encodeURIComponent(districtName)}/`;
         chartImg.src = chartUrl;
         
         // ✅ Add timeout fallback
@@ -557,7 +684,7 @@ class RainwaterCalculatorDemo {
         };
     }
 
-    loadHarvestConsumptionChart(districtName, roofArea, roofType, dwellers) {
+    loadHarvestConsumptionChartImage(districtName, roofArea, roofType, dwellers) {
         const chartImg = document.getElementById('harvestConsumptionChart');
         const chartLoading = document.getElementById('harvestConsumptionChartLoading');
         const chartError = document.getElementById('harvestConsumptionChartError');
@@ -572,8 +699,8 @@ class RainwaterCalculatorDemo {
         chartError.style.display = 'none';
         chartImg.style.display = 'none';
         
-        // Set chart source URL with cache busting
-        const chartUrl = `${this.baseURL}${this.apiURL}/chart/line/${encodeURIComponent(districtName)}/?area=${roofArea}&roof_type=${encodeURIComponent(roofType)}&people=${dwellers}&t=${Date.now()}`;
+        // Set chart source URL (server revalidates with ETag)
+        const chartUrl = `${this.baseURL}${this.apiURL}/chart/line/${encodeURIComponent(districtName)}/?area=${roofArea}&roof_type=${encodeURIComponent(roofType)}&people=${dwellers}`;
         
         console.log('🔍 Loading harvest chart URL:', chartUrl);
         
@@ -812,6 +939,9 @@ class RainwaterCalculatorDemo {
         const metaDiv = document.getElementById('calculationMeta');
         if (metaDiv) metaDiv.style.display = 'none';
         
+        // Reset client-side charts
+        this.destroyCharts();
+        
         // Reset rainfall chart
         const chartImg = document.getElementById('rainfallChart');
         const chartLoading = document.getElementById('chartLoading');
@@ -1466,7 +1596,8 @@ style.textContent = `
         color: #dc3545;
     }
     
-    #rainfallChart, #harvestConsumptionChart {
+    #rainfallChart, #harvestConsumptionChart,
+    #rainfallCanvas, #harvestConsumptionCanvas {
         border-radius: 8px;
         box-shadow: 0 2px 8px rgba(0,0,0,0.1);
         transition: opacity 0.3s ease;
@@ -1,215 +1,102 @@
-        // Dummy data for demonstration
-        const leaderboardData = [
-            { 
-                id: 1,
-                name: "AquaWarrior", 
-                location: "Bangalore, India",
-                credits: 12500, 
-                progress: 92,
-                badges: [
-                    { type: "trophy", tooltip: "Top Contributor" },
-                    { type: "leaf", tooltip: "Eco Champion" },
-                    { type: "water", tooltip: "Water Savior" },
-                    { type: "energy", tooltip: "Energy Saver" }
-                ] 
-            },
-            { 
-                id: 2,
-                name: "RainGuardian", 
-                location: "Mumbai, India",
-                credits: 9800, 
-                progress: 85,
-                badges: [
-                    { type: "trophy", tooltip: "Top Contributor" },
-                    { type: "leaf", tooltip: "Eco Champion" },
-                    { type: "water", tooltip: "Water Savior" }
-                ] 
-            },
-            { 
-                id: 3,
-                name: "HydroHero", 
-                location: "Delhi, India",
-                credits: 8750, 
-                progress: 78,
-                badges: [
-                    { type: "leaf", tooltip: "Eco Champion" },
-                    { type: "water", tooltip: "Water Savior" },
-                    { type: "energy", tooltip: "Energy Saver" }
-                ] 
-            },
-            { 
-                id: 4,
-                name: "EcoSaver", 
-                location: "Chennai, India",
-                credits: 7600, 
-                progress: 68,
-                badges: [
-                    { type: "water", tooltip: "Water Savior" },
-                    { type: "energy", tooltip: "Energy Saver" }
-                ] 
-            },
-            { 
-                id: 5,
-                name: "GreenThumb", 
-                location: "Hyderabad, India",
-                credits: 6400, 
-                progress: 60,
-                badges: [
-                    { type: "leaf", tooltip: "Eco Champion" },
-                    { type: "energy", tooltip: "Energy Saver" }
-                ] 
-            },
-            { 
-                id: 6,
-                name: "WaterWizard", 
-                location: "Pune, India",
-                credits: 5800, 
-                progress: 55,
-                badges: [
-                    { type: "water", tooltip: "Water Savior" }
-                ] 
-            },
-            { 
-                id: 7,
-                name: "EcoWarrior", 
-                location: "Kolkata, India",
-                credits: 5200, 
-                progress: 48,
-                badges: [
-                    { type: "leaf", tooltip: "Eco Champion" }
-                ] 
-            },
-            { 
-                id: 8,
-                name: "SustainableSam", 
-                location: "Ahmedabad, India",
-                credits: 4700, 
-                progress: 42,
-                badges: [
-                    { type: "energy", tooltip: "Energy Saver" }
-                ] 
-            },
-            { 
-                id: 9,
-                name: "PlanetProtector", 
-                location: "Jaipur, India",
-                credits: 4100, 
-                progress: 38,
-                badges: [] 
-            },
-            { 
-                id: 10,
-                name: "EcoEnthusiast", 
-                location: "Lucknow, India",
-                credits: 3800, 
-                progress: 35,
-                badges: [] 
-            }
-        ];
+        // District and state rankings from the cached leaderboard summary (pages.views.leaderboard_data)
+        let leaderboard = null;
+        let activeGroup = 'districts';
 
-        // Check if user is logged in (for demo purposes, we'll simulate a logged-in user)
-        const currentUser = {
-            id: 15,
-            name: "WaterSaver",
-            credits: 2850,
-            rank: 15,
-            progress: 26
-        };
+        function escapeHtml(value) {
+            const div = document.createElement('div');
+            div.textContent = value == null ? '' : String(value);
+            return div.innerHTML;
+        }
+
+        function compactNumber(value) {
+            return new Intl.NumberFormat('en-IN', { notation: 'compact', maximumFractionDigits: 1 }).format(value);
+        }
 
         // Function to render leaderboard
         function renderLeaderboard() {
             const leaderboardList = document.getElementById('leaderboard-list');
             leaderboardList.innerHTML = '';
-            
-            // Render top users
-            leaderboardData.forEach((user, index) => {
+            document.getElementById('leaderboard-group-label').textContent = activeGroup === 'states' ? 'State' : 'District';
+
+            const rows = leaderboard[activeGroup];
+            if (!rows.length) {
+                leaderboardList.innerHTML = '<div class="rank-item"><div></div><div class="user-details">No calculations saved yet</div></div>';
+                return;
+            }
+
+            const leaderHarvest = rows[0].potential_harvest_liters || 1;
+            rows.forEach(row => {
+                const share = Math.round(100 * row.potential_harvest_liters / leaderHarvest);
+                const location = activeGroup === 'states'
+                    ? `${row.districts} district${row.districts === 1 ? '' : 's'}`
+                    : (row.state || 'India');
+
                 const rankItem = document.createElement('div');
-                rankItem.className = `rank-item rank-${index + 1}`;
-                rankItem.id = `user-${user.id}`;
-                
+                rankItem.className = `rank-item rank-${row.rank}`;
                 rankItem.innerHTML = `
-                    <div class="rank-number">${index + 1}</div>
+                    <div class="rank-number">${row.rank}</div>
                     <div class="user-info">
                         <div class="user-avatar">
-                            <i class="fas fa-user"></i>
+                            <i class="fas fa-${activeGroup === 'states' ? 'map' : 'map-marker-alt'}"></i>
                         </div>
                         <div class="user-details">
-                            <div class="user-name">${user.name}</div>
-                            <div class="user-location">${user.location}</div>
+                            <div class="user-name">${escapeHtml(row.name)}</div>
+                            <div class="user-location">${escapeHtml(location)} · ${row.calculations.toLocaleString()} calculations</div>
                         </div>
                     </div>
-                    <div class="user-credits">${user.credits.toLocaleString()}</div>
+                    <div class="user-credits">${row.potential_harvest_liters.toLocaleString()}</div>
                     <div class="progress-container">
                         <div class="progress-bar">
-                            <div class="progress-fill" style="width: ${user.progress}%"></div>
+                            <div class="progress-fill" style="width: ${share}%"></div>
                         </div>
-                        <div class="progress-text">${user.progress}%</div>
+                        <div class="progress-text">${share}%</div>
                     </div>
                     <div class="user-badges">
-                        ${user.badges.map(badge => 
-                            `<div class="badge ${badge.type}" data-tooltip="${badge.tooltip}">
-                                <i class="fas fa-${badge.type === 'trophy' ? 'trophy' : badge.type === 'leaf' ? 'leaf' : badge.type === 'water' ? 'tint' : 'bolt'}"></i>
-                            </div>`
-                        ).join('')}
+                        <div class="badge water" data-tooltip="Approved subsidies">
+                            <i class="fas fa-tint"></i>
+                        </div>
+                        <span>${row.approved_subsidies.toLocaleString()}</span>
                     </div>
                 `;
-                
                 leaderboardList.appendChild(rankItem);
             });
-            
-            // Render user's rank if not in top 10
-            renderUserRankCard();
         }
-        
-        // Function to render user's rank card
-        function renderUserRankCard() {
-            const userRankCard = document.getElementById('user-rank-card');
-            
-            userRankCard.innerHTML = `
-                <div class="rank-number">${currentUser.rank}</div>
-                <div class="user-info">
-                    <div class="user-avatar">
-                        <i class="fas fa-user"></i>
-                    </div>
-                    <div class="user-details">
-                        <div class="user-name">${currentUser.name} (You)</div>
-                        <div class="user-location">See your profile</div>
-                    </div>
-                </div>
-                <div class="user-credits">${currentUser.credits.toLocaleString()}</div>
-                <div class="progress-container">
-                    <div class="progress-bar">
-                        <div class="progress-fill" style="width: ${currentUser.progress}%"></div>
-                    </div>
-                    <div class="progress-text">${currentUser.progress}%</div>
-                </div>
-                <div class="user-badges">
-                    <div class="badge water" data-tooltip="Water Saver">
-                        <i class="fas fa-tint"></i>
-                    </div>
-                </div>
-            `;
+
+        function renderTotals() {
+            const totals = leaderboard.totals;
+            document.getElementById('total-districts').textContent = totals.districts.toLocaleString();
+            document.getElementById('total-calculations').textContent = compactNumber(totals.calculations);
+            document.getElementById('total-harvest').textContent = compactNumber(totals.potential_harvest_liters);
+            document.getElementById('total-approved').textContent = compactNumber(totals.approved_subsidies);
+        }
+
+        async function loadLeaderboard() {
+            const leaderboardList = document.getElementById('leaderboard-list');
+            try {
+                const response = await fetch(leaderboardList.dataset.url);
+                const data = await response.json();
+                if (!data.success) throw new Error(data.error);
+                leaderboard = data;
+                renderLeaderboard();
+                renderTotals();
+            } catch (error) {
+                console.error('Error loading leaderboard:', error);
+                leaderboardList.innerHTML = '<div class="rank-item"><div></div><div class="user-details">Leaderboard is unavailable right now</div></div>';
+            }
         }
-        
+
         // Initialize leaderboard when page loads
         document.addEventListener('DOMContentLoaded', function() {
-            renderLeaderboard();
-            
-            // Add event listeners to filter buttons
+            loadLeaderboard();
+
+            // Switch between district and state rankings
             const filterButtons = document.querySelectorAll('.filter-btn');
             filterButtons.forEach(button => {
                 button.addEventListener('click', function() {
                     filterButtons.forEach(btn => btn.classList.remove('active'));
                     this.classList.add('active');
-                    // In a real app, this would filter the leaderboard data
+                    activeGroup = this.dataset.group;
+                    if (leaderboard) renderLeaderboard();
                 });
             });
-            
-            // Simulate rank changes for demo purposes
-            setTimeout(() => {
-                const userItem = document.getElementById('user-4');
-                if (userItem) {
-                    userItem.classList.add('rank-change');
-                }
-            }, 2000);
         });
@@ -439,6 +439,75 @@ async function underReviewApplication(appId) {
     }
 }
 
+function selectedApplicationIds() {
+    return Array.from(document.querySelectorAll('.app-select:checked')).map(box => box.value);
+}
+
+function updateBulkToolbar() {
+    const count = selectedApplicationIds().length;
+    const toolbar = document.getElementById('bulk-toolbar');
+    if (!toolbar) return;
+    toolbar.querySelector('.bulk-count').textContent = count;
+    toolbar.querySelectorAll('button').forEach(button => { button.disabled = count === 0; });
+}
+
+async function bulkUpdateApplications(status) {
+    const applicationIds = selectedApplicationIds();
+    if (!applicationIds.length) {
+        return;
+    }
+
+    const labels = { APPROVED: 'approve', REJECTED: 'reject', UNDER_REVIEW: 'mark as under review' };
+    let reason = '';
+    if (status === 'REJECTED') {
+        reason = prompt(`Enter rejection reason for ${applicationIds.length} application(s):`);
+        if (!reason || !reason.trim()) {
+            return;
+        }
+    } else if (!confirm(`Are you sure you want to ${labels[status]} ${applicationIds.length} application(s)?`)) {
+        return;
+    }
+
+    try {
+        // Get CSRF token from cookie or meta tag
+        const csrfToken = getCookie('csrftoken') || document.querySelector('[name=csrfmiddlewaretoken]')?.value;
+
+        if (!csrfToken) {
+            alert('❌ Security token missing. Please refresh the page.');
+            return;
+        }
+
+        const response = await fetch('/officer/bulk-action/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken,
+                'X-Requested-With': 'XMLHttpRequest',
+            },
+            body: JSON.stringify({ application_ids: applicationIds, status: status, reason: reason })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            const summary = data.summary;
+            let message = `✅ ${summary.updated} application(s) updated.`;
+            if (summary.unchanged) message += `\n${summary.unchanged} already had this status.`;
+            if (summary.not_found) {
+                const missing = data.results.filter(item => item.result === 'not_found').map(item => item.application_id);
+                message += `\n${summary.not_found} not found: ${missing.join(', ')}`;
+            }
+            alert(message);
+            location.reload();
+        } else {
+            alert('❌ ' + (data.message || 'Failed to update applications'));
+        }
+    } catch (error) {
+        console.error('Bulk action error:', error);
+        alert('❌ An error occurred. Please try again.');
+    }
+}
+
 // Helper function to get CSRF token from cookie
 function getCookie(name) {
     let cookieValue = null;
@@ -722,6 +791,8 @@ window.filterApplications = filterApplications;
     window.approveApplication = approveApplication;
     window.rejectApplication = rejectApplication;
     window.underReviewApplication = underReviewApplication; 
+    window.bulkUpdateApplications = bulkUpdateApplications;
+    window.updateBulkToolbar = updateBulkToolbar;
     // ============================================
     // START APPLICATION
     // ============================================
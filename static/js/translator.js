@@ -7,6 +7,8 @@ class PageTranslator {
     constructor() {
         this.currentLang = localStorage.getItem('siteLanguage') || 'en';
         this.apiEndpoint = '/api/translate/batch/';
+        this.bundleEndpoint = '/api/translate/bundle/';
+        this.bundle = new Map();
         this.isTranslating = false;
         
         this.init();
@@ -87,16 +89,33 @@ class PageTranslator {
             
             console.log(`📝 Found ${texts.length} elements to translate`);
             
-            // Translate in batches
+            // Prebuilt page bundle first; only strings it lacks go to the API
+            this.bundle = await this.loadBundle(targetLang);
+            const allTranslations = new Array(texts.length);
+            const pending = [];
+            
+            texts.forEach((text, idx) => {
+                const translated = this.bundle.get(this.normaliseText(text));
+                if (translated !== undefined) {
+                    allTranslations[idx] = translated;
+                } else {
+                    pending.push(idx);
+                }
+            });
+            
+            console.log(`📦 ${texts.length - pending.length} from bundle, ${pending.length} via API`);
+            
+            // Translate the rest in batches
             const batchSize = 50;
-            const allTranslations = [];
             
-            for (let i = 0; i < texts.length; i += batchSize) {
-                const batch = texts.slice(i, i + batchSize);
-                const translations = await this.callTranslationAPI(batch, targetLang);
-                allTranslations.push(...translations);
+            for (let i = 0; i < pending.length; i += batchSize) {
+                const batchIdx = pending.slice(i, i + batchSize);
+                const translations = await this.callTranslationAPI(batchIdx.map(idx => texts[idx]), targetLang);
+                batchIdx.forEach((idx, j) => {
+                    allTranslations[idx] = translations[j];
+                });
                 
-                console.log(`✅ Batch ${Math.floor(i/batchSize) + 1}/${Math.ceil(texts.length/batchSize)} done`);
+                console.log(`✅ Batch ${Math.floor(i/batchSize) + 1}/${Math.ceil(pending.length/batchSize)} done`);
             }
             
             // Apply translations
@@ -179,6 +198,11 @@ class PageTranslator {
         
         // Translate placeholders
         if (element.placeholder) {
+            const bundled = this.bundle.get(this.normaliseText(element.placeholder));
+            if (bundled !== undefined) {
+                element.placeholder = bundled;
+                return;
+            }
             this.callTranslationAPI([element.placeholder], this.currentLang)
                 .then(t => element.placeholder = t[0]);
         }
@@ -193,6 +217,27 @@ class PageTranslator {
         });
     }
     
+    normaliseText(text) {
+        // Same whitespace folding the server uses for bundle keys
+        return text.trim().replace(/\s+/g, ' ');
+    }
+    
+    async loadBundle(targetLang) {
+        // Pages opt in with <body data-translation-page="..."> (the template name, set by {% block translation_page %})
+        const page = document.body.dataset.translationPage;
+        if (!page) return new Map();
+        
+        try {
+            const response = await fetch(`${this.bundleEndpoint}${page}/${targetLang}/`);
+            if (!response.ok) return new Map();
+            const data = await response.json();
+            return new Map(Object.entries(data.strings || {}));
+        } catch (error) {
+            console.warn('Translation bundle unavailable:', error);
+            return new Map();
+        }
+    }
+    
     async callTranslationAPI(texts, targetLang) {
         try {
             const response = await fetch(this.apiEndpoint, {
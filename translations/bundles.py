@@ -0,0 +1,199 @@
+"""
+Precompiled translation bundles: one JSON file per page template and language.
+
+A page is its template resolved the way Django renders it: the ``{% extends %}``
+chain with child blocks replacing the parent's, and constant ``{% include %}``s
+inlined. Its static strings are extracted the way ``translator.js`` collects
+them (direct text of headings, paragraphs, links, buttons, list and table
+cells, ``.translate`` elements), looked up in ``TranslationCache`` and written
+to ``TRANSLATION_BUNDLE_DIR`` as ``<page>.<language>.json``. A bundle's version
+is the hash of its contents, which the bundle endpoint uses as ETag. Strings
+that depend on template variables are left to the runtime batch API.
+
+Templates name their page for the browser with ``{% block translation_page %}``
+(see ``home.html``).
+"""
+import hashlib
+import json
+import os
+from html.parser import HTMLParser
+from pathlib import Path
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.base import TextNode, VariableNode
+from django.template.loader_tags import BlockNode, ExtendsNode, IncludeNode
+from .models import normalise_text
+from .services import translation_service
+
+TRANSLATION_LANGUAGES = getattr(settings, 'TRANSLATION_LANGUAGES', ['hi', 'bn', 'ta', 'mr'])
+TRANSLATION_BUNDLE_DIR = Path(getattr(settings, 'TRANSLATION_BUNDLE_DIR', settings.BASE_DIR / 'translation_bundles'))
+TEMPLATE_DIR = Path(settings.BASE_DIR) / 'templates'
+BUILD_BUNDLE_TASK = 'translations.build_bundle'
+
+# Mirrors PageTranslator.getTranslatableElements / shouldSkip in static/js/translator.js
+TRANSLATABLE_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'span', 'a', 'button', 'label', 'li', 'td', 'th'}
+SKIPPED_TAGS = {'script', 'style', 'code', 'pre'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+DYNAMIC_MARKER = '\x00'
+
+
+class _StringCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # [tag, translatable, skipped, direct text parts]
+        self.strings = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        parent_skipped = bool(self.stack) and self.stack[-1][2]
+        skipped = parent_skipped or tag in SKIPPED_TAGS or 'data-no-translate' in attrs
+        translatable = tag in TRANSLATABLE_TAGS or 'translate' in classes
+        self.stack.append([tag, translatable, skipped, []])
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed elements by unwinding to the matching open tag
+        while self.stack:
+            open_tag, translatable, skipped, parts = self.stack.pop()
+            if translatable and not skipped:
+                self._collect(''.join(parts))
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.stack:
+            self.stack[-1][3].append(data)
+
+    def _collect(self, text):
+        text = normalise_text(text)
+        if len(text) < 2 or text.isdigit() or DYNAMIC_MARKER in text or '{{' in text:
+            return
+        self.strings.append(text)
+
+
+def page_templates():
+    """``{page name: template name}`` for every HTML template, e.g. ``accounts-loginUser``."""
+    return {
+        str(path.relative_to(TEMPLATE_DIR).with_suffix('')).replace(os.sep, '-'): path.relative_to(TEMPLATE_DIR).as_posix()
+        for path in sorted(TEMPLATE_DIR.rglob('*.html'))
+    }
+
+
+def _load_template(name):
+    try:
+        return engines['django'].engine.get_template(name)
+    except (TemplateDoesNotExist, TemplateSyntaxError):
+        return None
+
+
+def _constant(expression):
+    """Template name from a quoted ``{% extends %}``/``{% include %}`` argument, else None."""
+    return expression.var if isinstance(expression.var, str) and not expression.filters else None
+
+
+def _flatten_nodes(nodelist, blocks, out, seen):
+    for node in nodelist:
+        if isinstance(node, TextNode):
+            out.append(node.s)
+        elif isinstance(node, BlockNode):
+            _flatten_nodes(blocks.get(node.name, node).nodelist, blocks, out, seen)
+        elif isinstance(node, IncludeNode):
+            name = _constant(node.template)
+            if name is None:
+                out.append(DYNAMIC_MARKER)
+            else:
+                _flatten_template(name, {}, out, seen)
+        elif isinstance(node, VariableNode):
+            out.append(DYNAMIC_MARKER)
+        else:
+            # Any other tag makes the surrounding text dynamic, but its static contents still count
+            out.append(DYNAMIC_MARKER)
+            nodelists = (
+                [branch for _, branch in node.conditions_nodelists] if hasattr(node, 'conditions_nodelists')
+                else [getattr(node, attr, None) for attr in node.child_nodelists]
+            )
+            for child in nodelists:
+                if child:
+                    _flatten_nodes(child, blocks, out, seen)
+                    out.append(DYNAMIC_MARKER)
+
+
+def _flatten_template(name, blocks, out, seen):
+    """Append the page source of template ``name`` to ``out``, with ``blocks`` overriding its own."""
+    template = _load_template(name) if name not in seen else None
+    if template is None:
+        return
+    seen = seen | {name}
+    extends = next((node for node in template.nodelist if isinstance(node, ExtendsNode)), None)
+    if extends is None:
+        _flatten_nodes(template.nodelist, blocks, out, seen)
+        return
+    # Blocks from more derived templates win over this template's
+    blocks = {**extends.blocks, **blocks}
+    parent = _constant(extends.parent_name)
+    if parent is not None and _load_template(parent) is not None:
+        _flatten_template(parent, blocks, out, seen)
+    else:
+        _flatten_nodes(extends.nodelist, blocks, out, seen)
+
+
+def extract_strings(template_name):
+    """Static translatable strings of a rendered page, in document order without duplicates."""
+    out = []
+    _flatten_template(template_name, {}, out, frozenset())
+    collector = _StringCollector()
+    collector.feed(''.join(out))
+    collector.close()
+    return list(dict.fromkeys(collector.strings))
+
+
+def build_bundle(page, template_name, language, fill=False):
+    """
+    Bundle dict for one page and language. With ``fill`` strings missing from
+    the cache are translated upstream first; otherwise they are only counted.
+    """
+    strings = extract_strings(template_name)
+    if fill:
+        translation_service.translate_batch(strings, language)
+    translations = translation_service.cached_translations(strings, language)
+    payload = json.dumps(translations, sort_keys=True, ensure_ascii=False)
+    return {
+        'page': page,
+        'language': language,
+        'version': hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16],
+        'strings': translations,
+        'missing': len(strings) - len(translations),
+    }
+
+
+def bundle_path(page, language):
+    return TRANSLATION_BUNDLE_DIR / f'{page}.{language}.json'
+
+
+def write_bundle(bundle):
+    """Write a bundle atomically so the endpoint never serves a partial file."""
+    TRANSLATION_BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+    path = bundle_path(bundle['page'], bundle['language'])
+    tmp_path = path.with_suffix('.json.tmp')
+    tmp_path.write_text(json.dumps(bundle, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, path)
+    return path
+
+
+_loaded = {}  # path -> (mtime, bundle)
+
+
+def load_bundle(page, language):
+    """Return the built bundle for a page, re-reading the file only when it changes."""
+    path = bundle_path(page, language)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, json.loads(path.read_text(encoding='utf-8')))
+        _loaded[path] = cached
+    return cached[1]
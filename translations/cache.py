@@ -0,0 +1,101 @@
+"""
+Read-through tiers in front of the TranslationCache table.
+
+Lookups are keyed by ``(text_hash, target_language)`` and go through a
+per-process LRU first, then (when ``TRANSLATION_CACHE_ALIAS`` names a Django
+cache) a shared cache-framework tier, and only then the database. Each tier
+keeps hit/miss counters, exposed through ``stats()``.
+"""
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+
+TRANSLATION_LRU_SIZE = getattr(settings, 'TRANSLATION_LRU_SIZE', 20000)
+TRANSLATION_CACHE_ALIAS = getattr(settings, 'TRANSLATION_CACHE_ALIAS', None)
+TRANSLATION_CACHE_TIMEOUT = getattr(settings, 'TRANSLATION_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+
+class TranslationTiers:
+    def __init__(self, maxsize=TRANSLATION_LRU_SIZE, cache_alias=TRANSLATION_CACHE_ALIAS,
+                 timeout=TRANSLATION_CACHE_TIMEOUT):
+        self.maxsize = maxsize
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {tier: {'hits': 0, 'misses': 0} for tier in ('memory', 'shared', 'database')}
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    @staticmethod
+    def _cache_key(key):
+        text_hash, target_language = key
+        return f'translation:{target_language}:{text_hash}'
+
+    def _count(self, tier, hits, misses):
+        with self._lock:
+            self.counters[tier]['hits'] += hits
+            self.counters[tier]['misses'] += misses
+
+    def _remember(self, found):
+        with self._lock:
+            for key, value in found.items():
+                self._lru[key] = value
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def get_many(self, keys):
+        """Return ``{key: translated_text}`` for the keys held in memory or the shared cache."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._lru.get(key)
+                if value is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = value
+        self._count('memory', len(found), len(keys) - len(found))
+
+        remaining = [key for key in keys if key not in found]
+        shared = self.shared
+        if remaining and shared is not None:
+            by_cache_key = {self._cache_key(key): key for key in remaining}
+            shared_found = {by_cache_key[k]: v for k, v in shared.get_many(list(by_cache_key)).items()}
+            self._count('shared', len(shared_found), len(remaining) - len(shared_found))
+            self._remember(shared_found)
+            found.update(shared_found)
+        return found
+
+    def record_database(self, hits, misses):
+        self._count('database', hits, misses)
+
+    def set_many(self, entries):
+        """Store ``{key: translated_text}`` in memory and the shared cache."""
+        if not entries:
+            return
+        self._remember(entries)
+        if self.shared is not None:
+            self.shared.set_many({self._cache_key(k): v for k, v in entries.items()}, self.timeout)
+
+    def discard(self, key):
+        with self._lock:
+            self._lru.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete(self._cache_key(key))
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_entries': len(self._lru),
+                **{tier: dict(counts) for tier, counts in self.counters.items()},
+            }
+
+
+translation_tiers = TranslationTiers()
@@ -0,0 +1,33 @@
+# translations/management/commands/build_translation_bundles.py
+from django.core.management.base import BaseCommand, CommandError
+from translations.bundles import TRANSLATION_LANGUAGES, page_templates, build_bundle, write_bundle
+
+
+class Command(BaseCommand):
+    help = "Build per-page translation bundles from TranslationCache for the page translator"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', action='append', dest='languages',
+                            help="Language code to build (repeatable; default: all supported)")
+        parser.add_argument('--page', action='append', dest='pages',
+                            help="Page (template) name to build, e.g. home (repeatable; default: all)")
+        parser.add_argument('--fill', action='store_true',
+                            help="Translate strings missing from the cache before bundling")
+
+    def handle(self, *args, **options):
+        templates = page_templates()
+        pages = options['pages'] or list(templates)
+        unknown = [page for page in pages if page not in templates]
+        if unknown:
+            raise CommandError(f"Unknown page(s): {', '.join(unknown)}. Available: {', '.join(templates)}")
+
+        for language in options['languages'] or TRANSLATION_LANGUAGES:
+            for page in pages:
+                bundle = build_bundle(page, templates[page], language, fill=options['fill'])
+                write_bundle(bundle)
+                self.stdout.write(
+                    f"{page:>24} [{language}] {len(bundle['strings'])} strings, "
+                    f"{bundle['missing']} missing, version {bundle['version']}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Translation bundles built"))
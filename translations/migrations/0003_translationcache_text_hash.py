@@ -0,0 +1,44 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def populate_text_hash(apps, schema_editor):
+    TranslationCache = apps.get_model('translations', 'TranslationCache')
+    seen = set()
+    duplicates = []
+    for entry in TranslationCache.objects.order_by('id').iterator():
+        entry.text_hash = hashlib.sha1(' '.join(entry.original_text.split()).encode('utf-8')).hexdigest()
+        key = (entry.text_hash, entry.target_language)
+        if key in seen:
+            # Strings differing only in whitespace now share one row
+            duplicates.append(entry.id)
+            continue
+        seen.add(key)
+        entry.save(update_fields=['text_hash'])
+    TranslationCache.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translations', '0002_translationcache_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationcache',
+            name='text_hash',
+            field=models.CharField(default='', editable=False, max_length=40),
+            preserve_default=False,
+        ),
+        migrations.AlterUniqueTogether(
+            name='translationcache',
+            unique_together=set(),
+        ),
+        migrations.RunPython(populate_text_hash, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='translationcache',
+            unique_together={('text_hash', 'target_language')},
+        ),
+    ]
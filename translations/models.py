@@ -1,16 +1,30 @@
+import hashlib
 from django.db import models
 
 # Create your models here.
 
+def normalise_text(text):
+    """Collapse whitespace so the same string scraped from different markup shares a key"""
+    return ' '.join(text.split())
+
+def text_hash(text):
+    """SHA-1 of the normalised source text; the indexed lookup key for a translation"""
+    return hashlib.sha1(normalise_text(text).encode('utf-8')).hexdigest()
+
 class TranslationCache(models.Model):
     original_text = models.TextField()
+    text_hash = models.CharField(max_length=40, editable=False)
     target_language = models.CharField(max_length=10)
     translated_text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        unique_together = ('original_text', 'target_language')
+        unique_together = ('text_hash', 'target_language')
+    
+    def save(self, *args, **kwargs):
+        self.text_hash = text_hash(self.original_text)
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.original_text[:30]} -> {self.target_language}"
@@ -1,36 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 from deep_translator import GoogleTranslator
-from .models import TranslationCache
+from .models import TranslationCache, text_hash
+from .cache import translation_tiers
 import logging
 
 logger = logging.getLogger(__name__)
 
+TRANSLATION_MAX_WORKERS = getattr(settings, 'TRANSLATION_MAX_WORKERS', 8)
+LOOKUP_CHUNK_SIZE = 500  # Keeps `IN (...)` under SQLite's bound-parameter limit
+
 class TranslationService:
-    def translate(self, text, target_lang='bn'):
-        if not text or not text.strip():
-            return text
-        
+    def _translate_upstream(self, text, target_lang):
+        """Translate one string with Google; return None on failure"""
         try:
-            cached = TranslationCache.objects.get(
-                original_text=text, target_language=target_lang
-            )
-            return cached.translated_text
-        except TranslationCache.DoesNotExist:
-            pass
-        
-        try:
-            translated = GoogleTranslator(source='en', target=target_lang).translate(text)
-            
-            TranslationCache.objects.create(
-                original_text=text,
-                target_language=target_lang,
-                translated_text=translated
-            )
-            return translated
+            return GoogleTranslator(source='en', target=target_lang).translate(text)
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
-            return text
-    
+            return None
+
+    def translate(self, text, target_lang='bn'):
+        return self.translate_batch([text], target_lang)[0]
+
+    def _resolve_cached(self, keys, target_lang):
+        """Map hash keys to stored translations via the cache tiers, then the table"""
+        wanted = list(dict.fromkeys(keys))
+        found = translation_tiers.get_many(wanted)
+
+        remaining = [key for key in wanted if key not in found]
+        if remaining:
+            from_db = {}
+            for start in range(0, len(remaining), LOOKUP_CHUNK_SIZE):
+                from_db.update(
+                    ((hash_, target_lang), translated)
+                    for hash_, translated in TranslationCache.objects.filter(
+                        text_hash__in=[h for h, _ in remaining[start:start + LOOKUP_CHUNK_SIZE]],
+                        target_language=target_lang,
+                    ).values_list('text_hash', 'translated_text')
+                )
+            translation_tiers.record_database(len(from_db), len(remaining) - len(from_db))
+            translation_tiers.set_many(from_db)
+            found.update(from_db)
+        return found
+
+    def cached_translations(self, texts, target_lang='bn'):
+        """Return ``{text: translation}`` for the texts already translated; never calls Google"""
+        keys = {t: (text_hash(t), target_lang) for t in texts if t and t.strip()}
+        found = self._resolve_cached(keys.values(), target_lang)
+        return {text: found[key] for text, key in keys.items() if key in found}
+
     def translate_batch(self, texts, target_lang='bn'):
-        return [self.translate(text, target_lang) for text in texts]
+        """
+        Translate a page of strings at once. Each string is keyed by the hash of
+        its normalised text and resolved through the in-process LRU, the shared
+        cache tier (if configured), then one `IN` query per chunk on the hash
+        column. Misses are sent upstream concurrently and written back with a
+        single bulk insert. Strings that fail to translate are returned unchanged.
+        """
+        keys = {t: (text_hash(t), target_lang) for t in texts if t and t.strip()}
+        if not keys:
+            return list(texts)
+
+        found = self._resolve_cached(keys.values(), target_lang)
+
+        misses = {}  # key -> first source string seen for it
+        for text, key in keys.items():
+            if key not in found:
+                misses.setdefault(key, text)
+        if misses:
+            workers = min(TRANSLATION_MAX_WORKERS, len(misses))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                translated = list(pool.map(lambda t: self._translate_upstream(t, target_lang), misses.values()))
+
+            fresh = {key: result for key, result in zip(misses, translated) if result is not None}
+            if fresh:
+                try:
+                    # ignore_conflicts: a concurrent request may have stored the same string meanwhile
+                    TranslationCache.objects.bulk_create([
+                        TranslationCache(
+                            original_text=misses[key],
+                            text_hash=key[0],
+                            target_language=target_lang,
+                            translated_text=result,
+                        )
+                        for key, result in fresh.items()
+                    ], ignore_conflicts=True)
+                except Exception as e:
+                    logger.error(f"Translation cache write error: {str(e)}")
+                translation_tiers.set_many(fresh)
+                found.update(fresh)
+
+        return [found.get(keys[text], text) if text in keys else text for text in texts]
 
 translation_service = TranslationService()
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import TranslationCache
+from .cache import translation_tiers
+
+
+@receiver([post_save, post_delete], sender=TranslationCache)
+def invalidate_cached_translation(sender, instance, **kwargs):
+    """Drop a translation from the cache tiers when it is edited or deleted (e.g. in the admin)."""
+    translation_tiers.discard((instance.text_hash, instance.target_language))
@@ -0,0 +1,11 @@
+# translations/tasks.py
+from jobs.queue import task, PRIORITY_LOW
+from .bundles import BUILD_BUNDLE_TASK, page_templates, build_bundle, write_bundle
+
+
+@task(BUILD_BUNDLE_TASK, priority=PRIORITY_LOW)
+def build_translation_bundle(page, language, fill=True):
+    """Translate a page's missing strings and write its bundle"""
+    bundle = build_bundle(page, page_templates()[page], language, fill=fill)
+    write_bundle(bundle)
+    return {'version': bundle['version'], 'strings': len(bundle['strings']), 'missing': bundle['missing']}
@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('translate/batch/', views.translate_batch, name='translate_batch'),
+    path('translate/bundle/<slug:page>/<slug:language>/', views.translation_bundle, name='translation_bundle'),
 ]
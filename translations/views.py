@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_GET
 import json
 from .services import translation_service
+from .bundles import BUILD_BUNDLE_TASK, TRANSLATION_LANGUAGES, load_bundle, page_templates
+from jobs.queue import enqueue
+
+TRANSLATION_BUNDLE_MAX_AGE = getattr(settings, 'TRANSLATION_BUNDLE_MAX_AGE', 60 * 60)
 
 @csrf_exempt
 def translate_batch(request):
@@ -22,3 +29,22 @@ def translate_batch(request):
             return JsonResponse({'success': False, 'error': str(e)}, status=500)
     
     return JsonResponse({'success': False, 'error': 'POST required'}, status=400)
+
+def _bundle_etag(request, page, language):
+    bundle = load_bundle(page, language)
+    return bundle['version'] if bundle else None
+
+@require_GET
+@condition(etag_func=_bundle_etag)
+def translation_bundle(request, page, language):
+    """Prebuilt {source text: translation} bundle for one page (see build_translation_bundles)"""
+    bundle = load_bundle(page, language)
+    if bundle is None:
+        # Build it in the background; until then the page falls back to the batch API
+        if language in TRANSLATION_LANGUAGES and page in page_templates():
+            enqueue(BUILD_BUNDLE_TASK, {'page': page, 'language': language}, unique_key=f'{page}.{language}')
+        return JsonResponse({'success': False, 'error': 'Bundle not built'}, status=404)
+
+    response = JsonResponse({'success': True, **bundle}, json_dumps_params={'ensure_ascii': False})
+    patch_cache_control(response, public=True, max_age=TRANSLATION_BUNDLE_MAX_AGE)
+    return response
@@ -0,0 +1,76 @@
+# vendorRegistration/locations.py
+"""
+Nearest vendors to a point.
+
+Vendors register a district and pincode but no coordinates, so each is
+placed at the mean GPS fix of subsidy applications from its pincode, or
+failing that at its district's RainfallData coordinates; vendors with neither
+are left out. The k-d tree is a ``BackgroundSnapshot``: it is rebuilt off the
+request path when vendors change (signals), when the district data reloads,
+and otherwise every ``VENDOR_LOCATION_REFRESH_SECONDS`` to pick up new
+application fixes.
+"""
+from django.conf import settings
+from django.db.models import Avg
+from calculator.engine import climate_registry
+from calculator.geo import KDTree
+from .models import Vendor, normalize_district, normalize_pincode
+from .search import VENDOR_FIELDS
+from .snapshot import BackgroundSnapshot
+
+VENDOR_LOCATION_REFRESH_SECONDS = getattr(settings, 'VENDOR_LOCATION_REFRESH_SECONDS', 10 * 60)
+
+# Where a vendor's position comes from
+LOCATED_BY_PINCODE = 'pincode'
+LOCATED_BY_DISTRICT = 'district'
+
+
+class VendorLocator(BackgroundSnapshot):
+    max_age = VENDOR_LOCATION_REFRESH_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        self._climate_version = None
+
+    def build(self):
+        from GovtApplications.models import SubsidyApplication
+
+        pincodes = {}
+        fixes = (
+            SubsidyApplication.objects.filter(geo_latitude__isnull=False, geo_longitude__isnull=False)
+            .values('pincode').annotate(lat=Avg('geo_latitude'), lon=Avg('geo_longitude')).order_by()
+        )
+        for row in fixes:
+            pincodes[normalize_pincode(row['pincode'])] = (float(row['lat']), float(row['lon']))
+
+        climate_registry.warm()  # So the version below is the one the districts come from
+        version = climate_registry.version
+        districts = {}
+        for climate in climate_registry.all_districts():
+            if climate.has_location:
+                districts.setdefault(normalize_district(climate.district_name), (climate.latitude, climate.longitude))
+
+        points = []
+        for row in Vendor.objects.values(*VENDOR_FIELDS, 'district_key').iterator(chunk_size=2000):
+            if row['pincode'] in pincodes:
+                (lat, lon), located_by = pincodes[row['pincode']], LOCATED_BY_PINCODE
+            elif row['district_key'] in districts:
+                (lat, lon), located_by = districts[row['district_key']], LOCATED_BY_DISTRICT
+            else:
+                continue
+            vendor = {name: row[name] for name in VENDOR_FIELDS}
+            vendor['located_by'] = located_by
+            points.append((lat, lon, vendor))
+
+        self._climate_version = version
+        return KDTree(points)
+
+    def is_outdated(self):
+        return climate_registry.version != self._climate_version
+
+    def nearest(self, lat, lon, k=5):
+        """Up to ``k`` ``(vendor dict, distance_km)`` pairs, nearest first."""
+        return self.current().nearest(lat, lon, k)
+
+
+vendor_locator = VendorLocator()
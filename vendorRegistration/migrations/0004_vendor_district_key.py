@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:23
+
+import re
+from django.db import migrations, models
+
+
+def fill_district_keys(apps, schema_editor):
+    Vendor = apps.get_model('vendorRegistration', 'Vendor')
+    changed = []
+    for vendor in Vendor.objects.only('pk', 'district', 'pincode').iterator():
+        vendor.district_key = ' '.join(re.sub(r'[^A-Z0-9]+', ' ', (vendor.district or '').upper()).split())
+        vendor.pincode = re.sub(r'\D', '', vendor.pincode or '')
+        changed.append(vendor)
+    Vendor.objects.bulk_update(changed, ['district_key', 'pincode'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendorRegistration', '0003_alter_vendor_gstin_number_alter_vendor_pan_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='district_key',
+            field=models.CharField(blank=True, editable=False, max_length=30),
+        ),
+        migrations.RunPython(fill_district_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['district_key', 'id'], name='vendor_district_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['pincode', 'id'], name='vendor_pincode_idx'),
+        ),
+    ]
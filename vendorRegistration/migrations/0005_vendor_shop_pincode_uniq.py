@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def check_shop_duplicates(apps, schema_editor):
+    """
+    Stop before adding the constraint if vendors already share a shop name
+    (ignoring case) in one pincode; registration used to allow that under
+    concurrency, and 0004 normalising pincodes can create more. Which record
+    to keep is a judgement call, so the rows are listed rather than changed.
+    """
+    Vendor = apps.get_model('vendorRegistration', 'Vendor')
+    collisions = (
+        Vendor.objects.annotate(shop_key=django.db.models.functions.text.Lower('shop_name'))
+        .values('shop_key', 'pincode').annotate(count=models.Count('id')).filter(count__gt=1).order_by()
+    )
+    lines = []
+    for collision in collisions:
+        ids = (
+            Vendor.objects.annotate(shop_key=django.db.models.functions.text.Lower('shop_name'))
+            .filter(shop_key=collision['shop_key'], pincode=collision['pincode'])
+            .order_by('id').values_list('id', flat=True)
+        )
+        lines.append(f"  {collision['shop_key']!r} in {collision['pincode']}: vendor ids {', '.join(map(str, ids))}")
+    if lines:
+        raise RuntimeError(
+            'Cannot add vendor_shop_pincode_uniq: these vendors share a shop name in the same pincode. '
+            'Merge or rename them (e.g. in the admin), then run migrate again.\n' + '\n'.join(lines)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendorRegistration', '0004_vendor_district_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_shop_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='vendor',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('shop_name'), models.F('pincode'), name='vendor_shop_pincode_uniq'),
+        ),
+    ]
@@ -1,7 +1,19 @@
+import re
 from django.db import models
+from django.db.models.functions import Lower
 
 # Create your models here.
 
+
+def normalize_district(name):
+    """Search key for a district name: upper-case words, punctuation and extra spaces removed."""
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', (name or '').upper()).split())
+
+
+def normalize_pincode(value):
+    return re.sub(r'\D', '', value or '')
+
+
 class Vendor(models.Model):
     shop_name = models.CharField(max_length=100, null= False, blank=False)
     owner_name = models.CharField(max_length=100, null=False, blank=False)
@@ -12,6 +24,27 @@ class Vendor(models.Model):
     pincode = models.CharField(max_length=6, null=False, blank=False)
     PAN_Number = models.CharField(max_length=10, unique=True, null=True, blank=True)
     GSTIN_Number = models.CharField(max_length=10, unique=True, null=True, blank=True)
+    # normalize_district(district), maintained by save()
+    district_key = models.CharField(max_length=30, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Vendor search: exact/prefix ranges on the normalised columns, paged in (key, id) order
+            models.Index(fields=['district_key', 'id'], name='vendor_district_key_idx'),
+            models.Index(fields=['pincode', 'id'], name='vendor_pincode_idx'),
+        ]
+        constraints = [
+            # One shop name per pincode, ignoring case; also serves the duplicate check
+            models.UniqueConstraint(Lower('shop_name'), 'pincode', name='vendor_shop_pincode_uniq'),
+        ]
 
     def __str__(self):
-        return self.shop_name
\ No newline at end of file
+        return self.shop_name
+
+    def save(self, *args, **kwargs):
+        self.pincode = normalize_pincode(self.pincode)
+        self.district_key = normalize_district(self.district)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'district' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'district_key'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,77 @@
+# vendorRegistration/registration.py
+"""
+Vendor registration with duplicate detection.
+
+Every identifying field is backed by a unique constraint (phone, WhatsApp,
+PAN, GSTIN, and shop name per pincode ignoring case), so the database is what
+rejects a duplicate, including two registrations racing each other.
+``duplicate_fields`` only explains a collision: one OR-ed query fetches any
+vendors sharing a value and reports which fields matched. It runs before
+the insert, so the common case avoids a failed write, and again after an
+``IntegrityError`` to name the fields of the row that won the race.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from .models import Vendor
+
+# (model field, label shown to the vendor), in the order collisions are reported
+DUPLICATE_FIELDS = (
+    ('phone_number', 'phone number'),
+    ('whatsapp_number', 'WhatsApp number'),
+    ('PAN_Number', 'PAN number'),
+    ('GSTIN_Number', 'GSTIN number'),
+)
+SHOP_IN_AREA = 'shop name in this area'
+
+
+class DuplicateVendor(Exception):
+    """Raised with the labels of the fields another vendor already uses."""
+
+    def __init__(self, fields):
+        super().__init__(', '.join(fields))
+        self.fields = fields
+
+
+def duplicate_fields(values):
+    """Labels of the fields in ``values`` (Vendor field -> value) that an existing vendor already has."""
+    lookups = {field: values.get(field) for field, _ in DUPLICATE_FIELDS if values.get(field)}
+    shop_key = (values.get('shop_name') or '').lower()
+    pincode = values.get('pincode')
+
+    match = Q()
+    for field, value in lookups.items():
+        match |= Q(**{field: value})
+    if shop_key and pincode:
+        match |= Q(shop_key=shop_key, pincode=pincode)
+    if not match:
+        return []
+
+    # Each field is unique, so at most one row collides per condition
+    rows = (
+        Vendor.objects.annotate(shop_key=Lower('shop_name')).filter(match)
+        .values(*lookups, 'shop_key', 'pincode')[:len(lookups) + 1]
+    )
+    found = set()
+    for row in rows:
+        found.update(field for field, value in lookups.items() if row[field] == value)
+        if shop_key and row['shop_key'] == shop_key and row['pincode'] == pincode:
+            found.add(SHOP_IN_AREA)
+    labels = [label for field, label in DUPLICATE_FIELDS if field in found]
+    return labels + [SHOP_IN_AREA] if SHOP_IN_AREA in found else labels
+
+
+def register_vendor(**values):
+    """Create and return a Vendor. Raises ``DuplicateVendor`` if any identifying field is taken."""
+    duplicates = duplicate_fields(values)
+    if duplicates:
+        raise DuplicateVendor(duplicates)
+    try:
+        with transaction.atomic():
+            return Vendor.objects.create(**values)
+    except IntegrityError:
+        # Another registration with the same details committed after the check
+        duplicates = duplicate_fields(values)
+        if duplicates:
+            raise DuplicateVendor(duplicates)
+        raise
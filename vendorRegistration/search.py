@@ -0,0 +1,164 @@
+# vendorRegistration/search.py
+"""
+Vendor search by district or pincode.
+
+Both columns are searched in their normalised form (``Vendor.district_key``,
+digits-only ``pincode``) with index range scans: a prefix ``P`` becomes
+``P <= column < P'`` where ``P'`` is ``P`` with its last character
+incremented, which any B-tree index serves on every backend (unlike
+``LIKE``/``icontains``). Ordering by ``(column, id)`` puts exact matches ahead
+of longer prefix matches and pages through results with a keyset cursor, so
+every page costs the same.
+
+A full pincode with no other vendors still finds help nearby: the
+in-process ``pincode_districts`` map (built from vendor and application
+addresses, refreshed in the background) adds the rest of that pincode's
+district after the pincode matches.
+"""
+import base64
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db.models import Count, Q
+from .models import Vendor, normalize_district, normalize_pincode
+from .snapshot import BackgroundSnapshot
+
+VENDOR_SEARCH_PAGE_SIZE = getattr(settings, 'VENDOR_SEARCH_PAGE_SIZE', 24)
+VENDOR_SEARCH_MAX_PAGE_SIZE = getattr(settings, 'VENDOR_SEARCH_MAX_PAGE_SIZE', 100)
+VENDOR_PINCODE_MAP_SECONDS = getattr(settings, 'VENDOR_PINCODE_MAP_SECONDS', 60 * 60)
+
+VENDOR_FIELDS = (
+    'id', 'shop_name', 'owner_name', 'phone_number', 'whatsapp_number',
+    'service_type', 'district', 'pincode',
+)
+
+# Per-vendor match, best first
+MATCH_EXACT = 'exact'
+MATCH_PREFIX = 'prefix'
+MATCH_NEARBY = 'district'  # Same district as the searched pincode
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ============================================
+# PINCODE -> DISTRICT MAP
+# ============================================
+
+class PincodeDistricts(BackgroundSnapshot):
+    """
+    Map of pincode to normalised district name; each pincode takes the
+    district most addresses give for it.
+    """
+    max_age = VENDOR_PINCODE_MAP_SECONDS
+
+    def build(self):
+        from GovtApplications.models import SubsidyApplication
+
+        votes = defaultdict(Counter)
+        vendor_pairs = Vendor.objects.values_list('pincode', 'district_key').annotate(count=Count('id')).order_by()
+        for pincode, district, count in vendor_pairs:
+            votes[pincode][district] += count
+        application_pairs = (
+            SubsidyApplication.objects.values_list('pincode', 'district').annotate(count=Count('id')).order_by()
+        )
+        for pincode, district, count in application_pairs:
+            votes[normalize_pincode(pincode)][normalize_district(district)] += count
+
+        return {
+            pincode: counter.most_common(1)[0][0]
+            for pincode, counter in votes.items() if pincode and counter
+        }
+
+    def get(self, pincode):
+        return self.current().get(pincode) or None
+
+
+pincode_districts = PincodeDistricts()
+
+
+# ============================================
+# SEARCH
+# ============================================
+
+def _prefix(field, prefix):
+    """Range filter equivalent to ``field__startswith=prefix`` that a B-tree index can serve."""
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix[:-1] + chr(ord(prefix[-1]) + 1)})
+
+
+def _tiers(query):
+    """``[(queryset, sort_field, match)]`` in rank order; ``match(row)`` labels a result."""
+    pincode = normalize_pincode(query)
+    if pincode and pincode == query.replace(' ', ''):
+        tiers = [(
+            Vendor.objects.filter(_prefix('pincode', pincode)),
+            'pincode',
+            lambda row: MATCH_EXACT if row['pincode'] == pincode else MATCH_PREFIX,
+        )]
+        district = pincode_districts.get(pincode) if len(pincode) == 6 else None
+        if district:
+            tiers.append((
+                Vendor.objects.filter(district_key=district).exclude(pincode=pincode),
+                'district_key',
+                lambda row: MATCH_NEARBY,
+            ))
+        return tiers
+
+    key = normalize_district(query)
+    if not key:
+        return []
+    return [(
+        Vendor.objects.filter(_prefix('district_key', key)),
+        'district_key',
+        lambda row: MATCH_EXACT if row['district_key'] == key else MATCH_PREFIX,
+    )]
+
+
+def encode_cursor(tier, value, pk):
+    raw = f'{tier}|{pk}|{value}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        tier, pk, value = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|', 2)
+        return int(tier), value, int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def vendor_page(query, cursor=None, limit=VENDOR_SEARCH_PAGE_SIZE):
+    """
+    One page of vendors matching a district name or (partial) pincode, best
+    matches first. Returns ``(vendors, next_cursor)``; ``next_cursor`` is None
+    on the last page. Raises ``InvalidCursor`` for a malformed cursor.
+    """
+    tiers = _tiers(query)
+    start, after = 0, None
+    if cursor:
+        start, value, pk = decode_cursor(cursor)
+        after = (value, pk)
+
+    # Fetch one row beyond the page, across tiers, to learn whether another page exists
+    found = []
+    for tier in range(start, len(tiers)):
+        queryset, field, match = tiers[tier]
+        if after and tier == start:
+            queryset = queryset.filter(Q(**{f'{field}__gt': after[0]}) | Q(**{field: after[0], 'id__gt': after[1]}))
+        fields = VENDOR_FIELDS if field in VENDOR_FIELDS else VENDOR_FIELDS + (field,)
+        rows = queryset.order_by(field, 'id').values(*fields)[:limit + 1 - len(found)]
+        found.extend((tier, field, match, row) for row in rows)
+        if len(found) > limit:
+            break
+
+    vendors = []
+    for tier, field, match, row in found[:limit]:
+        vendor = {name: row[name] for name in VENDOR_FIELDS}
+        vendor['match'] = match(row)
+        vendors.append(vendor)
+
+    next_cursor = None
+    if len(found) > limit:
+        tier, field, _, row = found[limit - 1]
+        next_cursor = encode_cursor(tier, row[field], row['id'])
+    return vendors, next_cursor
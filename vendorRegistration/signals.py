@@ -0,0 +1,14 @@
+# vendorRegistration/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Vendor
+from .locations import vendor_locator
+from .search import pincode_districts
+
+
+@receiver([post_save, post_delete], sender=Vendor)
+def invalidate_vendor_lookups(sender, **kwargs):
+    """Mark the pincode -> district map and vendor locations for a background rebuild once committed."""
+    transaction.on_commit(pincode_districts.invalidate)
+    transaction.on_commit(vendor_locator.invalidate)
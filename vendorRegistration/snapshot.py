@@ -0,0 +1,69 @@
+# vendorRegistration/snapshot.py
+"""
+In-process snapshots of data derived from whole tables (the pincode ->
+district map, the vendor k-d tree) that requests never wait to rebuild.
+
+Only the first read in a process builds synchronously. After that,
+``invalidate()`` (on vendor changes, once the transaction commits) and
+``max_age`` expiry just mark the snapshot stale. The next read starts a single
+background rebuild and keeps returning the current snapshot until the new
+one is swapped in. A change made during a rebuild marks it stale again, so it
+is picked up by the following rebuild. Other processes catch up within
+``max_age``.
+"""
+import logging
+import threading
+import time
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundSnapshot:
+    max_age = 60 * 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded_at = 0.0
+        self._stale = False
+        self._refreshing = False
+
+    def build(self):
+        raise NotImplementedError
+
+    def is_outdated(self):
+        """Extra staleness check for subclasses, called on every read."""
+        return False
+
+    def current(self):
+        with self._lock:
+            if self._value is None:
+                self._value = self.build()
+                self._loaded_at = time.monotonic()
+                self._stale = False
+            elif not self._refreshing and (
+                self._stale or time.monotonic() - self._loaded_at >= self.max_age or self.is_outdated()
+            ):
+                self._refreshing = True
+                self._stale = False
+                threading.Thread(target=self._refresh, name=f'{type(self).__name__}-refresh', daemon=True).start()
+            return self._value
+
+    def _refresh(self):
+        value = None
+        try:
+            value = self.build()
+        except Exception:
+            logger.exception(f"Rebuilding {type(self).__name__} failed; keeping the previous snapshot")
+        finally:
+            connections.close_all()  # This thread's connections only
+            with self._lock:
+                if value is not None:
+                    self._value = value
+                    self._loaded_at = time.monotonic()
+                self._refreshing = False
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
@@ -9,6 +9,10 @@ from .models import Vendor
 from django.http import JsonResponse
 from django.db.models import Q
 from .models import Vendor
+from .registration import DuplicateVendor, register_vendor
+from .search import (
+    VENDOR_SEARCH_PAGE_SIZE, VENDOR_SEARCH_MAX_PAGE_SIZE, InvalidCursor, vendor_page,
+)
 
 # Create your views here.
 
@@ -20,7 +24,7 @@ def vendor_register(request):
     """
     Handle vendor registration form submission
     - Validates all fields
-    - Prevents duplicate registrations
+    - Prevents duplicate registrations (one query, backed by unique constraints)
     - Saves vendor to database
     """
     if request.method == 'POST':
@@ -64,50 +68,26 @@ def vendor_register(request):
                 messages.error(request, 'Please enter a valid 6-digit pincode')
                 return redirect('vendorRegistration:vendorRegistration')
             
-            # ====== Check for Duplicates ======
-            duplicate_checks = []
-            
-            # Check 1: Phone number already exists
-            if Vendor.objects.filter(phone_number=phone_number).exists():
-                duplicate_checks.append('phone number')
-            
-            # Check 2: WhatsApp number already exists (if provided and not same as phone)
-            if whatsapp_number and whatsapp_number != phone_number:
-                if Vendor.objects.filter(whatsapp_number=whatsapp_number).exists():
-                    duplicate_checks.append('WhatsApp number')
-            
-            # Check 3: PAN number already exists (if provided)
-            if pan_number and Vendor.objects.filter(PAN_Number=pan_number).exists():
-                duplicate_checks.append('PAN number')
-            
-            # Check 4: GSTIN already exists (if provided)
-            if gstin_number and Vendor.objects.filter(GSTIN_Number=gstin_number).exists():
-                duplicate_checks.append('GSTIN number')
-            
-            # Check 5: Same shop name in same pincode
-            if Vendor.objects.filter(shop_name__iexact=shop_name, pincode=pincode).exists():
-                duplicate_checks.append('shop name in this area')
-            
-            # If any duplicate found, prevent registration
-            if duplicate_checks:
-                error_msg = f'⚠ This vendor is already registered with the same {" and ".join(duplicate_checks)}. '
+            # ====== Create Vendor Record ======
+            # Duplicates are rejected by unique constraints; register_vendor reports which fields collided
+            try:
+                vendor = register_vendor(
+                    shop_name=shop_name,
+                    owner_name=owner_name,
+                    phone_number=phone_number,
+                    whatsapp_number=whatsapp_number if whatsapp_number else None,  # ✅ None if empty (allows null)
+                    service_type=service_type,  # ✅ Changed from 'services' to 'service_type'
+                    district=district,
+                    pincode=pincode,
+                    PAN_Number=pan_number if pan_number else None,  # ✅ Match exact field name with underscore
+                    GSTIN_Number=gstin_number if gstin_number else None  # ✅ Match exact field name
+                )
+            except DuplicateVendor as e:
+                error_msg = f'⚠ This vendor is already registered with the same {" and ".join(e.fields)}. '
                 error_msg += 'If you need to update your details, please contact support.'
                 messages.error(request, error_msg)
                 return redirect('vendorRegistration:vendorRegistration')
             
-            # ====== Create Vendor Record ======
-            vendor = Vendor.objects.create(
-                shop_name=shop_name,
-                owner_name=owner_name,
-                phone_number=phone_number,
-                whatsapp_number=whatsapp_number if whatsapp_number else None,  # ✅ None if empty (allows null)
-                service_type=service_type,  # ✅ Changed from 'services' to 'service_type'
-                district=district,
-                pincode=pincode,
-                PAN_Number=pan_number if pan_number else None,  # ✅ Match exact field name with underscore
-                GSTIN_Number=gstin_number if gstin_number else None  # ✅ Match exact field name
-            )
-            
             # Success message
             messages.success(request, 
                 f'🎉 Registration Successful! Your Vendor ID is #{vendor.id}. '
@@ -130,7 +110,8 @@ def vendor_register(request):
 def search_vendors(request):
     """
     API endpoint to search vendors by district or pincode
-    Returns JSON response with vendor data
+    Query params: query, cursor (from next_cursor), limit.
+    Returns one page of JSON vendor data, exact matches first
     """
     query = request.GET.get('query', '').strip()
     
@@ -142,31 +123,23 @@ def search_vendors(request):
         })
     
     try:
-        # Search by district OR pincode (case-insensitive)
-        vendors = Vendor.objects.filter(
-            Q(district__icontains=query) | Q(pincode__icontains=query)
-        ).values(
-            'id', 
-            'shop_name', 
-            'owner_name', 
-            'phone_number', 
-            'whatsapp_number', 
-            'service_type', 
-            'district', 
-            'pincode'
-        )
-        
-        vendors_list = list(vendors)
-        
-        return JsonResponse({
-            'success': True,
-            'vendors': vendors_list,
-            'count': len(vendors_list)
-        })
-        
-    except Exception as e:
+        limit = min(max(int(request.GET.get('limit', VENDOR_SEARCH_PAGE_SIZE)), 1), VENDOR_SEARCH_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = VENDOR_SEARCH_PAGE_SIZE
+    
+    try:
+        vendors, next_cursor = vendor_page(query, request.GET.get('cursor'), limit)
+    except InvalidCursor as e:
         return JsonResponse({
             'success': False,
             'error': str(e),
             'vendors': []
-        })
\ No newline at end of file
+        }, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'vendors': vendors,
+        'count': len(vendors),
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    })